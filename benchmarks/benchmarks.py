@@ -0,0 +1,123 @@
+""" Benchmarks of the execution of SED tasks and COMBINE/OMEX archives over synthetic models scaled in their number of
+species and the number of recorded time points
+
+The benchmarks are run with `airspeed velocity <https://asv.readthedocs.io/>`_ (see ``asv.conf.json``).
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .utils import build_sbml_model, build_sed_task, build_combine_archive
+from biosimulators_utils.config import get_config
+from my_simulator.cache import clear_caches
+from my_simulator.core import exec_sed_task, preprocess_sed_task, exec_sedml_docs_in_combine_archive
+import os
+import shutil
+import tempfile
+
+NUM_SPECIES = [10, 100, 1000]
+NUMBER_OF_POINTS = [100, 10000]
+PHASES = ['validation', 'targets', 'model', 'algorithm', 'simulation', 'results']
+NUM_REPEATED_EXECUTIONS = 20
+
+
+class ExecSedTaskSuite(object):
+    """ Latency and peak memory of the execution of a single task """
+    params = (NUM_SPECIES, NUMBER_OF_POINTS)
+    param_names = ['num_species', 'number_of_points']
+
+    def setup(self, num_species, number_of_points):
+        self.dirname = tempfile.mkdtemp()
+        model_filename = os.path.join(self.dirname, 'model.xml')
+        build_sbml_model(model_filename, num_species)
+        self.task, self.variables = build_sed_task(model_filename, num_species, number_of_points)
+        self.preprocessed_task = preprocess_sed_task(self.task, self.variables)
+
+    def teardown(self, num_species, number_of_points):
+        shutil.rmtree(self.dirname)
+
+    def time_exec_sed_task_cold(self, num_species, number_of_points):
+        clear_caches()
+        exec_sed_task(self.task, self.variables)
+
+    def time_exec_sed_task(self, num_species, number_of_points):
+        exec_sed_task(self.task, self.variables)
+
+    def time_exec_sed_task_preprocessed(self, num_species, number_of_points):
+        exec_sed_task(self.task, self.variables, preprocessed_task=self.preprocessed_task)
+
+    def peakmem_exec_sed_task(self, num_species, number_of_points):
+        exec_sed_task(self.task, self.variables)
+
+
+class SedTaskPhasesSuite(object):
+    """ Duration of each phase of the execution of a single task, as logged in :obj:`TaskLog.simulator_details` """
+    params = (NUM_SPECIES, NUMBER_OF_POINTS, PHASES)
+    param_names = ['num_species', 'number_of_points', 'phase']
+    unit = 'seconds'
+
+    def setup(self, num_species, number_of_points, phase):
+        self.dirname = tempfile.mkdtemp()
+        model_filename = os.path.join(self.dirname, 'model.xml')
+        build_sbml_model(model_filename, num_species)
+        self.task, self.variables = build_sed_task(model_filename, num_species, number_of_points)
+
+    def teardown(self, num_species, number_of_points, phase):
+        shutil.rmtree(self.dirname)
+
+    def track_phase_duration(self, num_species, number_of_points, phase):
+        clear_caches()
+        config = get_config()
+        config.LOG = True
+        _, log = exec_sed_task(self.task, self.variables, config=config)
+        return log.simulator_details['timings'].get(phase, 0.)
+
+
+class RepeatedSedTaskSuite(object):
+    """ Throughput of repeated executions of the same task, such as the iterations of a parameter scan """
+    params = (NUM_SPECIES, )
+    param_names = ['num_species']
+
+    def setup(self, num_species):
+        self.dirname = tempfile.mkdtemp()
+        model_filename = os.path.join(self.dirname, 'model.xml')
+        build_sbml_model(model_filename, num_species)
+        self.task, self.variables = build_sed_task(model_filename, num_species, 100)
+
+    def teardown(self, num_species):
+        shutil.rmtree(self.dirname)
+
+    def time_repeated_exec_sed_task(self, num_species):
+        clear_caches()
+        for _ in range(NUM_REPEATED_EXECUTIONS):
+            exec_sed_task(self.task, self.variables)
+
+    def time_repeated_exec_sed_task_preprocessed(self, num_species):
+        clear_caches()
+        preprocessed_task = preprocess_sed_task(self.task, self.variables)
+        for _ in range(NUM_REPEATED_EXECUTIONS):
+            exec_sed_task(self.task, self.variables, preprocessed_task=preprocessed_task)
+
+
+class ExecCombineArchiveSuite(object):
+    """ Latency and peak memory of the execution of a COMBINE/OMEX archive with multiple tasks """
+    params = (NUM_SPECIES, [1, 10])
+    param_names = ['num_species', 'num_tasks']
+    timeout = 600
+
+    def setup(self, num_species, num_tasks):
+        self.dirname = tempfile.mkdtemp()
+        self.archive_filename = build_combine_archive(self.dirname, num_species, 100, num_tasks=num_tasks)
+        self.config = get_config()
+        self.config.VERBOSE = False
+
+    def teardown(self, num_species, num_tasks):
+        shutil.rmtree(self.dirname)
+
+    def time_exec_sedml_docs_in_combine_archive(self, num_species, num_tasks):
+        exec_sedml_docs_in_combine_archive(self.archive_filename, tempfile.mkdtemp(dir=self.dirname), config=self.config)
+
+    def peakmem_exec_sedml_docs_in_combine_archive(self, num_species, num_tasks):
+        exec_sedml_docs_in_combine_archive(self.archive_filename, tempfile.mkdtemp(dir=self.dirname), config=self.config)
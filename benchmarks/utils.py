@@ -0,0 +1,150 @@
+""" Synthetic models, simulation experiments and COMBINE/OMEX archives for benchmarking
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.combine.data_model import CombineArchive, CombineArchiveContent, CombineArchiveContentFormat
+from biosimulators_utils.combine.io import CombineArchiveWriter
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from biosimulators_utils.sedml.io import SedmlSimulationWriter
+from my_simulator.data_model import KISAO_METHOD_MAP
+import os
+
+__all__ = ['build_sbml_model', 'build_sed_task', 'build_combine_archive']
+
+SBML_NAMESPACE = 'http://www.sbml.org/sbml/level3/version1/core'
+
+
+def build_sbml_model(filename, num_species):
+    """ Save an SBML model of a linear chain of first-order reactions among :obj:`num_species` species
+
+    Args:
+        filename (:obj:`str`): path to save the model
+        num_species (:obj:`int`): number of species
+    """
+    species = ''.join(
+        ('      <species id="S{0}" compartment="compartment" initialConcentration="{1}" hasOnlySubstanceUnits="false"'
+         ' boundaryCondition="false" constant="false"/>\n').format(i_species, 1. if i_species == 0 else 0.)
+        for i_species in range(num_species)
+    )
+    reactions = ''.join(
+        ('      <reaction id="R{0}" reversible="false" fast="false">\n'
+         '        <listOfReactants><speciesReference species="S{0}" stoichiometry="1" constant="true"/></listOfReactants>\n'
+         '        <listOfProducts><speciesReference species="S{1}" stoichiometry="1" constant="true"/></listOfProducts>\n'
+         '        <kineticLaw><math xmlns="http://www.w3.org/1998/Math/MathML">'
+         '<apply><times/><ci>k</ci><ci>S{0}</ci></apply></math></kineticLaw>\n'
+         '      </reaction>\n').format(i_species, i_species + 1)
+        for i_species in range(num_species - 1)
+    )
+
+    with open(filename, 'w') as file:
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<sbml xmlns="{}" level="3" version="1">\n'
+            '  <model id="chain">\n'
+            '    <listOfCompartments>\n'
+            '      <compartment id="compartment" size="1" constant="true"/>\n'
+            '    </listOfCompartments>\n'
+            '    <listOfSpecies>\n{}'
+            '    </listOfSpecies>\n'
+            '    <listOfParameters>\n'
+            '      <parameter id="k" value="0.1" constant="true"/>\n'
+            '    </listOfParameters>\n'
+            '    <listOfReactions>\n{}'
+            '    </listOfReactions>\n'
+            '  </model>\n'
+            '</sbml>\n'.format(SBML_NAMESPACE, species, reactions)
+        )
+
+
+def build_sed_task(model_filename, num_species, number_of_points, id='task'):
+    """ Build a task which simulates a model generated by :obj:`build_sbml_model` and records every species
+
+    Args:
+        model_filename (:obj:`str`): path to the model
+        num_species (:obj:`int`): number of species of the model
+        number_of_points (:obj:`int`): number of time points to record
+        id (:obj:`str`, optional): id of the task
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`sedml_data_model.Task`: task
+            * :obj:`list` of :obj:`sedml_data_model.Variable`: variables
+    """
+    task = sedml_data_model.Task(
+        id=id,
+        model=sedml_data_model.Model(
+            id='model',
+            source=model_filename,
+            language=sedml_data_model.ModelLanguage.SBML.value,
+        ),
+        simulation=sedml_data_model.UniformTimeCourseSimulation(
+            id='simulation_' + id,
+            algorithm=sedml_data_model.Algorithm(kisao_id=next(iter(KISAO_METHOD_MAP.keys()))),
+            initial_time=0.,
+            output_start_time=0.,
+            output_end_time=100.,
+            number_of_points=number_of_points,
+        ),
+    )
+
+    variables = [sedml_data_model.Variable(id='{}_time'.format(id), symbol=sedml_data_model.Symbol.time.value, task=task)]
+    for i_species in range(num_species):
+        variables.append(sedml_data_model.Variable(
+            id='{}_S{}'.format(id, i_species),
+            target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='S{}']".format(i_species),
+            target_namespaces={'sbml': SBML_NAMESPACE},
+            task=task,
+        ))
+
+    return task, variables
+
+
+def build_combine_archive(dirname, num_species, number_of_points, num_tasks=1):
+    """ Save a COMBINE/OMEX archive with one SED document which executes :obj:`num_tasks` tasks of a model generated by
+    :obj:`build_sbml_model` and saves a report of every species of each task
+
+    Args:
+        dirname (:obj:`str`): directory to build the archive in
+        num_species (:obj:`int`): number of species
+        number_of_points (:obj:`int`): number of time points to record
+        num_tasks (:obj:`int`, optional): number of tasks
+
+    Returns:
+        :obj:`str`: path to the archive
+    """
+    archive_dirname = os.path.join(dirname, 'archive')
+    os.makedirs(archive_dirname)
+    build_sbml_model(os.path.join(archive_dirname, 'model.xml'), num_species)
+
+    doc = sedml_data_model.SedDocument()
+    report = sedml_data_model.Report(id='report')
+    doc.outputs.append(report)
+    for i_task in range(num_tasks):
+        task, variables = build_sed_task('model.xml', num_species, number_of_points, id='task_{}'.format(i_task))
+        if not doc.models:
+            doc.models.append(task.model)
+        task.model = doc.models[0]
+        doc.simulations.append(task.simulation)
+        doc.tasks.append(task)
+
+        for variable in variables:
+            data_generator = sedml_data_model.DataGenerator(id='data_generator_' + variable.id, variables=[variable],
+                                                            math=variable.id)
+            doc.data_generators.append(data_generator)
+            report.data_sets.append(sedml_data_model.DataSet(id='data_set_' + variable.id, label=variable.id,
+                                                             data_generator=data_generator))
+
+    SedmlSimulationWriter().run(doc, os.path.join(archive_dirname, 'simulation.sedml'))
+
+    archive = CombineArchive(contents=[
+        CombineArchiveContent(location='model.xml', format=CombineArchiveContentFormat.SBML.value),
+        CombineArchiveContent(location='simulation.sedml', format=CombineArchiveContentFormat.SED_ML.value, master=True),
+    ])
+    archive_filename = os.path.join(dirname, 'archive.omex')
+    CombineArchiveWriter().run(archive, archive_dirname, archive_filename)
+    return archive_filename
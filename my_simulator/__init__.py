@@ -1,10 +1,9 @@
+import importlib
 import my_simulator
 
 from ._version import __version__  # noqa: F401
 # :obj:`str`: version
 
-from .core import get_simulator_version, exec_sed_task, preprocess_sed_task, exec_sed_doc, exec_sedml_docs_in_combine_archive  # noqa: F401
-
 __all__ = [
     '__version__',
     'get_simulator_version',
@@ -12,4 +11,43 @@ __all__ = [
     'preprocess_sed_task',
     'exec_sed_doc',
     'exec_sedml_docs_in_combine_archive',
+    'exec_sedml_docs_in_combine_archives',
 ]
+
+_LAZY_ATTRS = {
+    'get_simulator_version': 'utils',
+    'exec_sed_task': 'core',
+    'preprocess_sed_task': 'core',
+    'exec_sed_doc': 'core',
+    'exec_sedml_docs_in_combine_archive': 'core',
+    'exec_sedml_docs_in_combine_archives': 'core',
+}
+# :obj:`dict` of :obj:`str` => :obj:`str`: dictionary that maps the names of the public methods of the package to the
+# names of the modules which define them. These modules (and, in turn, the SED-ML, COMBINE, report and visualization
+# modules of BioSimulators utils) are only imported when the methods are first used, which keeps the start-up of the
+# command-line application (e.g., ``biosimulators-my-simulator --version``) fast.
+
+
+def __getattr__(name):
+    """ Import the public methods of the package on their first use (PEP 562)
+
+    Args:
+        name (:obj:`str`): name of a method
+
+    Returns:
+        :obj:`types.FunctionType`: method
+
+    Raises:
+        :obj:`AttributeError`: if the package doesn't have the method
+    """
+    module_name = _LAZY_ATTRS.get(name, None)
+    if module_name is None:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    value = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_LAZY_ATTRS.keys()))
@@ -7,14 +7,209 @@
 """
 
 from ._version import __version__
-from .core import get_simulator_version, exec_sedml_docs_in_combine_archive
+from .utils import get_simulator_version
+from biosimulators_utils.config import get_config
+from biosimulators_utils.log.data_model import Status
 from biosimulators_utils.simulator.cli import build_cli
+import cement
+import sys
+import termcolor
 
-App = build_cli('biosimulators-my-simulator', __version__,
-                'My Simulator', get_simulator_version(), 'https://url.for.my.simulator',
-                exec_sedml_docs_in_combine_archive)
+
+def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None, output_ids=None):
+    """ Execute the SED tasks defined in a COMBINE/OMEX archive and save the outputs
+
+    :obj:`my_simulator.core` is only imported when an archive is executed so that the command-line application starts
+    quickly (e.g., for ``--help`` and ``--version``).
+
+    Args:
+        archive_filename (:obj:`str`): path to COMBINE/OMEX archive
+        out_dir (:obj:`str`): path to store the outputs of the archive
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        output_ids (:obj:`list` of :obj:`str`, optional): ids of the outputs to generate; :obj:`None` means all outputs
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`SedDocumentResults`: results
+            * :obj:`CombineArchiveLog`: log
+    """
+    from .core import exec_sedml_docs_in_combine_archive
+    return exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=config, output_ids=output_ids)
+
+
+_App = build_cli('biosimulators-my-simulator', __version__,
+                 'My Simulator', get_simulator_version(), 'https://url.for.my.simulator',
+                 exec_sedml_docs_in_combine_archive)
+
+
+class BaseController(_App.Meta.handlers[0]):
+    """ Base controller for executing a COMBINE/OMEX archive, which can be restricted to selected outputs """
+
+    class Meta:
+        arguments = _App.Meta.handlers[0].Meta.arguments + [
+            (
+                ['-r', '--outputs'],
+                dict(
+                    type=str,
+                    nargs='+',
+                    default=None,
+                    help=('Ids of the reports and plots to generate (e.g., `report` or `simulation.sedml/report`); '
+                          'only the tasks needed by these outputs are executed. Default: all outputs'),
+                ),
+            ),
+        ]
+
+    @cement.ex(hide=True)
+    def _default(self):
+        args = self.app.pargs
+        config = get_config()
+        config.LOG = True
+        try:
+            _, log = exec_sedml_docs_in_combine_archive(args.archive, args.out_dir, config=config, output_ids=args.outputs)
+        except Exception as exception:
+            if config.DEBUG:
+                raise
+            raise SystemExit(termcolor.colored(str(exception), 'red')) from exception
+
+        if log and log.exception:
+            raise SystemExit(termcolor.colored(str(log.exception), 'red')) from log.exception
+
+
+class App(_App):
+    """ Command-line application for executing a COMBINE/OMEX archive """
+
+    class Meta:
+        handlers = [
+            BaseController,
+        ]
+
+
+class BatchController(cement.Controller):
+    """ Controller for executing batches of COMBINE/OMEX archives """
+
+    class Meta:
+        label = 'base'
+        description = ('Execute the SED-ML files in multiple COMBINE/OMEX archives with MySimulator in a single '
+                       'process and save a summary of the status and duration of each archive to `{ out-dir }/batch.json`')
+        help = 'biosimulators-my-simulator batch'
+        arguments = [
+            (
+                ['-i', '--archives'],
+                dict(
+                    type=str,
+                    nargs='+',
+                    required=True,
+                    help='Paths to COMBINE/OMEX files or to directories of COMBINE/OMEX files',
+                ),
+            ),
+            (
+                ['-o', '--out-dir'],
+                dict(
+                    type=str,
+                    default='.',
+                    help='Directory to save outputs; the outputs of each archive are saved to a subdirectory',
+                ),
+            ),
+            (
+                ['-w', '--workers'],
+                dict(
+                    type=int,
+                    default=1,
+                    help='Number of worker processes',
+                ),
+            ),
+        ]
+
+    @cement.ex(hide=True)
+    def _default(self):
+        from .core import exec_sedml_docs_in_combine_archives
+
+        args = self.app.pargs
+        config = get_config()
+        config.LOG = True
+        summary = exec_sedml_docs_in_combine_archives(args.archives, args.out_dir, num_workers=args.workers, config=config)
+
+        failed_archives = [archive['archive'] for archive in summary['archives'] if archive['status'] != Status.SUCCEEDED.value]
+        if failed_archives:
+            raise SystemExit(termcolor.colored('{} of {} archives failed:\n  {}'.format(
+                len(failed_archives), len(summary['archives']), '\n  '.join(failed_archives)), 'red'))
+
+
+class BatchApp(cement.App):
+    """ Command-line application for executing batches of COMBINE/OMEX archives """
+
+    class Meta:
+        label = 'biosimulators-my-simulator-batch'
+        base_controller = 'base'
+        handlers = [
+            BatchController,
+        ]
+
+
+class ServerController(cement.Controller):
+    """ Controller for executing COMBINE/OMEX archives on request in a long-lived process """
+
+    class Meta:
+        label = 'base'
+        description = ('Execute COMBINE/OMEX archives with MySimulator on request. Requests (e.g., '
+                       '`{"id": 1, "archive": "archive.omex", "outDir": "out"}`) and responses are JSON objects, one per '
+                       'line, exchanged via standard input and output or via a UNIX socket. The server stops after '
+                       '`{"command": "shutdown"}`, the end of standard input or `SIGTERM`, once it has executed the '
+                       'archives which it already accepted.')
+        help = 'biosimulators-my-simulator serve'
+        arguments = [
+            (
+                ['-s', '--socket'],
+                dict(
+                    type=str,
+                    default=None,
+                    help='Path of a UNIX socket to accept requests from, instead of standard input',
+                ),
+            ),
+            (
+                ['-c', '--concurrency'],
+                dict(
+                    type=int,
+                    default=1,
+                    help='Maximum number of archives to execute concurrently',
+                ),
+            ),
+        ]
+
+    @cement.ex(hide=True)
+    def _default(self):
+        from .core import exec_sedml_docs_in_combine_archive
+        from .server import Server
+
+        args = self.app.pargs
+        config = get_config()
+        config.LOG = True
+        server = Server(exec_sedml_docs_in_combine_archive, max_concurrency=args.concurrency, config=config)
+        if args.socket:
+            server.serve_unix_socket(args.socket)
+        else:
+            server.serve_stdio()
+
+
+class ServerApp(cement.App):
+    """ Command-line application for executing COMBINE/OMEX archives on request in a long-lived process """
+
+    class Meta:
+        label = 'biosimulators-my-simulator-serve'
+        base_controller = 'base'
+        handlers = [
+            ServerController,
+        ]
 
 
 def main():
-    with App() as app:
-        app.run()
+    if sys.argv[1:2] == ['batch']:
+        with BatchApp(argv=sys.argv[2:]) as app:
+            app.run()
+    elif sys.argv[1:2] == ['serve']:
+        with ServerApp(argv=sys.argv[2:]) as app:
+            app.run()
+    else:
+        with App() as app:
+            app.run()
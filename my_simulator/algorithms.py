@@ -0,0 +1,150 @@
+""" Precomputed tables for resolving the algorithms of SED tasks and parsing their parameters
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .data_model import KISAO_METHOD_MAP
+from biosimulators_utils.data_model import ValueType
+from biosimulators_utils.utils.core import parse_value
+from kisao.data_model import AlgorithmSubstitutionPolicy
+from kisao.utils import get_preferred_substitute_algorithm_by_ids
+import functools
+import threading
+
+__all__ = [
+    'AlgorithmTable',
+    'get_algorithm_table',
+]
+
+PARAMETER_VALUE_PARSERS = {
+    ValueType.boolean: lambda value: value.lower() in ('true', '1'),
+    ValueType.integer: int,
+    ValueType.float: float,
+    ValueType.string: str,
+}
+# :obj:`dict`: dictionary that maps value types to functions which parse string representations of values of the types.
+# Values of other types are parsed by :obj:`parse_value`.
+
+
+class AlgorithmTable(object):
+    """ Table of the algorithms of :obj:`KISAO_METHOD_MAP`, which resolves requested algorithms to the algorithms that
+    are executed and parses the values of their parameters without traversing the KiSAO ontology for each task
+
+    Each algorithm of the map resolves to itself under every substitution policy. Other requested algorithms are resolved
+    with the KiSAO ontology on their first request, and their resolution is then kept.
+
+    Attributes:
+        method_map (:obj:`collections.OrderedDict`): map from the KiSAO ids of algorithms to their simulation methods
+            and parameters (e.g., :obj:`KISAO_METHOD_MAP`)
+    """
+
+    def __init__(self, method_map):
+        """
+        Args:
+            method_map (:obj:`collections.OrderedDict`): map from the KiSAO ids of algorithms to their simulation methods
+                and parameters
+        """
+        self.method_map = method_map
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """ Recompute the table from the method map (e.g., after the map was modified) """
+        with self._lock:
+            self._substitutions = {
+                (kisao_id, substitution_policy): kisao_id
+                for kisao_id in self.method_map.keys()
+                for substitution_policy in AlgorithmSubstitutionPolicy
+            }
+            self._parameter_parsers = {
+                kisao_id: {
+                    parameter_kisao_id: (parameter['arg'], get_parameter_value_parser(parameter['type']))
+                    for parameter_kisao_id, parameter in properties['parameters'].items()
+                }
+                for kisao_id, properties in self.method_map.items()
+            }
+
+    def get_algorithm(self, kisao_id, substitution_policy):
+        """ Get the algorithm which should be executed for a requested algorithm
+
+        Args:
+            kisao_id (:obj:`str`): KiSAO id of the requested algorithm
+            substitution_policy (:obj:`AlgorithmSubstitutionPolicy`): algorithm substitution policy
+
+        Returns:
+            :obj:`str`: KiSAO id of the algorithm of :obj:`method_map` which should be executed
+
+        Raises:
+            :obj:`AlgorithmCannotBeSubstitutedException`: if no algorithm of :obj:`method_map` can be substituted for the
+                requested algorithm under the policy
+        """
+        key = (kisao_id, substitution_policy)
+        alg_kisao_id = self._substitutions.get(key, None)
+        if alg_kisao_id is None:
+            alg_kisao_id = get_preferred_substitute_algorithm_by_ids(kisao_id, list(self.method_map.keys()),
+                                                                     substitution_policy=substitution_policy)
+            with self._lock:
+                self._substitutions[key] = alg_kisao_id
+        return alg_kisao_id
+
+    def parse_parameter_changes(self, alg_kisao_id, changes):
+        """ Parse the values of the parameters of an algorithm into arguments for its simulation method
+
+        Args:
+            alg_kisao_id (:obj:`str`): KiSAO id of an algorithm of :obj:`method_map`
+            changes (:obj:`list` of :obj:`AlgorithmParameterChange`): changes to the parameters of the algorithm
+
+        Returns:
+            :obj:`dict`: dictionary that maps the names of the arguments of the simulation method to their values
+
+        Raises:
+            :obj:`NotImplementedError`: if the algorithm doesn't support a parameter
+        """
+        parameter_parsers = self._parameter_parsers[alg_kisao_id]
+        args = {}
+        for change in changes:
+            arg_parser = parameter_parsers.get(change.kisao_id, None)
+
+            if arg_parser is None:
+                raise NotImplementedError("".join([
+                    "Algorithm parameter with KiSAO id '{}' is not supported. ".format(change.kisao_id),
+                    "Parameter must have one of the following KiSAO ids:\n  - {}".format('\n  - '.join(
+                        '{}: {}'.format(kisao_id, parameter['name'])
+                        for kisao_id, parameter in self.method_map[alg_kisao_id]['parameters'].items())),
+                ]))
+
+            arg, parser = arg_parser
+            args[arg] = parser(change.new_value)
+        return args
+
+
+def get_parameter_value_parser(type):
+    """ Get a function which parses string representations of values of a type
+
+    Args:
+        type (:obj:`ValueType`): type
+
+    Returns:
+        :obj:`types.FunctionType`: function which parses a string representation of a value of the type
+    """
+    return PARAMETER_VALUE_PARSERS.get(type, None) or functools.partial(parse_value, type=type)
+
+
+_algorithm_table = None
+_algorithm_table_lock = threading.Lock()
+
+
+def get_algorithm_table():
+    """ Get the process-wide table of the algorithms of :obj:`KISAO_METHOD_MAP`
+
+    Returns:
+        :obj:`AlgorithmTable`: algorithm table
+    """
+    global _algorithm_table
+    with _algorithm_table_lock:
+        if _algorithm_table is None:
+            _algorithm_table = AlgorithmTable(KISAO_METHOD_MAP)
+        return _algorithm_table
@@ -0,0 +1,307 @@
+""" Methods for only extracting the files of COMBINE/OMEX archives which are needed to execute them
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .config import DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE
+from biosimulators_utils.combine import exec as combine_exec
+from biosimulators_utils.combine import io as combine_io
+from biosimulators_utils.combine.data_model import CombineArchive, CombineArchiveContent, CombineArchiveContentFormatPattern
+from biosimulators_utils.combine.io import CombineArchiveReader, get_combine_errors_warnings
+from biosimulators_utils.combine.utils import get_sedml_contents
+from biosimulators_utils.sedml.io import SedmlSimulationReader
+import concurrent.futures
+import contextlib
+import libcombine
+import os
+import re
+import shutil
+import threading
+import zipfile
+
+__all__ = [
+    'MAX_EXTRACTION_THREADS',
+    'STREAM_BUFFER_SIZE',
+    'UNNEEDED_FORMAT_PATTERNS',
+    'get_archive_entries',
+    'extract_archive_entries',
+    'get_sed_doc_dependencies',
+    'get_needed_archive_locations',
+    'SelectiveZipFile',
+    'SelectiveCombineArchiveReader',
+    'selective_archive_extraction',
+]
+
+MAX_EXTRACTION_THREADS = 4
+# :obj:`int`: maximum number of files of an archive which are decompressed concurrently
+
+STREAM_BUFFER_SIZE = 1024 * 1024
+# :obj:`int`: size (bytes) of the blocks in which large files are streamed from archives to disk
+
+UNNEEDED_FORMAT_PATTERNS = (
+    r'^https?://purl\.org/NET/mediatypes/(image|video|audio)/',
+    r'^https?://purl\.org/NET/mediatypes/application/pdf$',
+)
+# :obj:`tuple` of :obj:`str`: patterns of the formats of the files of archives which are only used for figures and media,
+# and which aren't needed to execute archives
+
+_selective_extraction = threading.local()
+_reader_lock = threading.Lock()
+_reader_users = 0
+
+
+def get_archive_entries(zip_archive):
+    """ Get the files of a zip archive, indexed by their normalized locations
+
+    Files whose locations are absolute or outside of the archive are excluded.
+
+    Args:
+        zip_archive (:obj:`zipfile.ZipFile`): zip archive
+
+    Returns:
+        :obj:`dict`: dictionary that maps the normalized location of each file to its :obj:`zipfile.ZipInfo`
+    """
+    entries = {}
+    for info in zip_archive.infolist():
+        location = os.path.normpath(info.filename)
+        if not info.is_dir() and not os.path.isabs(location) and location.split(os.sep)[0] != '..':
+            entries[location] = info
+    return entries
+
+
+def extract_archive_entries(zip_archive, entries, locations, out_dir, in_memory_max_size=DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE):
+    """ Extract files from a zip archive
+
+    Small files are decompressed into memory and written at once; larger files are streamed to disk. Files are
+    decompressed concurrently by up to :obj:`MAX_EXTRACTION_THREADS` threads.
+
+    Args:
+        zip_archive (:obj:`zipfile.ZipFile`): zip archive
+        entries (:obj:`dict`): dictionary that maps the normalized location of each file of the archive to its
+            :obj:`zipfile.ZipInfo` (see :obj:`get_archive_entries`)
+        locations (:obj:`list` of :obj:`str`): normalized locations of the files to extract; locations which are not
+            files of the archive are ignored
+        out_dir (:obj:`str`): directory to extract the files to
+        in_memory_max_size (:obj:`int`, optional): maximum size (bytes) of the files which are decompressed into memory
+    """
+    infos = [entries[location] for location in locations if location in entries]
+
+    def extract(info):
+        filename = os.path.join(out_dir, os.path.normpath(info.filename))
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        if info.file_size <= in_memory_max_size:
+            data = zip_archive.read(info)
+            with open(filename, 'wb') as file:
+                file.write(data)
+        else:
+            with zip_archive.open(info) as in_file:
+                with open(filename, 'wb') as file:
+                    shutil.copyfileobj(in_file, file, STREAM_BUFFER_SIZE)
+
+    if len(infos) <= 1:
+        for info in infos:
+            extract(info)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_EXTRACTION_THREADS, len(infos))) as executor:
+            list(executor.map(extract, infos))
+
+
+def get_sed_doc_dependencies(sedml_filename, location):
+    """ Get the locations of the files which a SED-ML file references (models and data), relative to its archive
+
+    Sources which are URIs (e.g., ``urn:miriam:biomodels.db:BIOMD0000000297``) or references to other models of the
+    document (e.g., ``#model``) are excluded.
+
+    Args:
+        sedml_filename (:obj:`str`): path to the SED-ML file
+        location (:obj:`str`): location of the SED-ML file within its archive
+
+    Returns:
+        :obj:`list` of :obj:`str`: normalized locations of the referenced files
+    """
+    doc = SedmlSimulationReader().run(sedml_filename,
+                                      validate_semantics=False,
+                                      validate_models_with_languages=False,
+                                      validate_targets_with_model_sources=False)
+
+    sources = [model.source for model in doc.models]
+    sources += [data_description.source for data_description in getattr(doc, 'data_descriptions', [])]
+
+    dependencies = []
+    for source in sources:
+        if source and not source.startswith('#') and not re.match(r'^[a-zA-Z][a-zA-Z0-9+.\-]+:', source):
+            dependencies.append(os.path.normpath(os.path.join(os.path.dirname(location), source)))
+    return dependencies
+
+
+def get_needed_archive_locations(in_file, out_dir, in_memory_max_size=DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE):
+    """ Get the files of a COMBINE/OMEX archive which are needed to execute it: all of its files, except the SED-ML files
+    which won't be executed and files whose formats are only used for figures and media (see
+    :obj:`UNNEEDED_FORMAT_PATTERNS`), unless the executed SED-ML files reference them
+
+    Models can reference files which aren't described as models by the manifest (e.g., SBML external model definitions,
+    CellML imports), so files of other formats, and files which the manifest doesn't describe, are needed. The SED-ML
+    files which will be executed are extracted to determine the files which they reference.
+
+    Args:
+        in_file (:obj:`str`): path to the archive
+        out_dir (:obj:`str`): directory to extract the SED-ML files which will be executed to
+        in_memory_max_size (:obj:`int`, optional): maximum size (bytes) of the files which are decompressed into memory
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`set` of :obj:`str`: normalized locations of the needed files
+            * :obj:`set` of :obj:`str`: normalized locations of the needed files which have been extracted
+
+        or :obj:`None` if the archive isn't a COMBINE/OMEX archive with a valid manifest
+    """
+    archive_comb = libcombine.CombineArchive()
+    if not archive_comb.initializeFromArchive(in_file) or get_combine_errors_warnings(archive_comb.getManifest())[0]:
+        return None
+
+    archive = CombineArchive()
+    for location in archive_comb.getAllLocations():
+        file_comb = archive_comb.getEntryByLocation(location.c_str())
+        archive.contents.append(CombineArchiveContent(
+            location=location.c_str(),
+            format=file_comb.getFormat() if file_comb.isSetFormat() else None,
+            master=file_comb.isSetMaster() and file_comb.getMaster(),
+        ))
+    formats = {os.path.normpath(content.location): content.format for content in archive.contents}
+    sedml_locations = set(os.path.normpath(content.location) for content in get_sedml_contents(archive))
+
+    with zipfile.ZipFile(in_file, 'r') as zip_archive:
+        entries = get_archive_entries(zip_archive)
+
+        locations = set()
+        for location in entries:
+            format = formats.get(location, None) or ''
+            if re.match(CombineArchiveContentFormatPattern.SED_ML.value, format) and location not in sedml_locations:
+                continue
+            if any(re.match(pattern, format) for pattern in UNNEEDED_FORMAT_PATTERNS):
+                continue
+            locations.add(location)
+
+        extracted_locations = sedml_locations.intersection(entries)
+        extract_archive_entries(zip_archive, entries, sorted(extracted_locations), out_dir,
+                                in_memory_max_size=in_memory_max_size)
+
+    for sedml_location in extracted_locations:
+        try:
+            dependencies = get_sed_doc_dependencies(os.path.join(out_dir, sedml_location), sedml_location)
+            locations.update(location for location in dependencies if location in entries)
+        except Exception:
+            # invalid SED-ML files are reported by the validation of the archive
+            pass
+
+    return locations, extracted_locations
+
+
+class SelectiveZipFile(zipfile.ZipFile):
+    """ Zip file whose :obj:`extractall` only extracts the files selected by :obj:`SelectiveCombineArchiveReader`, in
+    the threads in which a selection is active
+    """
+
+    def extractall(self, path=None, members=None, pwd=None):
+        """ Extract the selected files, or all files if no files are selected
+
+        Args:
+            path (:obj:`str`, optional): directory to extract the files to
+            members (:obj:`list`, optional): files to extract
+            pwd (:obj:`bytes`, optional): password
+        """
+        selection = getattr(_selective_extraction, 'selection', None)
+        if selection is None or members is not None or pwd is not None:
+            return super(SelectiveZipFile, self).extractall(path=path, members=members, pwd=pwd)
+
+        locations, in_memory_max_size = selection
+        extract_archive_entries(self, get_archive_entries(self), sorted(locations), path or os.getcwd(),
+                                in_memory_max_size=in_memory_max_size)
+
+
+class SelectiveCombineArchiveReader(CombineArchiveReader):
+    """ Reader for COMBINE/OMEX archives which only extracts the files which are needed to execute them (see
+    :obj:`get_needed_archive_locations`), rather than all of the files of archives
+
+    The archives are read by :obj:`CombineArchiveReader`, whose extraction of the files of archives is limited to the
+    needed files, and the contents of the returned archives are limited to the extracted files. Outside of
+    :obj:`selective_archive_extraction`, and for plain zip archives and archives with invalid manifests, the reader
+    extracts all files as :obj:`CombineArchiveReader` does.
+    """
+
+    def run(self, in_file, out_dir, include_omex_metadata_files=True, config=None):
+        """ Read an archive from a file
+
+        Args:
+            in_file (:obj:`str`): path to archive
+            out_dir (:obj:`str`): directory where the contents of the archive should be unpacked
+            include_omex_metadata_files (:obj:`bool`, optional): whether to include the OMEX metadata
+                file as part of the contents of the archive
+            config (:obj:`Config`, optional): configuration
+
+        Returns:
+            :obj:`CombineArchive`: description of archive
+
+        Raises:
+            :obj:`ValueError`: archive is invalid
+        """
+        in_memory_max_size = getattr(_selective_extraction, 'in_memory_max_size', None)
+        if in_memory_max_size is None or not os.path.isfile(in_file):
+            needed_locations = None
+        else:
+            needed_locations = get_needed_archive_locations(in_file, out_dir, in_memory_max_size=in_memory_max_size)
+
+        if needed_locations is None:
+            return super(SelectiveCombineArchiveReader, self).run(
+                in_file, out_dir, include_omex_metadata_files=include_omex_metadata_files, config=config)
+
+        locations, extracted_locations = needed_locations
+        _selective_extraction.selection = (locations.difference(extracted_locations), in_memory_max_size)
+        try:
+            archive = super(SelectiveCombineArchiveReader, self).run(
+                in_file, out_dir, include_omex_metadata_files=include_omex_metadata_files, config=config)
+        finally:
+            _selective_extraction.selection = None
+
+        archive.contents = [content for content in archive.contents if os.path.normpath(content.location) in locations]
+        return archive
+
+
+@contextlib.contextmanager
+def selective_archive_extraction(in_memory_max_size=DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE):
+    """ Only extract the files of COMBINE/OMEX archives which are needed to execute them, within the current thread
+
+    :obj:`biosimulators_utils.combine.exec.exec_sedml_docs_in_archive` reads archives with the
+    :obj:`CombineArchiveReader` of its module. Within this context, it reads them with
+    :obj:`SelectiveCombineArchiveReader`, which extracts the needed files in the threads which entered the context and
+    all files in other threads.
+
+    Args:
+        in_memory_max_size (:obj:`int`, optional): maximum size (bytes) of the files which are decompressed into memory;
+            larger files are streamed to disk
+    """
+    global _reader_users
+
+    with _reader_lock:
+        if not _reader_users:
+            combine_exec.CombineArchiveReader = SelectiveCombineArchiveReader
+            combine_io.Zip = SelectiveZipFile
+        _reader_users += 1
+
+    prev_in_memory_max_size = getattr(_selective_extraction, 'in_memory_max_size', None)
+    _selective_extraction.in_memory_max_size = in_memory_max_size
+    try:
+        yield
+    finally:
+        _selective_extraction.in_memory_max_size = prev_in_memory_max_size
+
+        with _reader_lock:
+            _reader_users -= 1
+            if not _reader_users:
+                combine_exec.CombineArchiveReader = CombineArchiveReader
+                combine_io.Zip = zipfile.ZipFile
@@ -0,0 +1,156 @@
+""" Methods for executing batches of COMBINE/OMEX archives in a single long-lived process or pool of processes
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .parallel import get_worker_context
+from biosimulators_utils.log.data_model import Status
+import concurrent.futures
+import datetime
+import glob
+import json
+import os
+
+__all__ = [
+    'BATCH_MANIFEST_PATH',
+    'get_combine_archive_filenames',
+    'get_batch_out_dirs',
+    'exec_combine_archives',
+]
+
+BATCH_MANIFEST_PATH = 'batch.json'
+# :obj:`str`: path of the summary of the execution of a batch of archives relative to the base output directory
+
+COMBINE_ARCHIVE_EXTENSIONS = ('.omex', '.zip')
+
+
+def get_combine_archive_filenames(paths):
+    """ Get the paths of the COMBINE/OMEX archives in a list of paths to archives and directories of archives
+
+    Args:
+        paths (:obj:`list` of :obj:`str`): paths to COMBINE/OMEX archives or to directories which contain archives
+
+    Returns:
+        :obj:`list` of :obj:`tuple` of :obj:`str`: path to each archive and its path relative to the directory that
+            contained it (or its base name, for paths to individual archives)
+    """
+    archives = []
+    for path in paths:
+        if os.path.isdir(path):
+            for filename in sorted(glob.glob(os.path.join(path, '**', '*'), recursive=True)):
+                if os.path.isfile(filename) and os.path.splitext(filename)[1].lower() in COMBINE_ARCHIVE_EXTENSIONS:
+                    archives.append((filename, os.path.relpath(filename, path)))
+        elif os.path.isfile(path):
+            archives.append((path, os.path.basename(path)))
+        else:
+            raise FileNotFoundError('`{}` is not a COMBINE/OMEX archive or a directory of archives.'.format(path))
+    return archives
+
+
+def get_batch_out_dirs(archives):
+    """ Get a unique output directory for each archive of a batch
+
+    Args:
+        archives (:obj:`list` of :obj:`tuple` of :obj:`str`): path to each archive and its relative path
+
+    Returns:
+        :obj:`list` of :obj:`str`: output directory for each archive, relative to the base output directory
+    """
+    out_dirs = []
+    used_out_dirs = set()
+    for _, rel_path in archives:
+        out_dir = os.path.splitext(rel_path)[0]
+        unique_out_dir = out_dir
+        i_duplicate = 1
+        while unique_out_dir in used_out_dirs:
+            i_duplicate += 1
+            unique_out_dir = '{}_{}'.format(out_dir, i_duplicate)
+        used_out_dirs.add(unique_out_dir)
+        out_dirs.append(unique_out_dir)
+    return out_dirs
+
+
+def exec_combine_archives(archive_executer, paths, out_dir, num_workers=1, config=None, simulator_config=None):
+    """ Execute a batch of COMBINE/OMEX archives, save the outputs of each archive to its own subdirectory of
+    :obj:`out_dir`, and save a summary of the execution of each archive to ``{ out_dir }/batch.json``
+
+    Args:
+        archive_executer (:obj:`types.FunctionType`): function to execute each archive
+            (e.g., :obj:`my_simulator.core.exec_sedml_docs_in_combine_archive`)
+        paths (:obj:`list` of :obj:`str`): paths to COMBINE/OMEX archives or to directories which contain archives
+        out_dir (:obj:`str`): directory to store the outputs of the archives
+        num_workers (:obj:`int`, optional): number of worker processes; ``1`` executes the archives serially in the current
+            process
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
+
+    Returns:
+        :obj:`dict`: summary of the execution of the batch, including the status, duration (seconds) and exception of
+            each archive
+    """
+    archives = get_combine_archive_filenames(paths)
+    out_dirs = get_batch_out_dirs(archives)
+
+    start_time = datetime.datetime.now()
+    args = [
+        (archive_executer, archive_filename, os.path.join(out_dir, archive_out_dir), config, simulator_config)
+        for (archive_filename, _), archive_out_dir in zip(archives, out_dirs)
+    ]
+    if num_workers > 1 and len(archives) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(num_workers, len(archives)),
+                                                    mp_context=get_worker_context()) as executor:
+            archive_summaries = list(executor.map(_exec_combine_archive, *zip(*args)))
+    else:
+        archive_summaries = [_exec_combine_archive(*archive_args) for archive_args in args]
+
+    for archive_summary, archive_out_dir in zip(archive_summaries, out_dirs):
+        archive_summary['outDir'] = archive_out_dir
+
+    summary = {
+        'status': (Status.SUCCEEDED if all(archive_summary['status'] == Status.SUCCEEDED.value
+                                           for archive_summary in archive_summaries)
+                   else Status.FAILED).value,
+        'duration': (datetime.datetime.now() - start_time).total_seconds(),
+        'archives': archive_summaries,
+    }
+
+    if not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+    with open(os.path.join(out_dir, BATCH_MANIFEST_PATH), 'w') as file:
+        json.dump(summary, file, indent=2)
+
+    return summary
+
+
+def _exec_combine_archive(archive_executer, archive_filename, out_dir, config, simulator_config):
+    """ Execute a COMBINE/OMEX archive and summarize its execution
+
+    Args:
+        archive_executer (:obj:`types.FunctionType`): function to execute the archive
+        archive_filename (:obj:`str`): path to the archive
+        out_dir (:obj:`str`): directory to store the outputs of the archive
+        config (:obj:`Config`): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`): MySimulator configuration
+
+    Returns:
+        :obj:`dict`: status, duration (seconds) and exception of the execution of the archive
+    """
+    start_time = datetime.datetime.now()
+    try:
+        _, log = archive_executer(archive_filename, out_dir, config=config, simulator_config=simulator_config)
+        exception = log.exception if log else None
+    except Exception as caught_exception:
+        exception = caught_exception
+
+    return {
+        'archive': archive_filename,
+        'status': (Status.FAILED if exception else Status.SUCCEEDED).value,
+        'duration': (datetime.datetime.now() - start_time).total_seconds(),
+        'exception': {
+            'type': exception.__class__.__name__,
+            'message': str(exception),
+        } if exception else None,
+    }
@@ -0,0 +1,626 @@
+""" Process-wide caches which allow repeated executions of tasks to skip redundant work
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .algorithms import get_algorithm_table
+from .config import get_simulator_config
+from .utils import get_file_digest
+from biosimulators_utils.report.data_model import VariableResults
+from biosimulators_utils.sedml import validation
+import collections
+import copy
+import json
+from my_simulator import read_model
+import numpy
+import os
+import tempfile
+import threading
+import zipfile
+
+__all__ = [
+    'LruCache', 'ModelCache', 'XPathCache', 'ValidationCache', 'ResultStore', 'CheckpointCache',
+    'get_model_cache', 'get_xpath_cache', 'get_validation_cache', 'get_result_store', 'get_checkpoint_cache',
+    'get_cache_stats', 'clear_caches',
+]
+
+
+class LruCache(object):
+    """ Thread-safe least-recently-used cache whose capacity is bounded by the total size of its entries
+
+    Attributes:
+        max_size (:obj:`int`): maximum total size of the entries; :obj:`None` means unbounded
+        size (:obj:`int`): total size of the entries
+        hits (:obj:`int`): number of lookups which were served from the cache
+        misses (:obj:`int`): number of lookups which were not served from the cache
+    """
+
+    def __init__(self, max_size=None):
+        """
+        Args:
+            max_size (:obj:`int`, optional): maximum total size of the entries; :obj:`None` means unbounded
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """ Get an entry and mark it as the most recently used entry
+
+        Args:
+            key (:obj:`object`): key
+            default (:obj:`object`, optional): value to return if the cache does not contain :obj:`key`
+
+        Returns:
+            :obj:`object`: value
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, size=1):
+        """ Add an entry, evicting the least recently used entries as needed to respect :obj:`max_size`
+
+        Entries larger than :obj:`max_size` are not cached.
+
+        Args:
+            key (:obj:`object`): key
+            value (:obj:`object`): value
+            size (:obj:`int`, optional): size of the entry
+        """
+        with self._lock:
+            self.discard(key)
+
+            if self.max_size is not None and size > self.max_size:
+                return
+
+            self._entries[key] = (value, size)
+            self.size += size
+
+            while self.max_size is not None and self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def discard(self, key):
+        """ Remove an entry, if it is in the cache
+
+        Args:
+            key (:obj:`object`): key
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def clear(self):
+        """ Remove all entries and reset the hit and miss counters """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """ Get statistics about the usage of the cache
+
+        Returns:
+            :obj:`dict`: number of entries, total size of the entries, and numbers of hits and misses
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class ModelCache(LruCache):
+    """ Cache of models read by :obj:`my_simulator.read_model`, keyed by the digest of the content of each model file
+    and its language. The size of each entry is the size of its model file.
+
+    Attributes:
+        copy_models (:obj:`bool`): whether to return copies of cached models rather than shared instances
+    """
+
+    def __init__(self, max_size=None, copy_models=True):
+        """
+        Args:
+            max_size (:obj:`int`, optional): maximum total size (bytes) of the cached model files; :obj:`None` means unbounded
+            copy_models (:obj:`bool`, optional): whether to return copies of cached models rather than shared instances
+        """
+        super(ModelCache, self).__init__(max_size=max_size)
+        self.copy_models = copy_models
+
+    def read_model(self, filename, language, digest=None):
+        """ Read a model, reusing a previously read model with identical content and language
+
+        Args:
+            filename (:obj:`str`): path to the model
+            language (:obj:`str`): language of the model (e.g., ``urn:sedml:language:sbml``)
+            digest (:obj:`str`, optional): digest of the content of the model from :obj:`get_file_digest`,
+                if it has already been computed
+
+        Returns:
+            :obj:`object`: model
+        """
+        key = (digest or get_file_digest(filename), language)
+        model = self.get(key)
+        if model is None:
+            model = read_model(filename, language=language)
+            self.set(key, model, size=os.path.getsize(filename))
+
+        if self.copy_models:
+            model = copy.deepcopy(model)
+        return model
+
+
+class XPathCache(LruCache):
+    """ Cache of the model elements referenced by the targets of variables, keyed by the digest of the content of
+    each model file and the set of targets (and their namespaces). The size of each entry is 1.
+    """
+
+    def validate_target_xpaths(self, variables, model_source, attr='id', digest=None):
+        """ Validate that the target of each variable matches one object in an XML-encoded model and get the value of
+        one of its attributes, reusing the result of a previous validation of the same targets against a model with
+        identical content
+
+        Args:
+            variables (:obj:`list` of :obj:`Variable`): variables
+            model_source (:obj:`str`): path to the model
+            attr (:obj:`str`, optional): attribute to get values of
+            digest (:obj:`str`, optional): digest of the content of the model from :obj:`get_file_digest`,
+                if it has already been computed
+
+        Returns:
+            :obj:`dict` of :obj:`str` to :obj:`str`: dictionary that maps each XPath to the value of the attribute of
+                the object in the XML file that matches the XPath
+        """
+        targets = frozenset(
+            (variable.target, frozenset((variable.target_namespaces or {}).items()))
+            for variable in variables
+            if variable.target
+        )
+        key = (digest or get_file_digest(model_source), attr, targets)
+
+        target_x_paths_ids = self.get(key)
+        if target_x_paths_ids is None:
+            target_x_paths_ids = validation.validate_target_xpaths(variables, model_source, attr=attr)
+            self.set(key, target_x_paths_ids)
+
+        return dict(target_x_paths_ids)
+
+
+class ValidationCache(LruCache):
+    """ Cache of the digests of the tasks which passed validation (see :obj:`get_sed_task_digest`), optionally
+    persisted to a directory with one empty file per digest. The size of each entry is 1.
+
+    Attributes:
+        dirname (:obj:`str`): directory to persist the digests of validated tasks to; :obj:`None` means that the cache is
+            not persisted
+    """
+
+    def __init__(self, max_size=None, dirname=None):
+        """
+        Args:
+            max_size (:obj:`int`, optional): maximum number of digests kept in memory; :obj:`None` means unbounded
+            dirname (:obj:`str`, optional): directory to persist the digests of validated tasks to
+        """
+        super(ValidationCache, self).__init__(max_size=max_size)
+        self.dirname = dirname
+
+    def is_valid(self, digest):
+        """ Determine whether a task previously passed validation
+
+        Args:
+            digest (:obj:`str`): digest of the task
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the task previously passed validation
+        """
+        if self.get(digest, False):
+            return True
+
+        if self.dirname and os.path.isfile(os.path.join(self.dirname, digest)):
+            self.set(digest, True)
+            return True
+
+        return False
+
+    def add_valid(self, digest):
+        """ Record that a task passed validation
+
+        Args:
+            digest (:obj:`str`): digest of the task
+        """
+        self.set(digest, True)
+
+        if self.dirname:
+            if not os.path.isdir(self.dirname):
+                os.makedirs(self.dirname, exist_ok=True)
+            with open(os.path.join(self.dirname, digest), 'w'):
+                pass
+
+
+class ResultStore(object):
+    """ Store of the results of tasks, persisted to a directory with one NumPy ``.npz`` file per digest of the inputs of
+    a task (see :obj:`get_sed_task_results_digest`). The total size of the files is bounded by evicting the least
+    recently used results, as recorded by the modification times of their files.
+
+    Attributes:
+        dirname (:obj:`str`): directory to store the results in; :obj:`None` means that the store is disabled
+        max_size (:obj:`int`): maximum total size (bytes) of the files of the results; :obj:`None` means unbounded
+        hits (:obj:`int`): number of lookups which were served from the store
+        misses (:obj:`int`): number of lookups which were not served from the store
+    """
+
+    FILE_EXTENSION = '.npz'
+
+    def __init__(self, dirname=None, max_size=None):
+        """
+        Args:
+            dirname (:obj:`str`, optional): directory to store the results in; :obj:`None` disables the store
+            max_size (:obj:`int`, optional): maximum total size (bytes) of the files of the results; :obj:`None` means
+                unbounded
+        """
+        self.dirname = dirname
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        """ Get the stored results of a task and mark them as the most recently used results
+
+        Args:
+            digest (:obj:`str`): digest of the inputs of the task
+
+        Returns:
+            :obj:`tuple`: results of the variables (:obj:`VariableResults`), KiSAO id of the executed algorithm and
+                additional simulator-specific information about the execution, or :obj:`None` if the store does not
+                contain results for the digest
+        """
+        if not self.dirname:
+            return None
+
+        filename = self._get_filename(digest)
+        try:
+            with numpy.load(filename, allow_pickle=False) as data:
+                metadata = json.loads(str(data['metadata']))
+                variable_results = VariableResults(
+                    (variable_id, data['result_{}'.format(i_variable)])
+                    for i_variable, variable_id in enumerate(metadata['variableIds'])
+                )
+            os.utime(filename)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return variable_results, metadata['algorithm'], metadata['simulatorDetails']
+
+    def add(self, digest, variable_results, algorithm=None, simulator_details=None):
+        """ Store the results of a task, and evict the least recently used results as needed to respect :obj:`max_size`
+
+        Results which are not numeric arrays are not stored.
+
+        Args:
+            digest (:obj:`str`): digest of the inputs of the task
+            variable_results (:obj:`VariableResults`): results of the variables of the task
+            algorithm (:obj:`str`, optional): KiSAO id of the executed algorithm
+            simulator_details (:obj:`dict`, optional): additional simulator-specific information about the execution
+        """
+        if not self.dirname:
+            return
+
+        arrays = collections.OrderedDict()
+        for i_variable, result in enumerate(variable_results.values()):
+            array = numpy.asarray(result)
+            if array.dtype.hasobject:
+                return
+            arrays['result_{}'.format(i_variable)] = array
+
+        metadata = json.dumps({
+            'variableIds': list(variable_results.keys()),
+            'algorithm': algorithm,
+            'simulatorDetails': simulator_details,
+        }, default=str)
+
+        # write the results to a temporary file and then move it into place, so that concurrent processes never read
+        # partially written results
+        os.makedirs(self.dirname, exist_ok=True)
+        fid, temp_filename = tempfile.mkstemp(suffix='.tmp', dir=self.dirname)
+        try:
+            with os.fdopen(fid, 'wb') as file:
+                numpy.savez(file, metadata=numpy.array(metadata), **arrays)
+            os.replace(temp_filename, self._get_filename(digest))
+        except Exception:
+            os.remove(temp_filename)
+            raise
+
+        self._evict()
+
+    def _evict(self):
+        """ Remove the least recently used results until the total size of the files respects :obj:`max_size` """
+        if self.max_size is None:
+            return
+
+        entries = []
+        for filename in os.listdir(self.dirname):
+            if filename.endswith(self.FILE_EXTENSION):
+                try:
+                    stats = os.stat(os.path.join(self.dirname, filename))
+                except OSError:
+                    continue
+                entries.append((stats.st_mtime, stats.st_size, filename))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, filename in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.dirname, filename))
+            except OSError:
+                pass
+            size -= entry_size
+
+    def _get_filename(self, digest):
+        """ Get the path to the file of the results of a task
+
+        Args:
+            digest (:obj:`str`): digest of the inputs of the task
+
+        Returns:
+            :obj:`str`: path
+        """
+        return os.path.join(self.dirname, digest + self.FILE_EXTENSION)
+
+    def clear(self):
+        """ Remove all of the stored results and reset the hit and miss counters """
+        if self.dirname and os.path.isdir(self.dirname):
+            for filename in os.listdir(self.dirname):
+                if filename.endswith(self.FILE_EXTENSION):
+                    os.remove(os.path.join(self.dirname, filename))
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """ Get statistics about the usage of the store
+
+        Returns:
+            :obj:`dict`: number of stored results, total size of their files, and numbers of hits and misses
+        """
+        entries = 0
+        size = 0
+        if self.dirname and os.path.isdir(self.dirname):
+            for filename in os.listdir(self.dirname):
+                if filename.endswith(self.FILE_EXTENSION):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(self.dirname, filename))
+        with self._lock:
+            return {
+                'entries': entries,
+                'size': size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class CheckpointCache(LruCache):
+    """ Cache of the states of simulations at their output start times, keyed by the digest of the inputs which determine
+    them (see :obj:`my_simulator.utils.get_checkpoint_digest`). The size of each entry is the size of its state, if it is a NumPy array, or 1.
+    States which are numeric arrays can also be persisted to a directory with one NumPy ``.npy`` file per digest.
+
+    Attributes:
+        dirname (:obj:`str`): directory to persist the states to; :obj:`None` means that the cache is not persisted
+    """
+
+    FILE_EXTENSION = '.npy'
+
+    def __init__(self, max_size=None, dirname=None):
+        """
+        Args:
+            max_size (:obj:`int`, optional): maximum total size (bytes) of the states kept in memory; :obj:`None` means
+                unbounded
+            dirname (:obj:`str`, optional): directory to persist the states to
+        """
+        super(CheckpointCache, self).__init__(max_size=max_size)
+        self.dirname = dirname
+
+    @property
+    def enabled(self):
+        """ Get whether the cache keeps states in memory or persists them
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the cache is enabled
+        """
+        return self.max_size != 0 or bool(self.dirname)
+
+    def get_checkpoint(self, digest):
+        """ Get the cached state of a simulation at its output start time
+
+        Args:
+            digest (:obj:`str`): digest of the inputs which determine the state
+
+        Returns:
+            :obj:`object`: state, or :obj:`None` if the cache doesn't contain the state
+        """
+        state = self.get(digest)
+        if state is not None or not self.dirname:
+            return state
+
+        try:
+            state = numpy.load(os.path.join(self.dirname, digest + self.FILE_EXTENSION), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self.misses -= 1
+            self.hits += 1
+        self.set(digest, state, size=state.nbytes)
+        return state
+
+    def add_checkpoint(self, digest, state):
+        """ Cache the state of a simulation at its output start time
+
+        Args:
+            digest (:obj:`str`): digest of the inputs which determine the state
+            state (:obj:`object`): state
+        """
+        is_array = isinstance(state, numpy.ndarray)
+        self.set(digest, state, size=state.nbytes if is_array else 1)
+
+        if self.dirname and is_array and not state.dtype.hasobject:
+            # write the state to a temporary file and then move it into place, so that concurrent processes never read
+            # partially written states
+            os.makedirs(self.dirname, exist_ok=True)
+            fid, temp_filename = tempfile.mkstemp(suffix='.tmp', dir=self.dirname)
+            try:
+                with os.fdopen(fid, 'wb') as file:
+                    numpy.save(file, state, allow_pickle=False)
+                os.replace(temp_filename, os.path.join(self.dirname, digest + self.FILE_EXTENSION))
+            except Exception:
+                os.remove(temp_filename)
+                raise
+
+
+_model_cache = None
+_model_cache_lock = threading.Lock()
+
+
+def get_model_cache():
+    """ Get the process-wide model cache, configured by :obj:`get_simulator_config`
+
+    Returns:
+        :obj:`ModelCache`: model cache
+    """
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            simulator_config = get_simulator_config()
+            _model_cache = ModelCache(max_size=simulator_config.MODEL_CACHE_MAX_SIZE,
+                                      copy_models=simulator_config.MODEL_CACHE_COPY_MODELS)
+        return _model_cache
+
+
+_xpath_cache = None
+_xpath_cache_lock = threading.Lock()
+
+
+def get_xpath_cache():
+    """ Get the process-wide cache of the model elements referenced by targets, configured by :obj:`get_simulator_config`
+
+    Returns:
+        :obj:`XPathCache`: XPath cache
+    """
+    global _xpath_cache
+    with _xpath_cache_lock:
+        if _xpath_cache is None:
+            _xpath_cache = XPathCache(max_size=get_simulator_config().XPATH_CACHE_MAX_ENTRIES)
+        return _xpath_cache
+
+
+_validation_cache = None
+_validation_cache_lock = threading.Lock()
+
+
+def get_validation_cache():
+    """ Get the process-wide cache of the tasks which passed validation, configured by :obj:`get_simulator_config`
+
+    Returns:
+        :obj:`ValidationCache`: validation cache
+    """
+    global _validation_cache
+    with _validation_cache_lock:
+        if _validation_cache is None:
+            simulator_config = get_simulator_config()
+            _validation_cache = ValidationCache(max_size=simulator_config.VALIDATION_CACHE_MAX_ENTRIES,
+                                                dirname=simulator_config.VALIDATION_CACHE_DIR)
+        return _validation_cache
+
+
+_result_store = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """ Get the process-wide store of the results of tasks, configured by :obj:`get_simulator_config`
+
+    Returns:
+        :obj:`ResultStore`: result store
+    """
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            simulator_config = get_simulator_config()
+            _result_store = ResultStore(dirname=simulator_config.RESULT_STORE_DIR,
+                                        max_size=simulator_config.RESULT_STORE_MAX_SIZE)
+        return _result_store
+
+
+_checkpoint_cache = None
+_checkpoint_cache_lock = threading.Lock()
+
+
+def get_checkpoint_cache():
+    """ Get the process-wide cache of the states of simulations at their output start times, configured by
+    :obj:`get_simulator_config`
+
+    Returns:
+        :obj:`CheckpointCache`: checkpoint cache
+    """
+    global _checkpoint_cache
+    with _checkpoint_cache_lock:
+        if _checkpoint_cache is None:
+            simulator_config = get_simulator_config()
+            _checkpoint_cache = CheckpointCache(max_size=simulator_config.CHECKPOINT_CACHE_MAX_SIZE,
+                                                dirname=simulator_config.CHECKPOINT_CACHE_DIR)
+        return _checkpoint_cache
+
+
+def get_cache_stats():
+    """ Get the numbers of entries, hits and misses of the process-wide caches
+
+    Returns:
+        :obj:`dict` of :obj:`str` to :obj:`dict`: dictionary that maps the name of each cache to its statistics
+    """
+    return {
+        'model': get_model_cache().get_stats(),
+        'xpath': get_xpath_cache().get_stats(),
+        'validation': get_validation_cache().get_stats(),
+        'result': get_result_store().get_stats(),
+        'checkpoint': get_checkpoint_cache().get_stats(),
+    }
+
+
+def clear_caches():
+    """ Remove all entries from the in-memory process-wide caches, reset their hit and miss counters, and recompute the
+    table of algorithms """
+    get_model_cache().clear()
+    get_xpath_cache().clear()
+    get_validation_cache().clear()
+    get_checkpoint_cache().clear()
+    get_algorithm_table().clear()
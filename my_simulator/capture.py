@@ -0,0 +1,392 @@
+""" Methods for capturing the standard output and error of the tasks of COMBINE/OMEX archives to a single spool file
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .config import DEFAULT_MAX_LOGGED_OUTPUT_SIZE
+from biosimulators_utils.combine import exec as combine_exec
+from biosimulators_utils.log.data_model import StandardOutputErrorCapturerLevel
+from biosimulators_utils.log.utils import StandardOutputErrorCapturer
+from biosimulators_utils.sedml import exec as sedml_exec
+import contextlib
+import ctypes
+import io
+import os
+import sys
+import threading
+
+__all__ = [
+    'SPOOL_FILENAME',
+    'OutputSpool',
+    'OutputSpoolStream',
+    'SpooledOutputErrorCapturer',
+    'spooled_output_capture',
+    'exec_sed_task_with_spooled_output',
+    'is_spooling_output',
+]
+
+SPOOL_FILENAME = 'output.log'
+# :obj:`str`: name of the file, within the output directory of an archive, to which standard output and error are spooled
+
+_spooling = threading.local()
+_capturers_lock = threading.Lock()
+_capturers_users = 0
+_libc = None
+
+
+class OutputSpool(object):
+    """ File to which the standard output and error of a sequence of tasks are appended, and from which the output of
+    each task is read back by its offset and length
+
+    Attributes:
+        filename (:obj:`str`): path to the file
+        max_output_size (:obj:`int`): maximum number of bytes of the output of each task which are read back
+    """
+
+    def __init__(self, filename, max_output_size=DEFAULT_MAX_LOGGED_OUTPUT_SIZE):
+        """
+        Args:
+            filename (:obj:`str`): path to the file
+            max_output_size (:obj:`int`, optional): maximum number of bytes of the output of each task which are read back
+        """
+        self.filename = filename
+        self.max_output_size = max_output_size
+        self._fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND, 0o644)
+        self._stream = OutputSpoolStream(self._fd)
+
+    def tell(self):
+        """ Flush the standard output and error and get the size of the file
+
+        Returns:
+            :obj:`int`: size of the file
+        """
+        _flush_standard_output_error()
+        return os.fstat(self._fd).st_size
+
+    def redirect(self, level=StandardOutputErrorCapturerLevel.c):
+        """ Redirect standard output and error to the file
+
+        Args:
+            level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which standard output and error are
+                redirected: the file descriptors of the process (which also captures the output of C libraries), or the
+                :obj:`sys.stdout` and :obj:`sys.stderr` of Python
+
+        Returns:
+            :obj:`tuple`: previous standard output and error, to be restored with :obj:`restore`
+        """
+        _flush_standard_output_error()
+        if level >= StandardOutputErrorCapturerLevel.c:
+            prev = (level, os.dup(1), os.dup(2))
+            os.dup2(self._fd, 1)
+            os.dup2(self._fd, 2)
+        else:
+            prev = (level, sys.stdout, sys.stderr)
+            sys.stdout = sys.stderr = self._stream
+        return prev
+
+    def restore(self, prev):
+        """ Restore the standard output and error which were redirected by :obj:`redirect`
+
+        Args:
+            prev (:obj:`tuple`): previous standard output and error returned by :obj:`redirect`
+        """
+        _flush_standard_output_error()
+        level, stdout, stderr = prev
+        if level >= StandardOutputErrorCapturerLevel.c:
+            os.dup2(stdout, 1)
+            os.dup2(stderr, 2)
+            os.close(stdout)
+            os.close(stderr)
+        else:
+            sys.stdout = stdout
+            sys.stderr = stderr
+
+    def write(self, message):
+        """ Append text to the file
+
+        Args:
+            message (:obj:`str`): text
+        """
+        self._stream.write(message)
+
+    def read(self, offset, length):
+        """ Read the output of a task, truncated to :obj:`max_output_size` bytes
+
+        Args:
+            offset (:obj:`int`): offset of the output in the file
+            length (:obj:`int`): length of the output
+
+        Returns:
+            :obj:`str`: output
+        """
+        with open(self.filename, 'rb') as file:
+            file.seek(offset)
+            text = file.read(min(length, self.max_output_size)).decode(errors='ignore')
+
+        if length > self.max_output_size:
+            text += '\n[{} more bytes of output in `{}` at offset {}]'.format(
+                length - self.max_output_size, os.path.basename(self.filename), offset + self.max_output_size)
+        return text
+
+    def close(self):
+        """ Close the file """
+        os.close(self._fd)
+
+
+class OutputSpoolStream(io.TextIOBase):
+    """ Text stream which appends the text written to it to the file of an :obj:`OutputSpool`, which
+    :obj:`OutputSpool.redirect` substitutes for :obj:`sys.stdout` and :obj:`sys.stderr`
+
+    Text is encoded as UTF-8 and written to the file immediately. :obj:`fileno` returns the descriptor of the file, so
+    that code which writes to the descriptor of :obj:`sys.stdout` (e.g., subprocesses) also writes to the spool.
+    """
+
+    def __init__(self, fd):
+        """
+        Args:
+            fd (:obj:`int`): file descriptor of the file of the spool
+        """
+        super(OutputSpoolStream, self).__init__()
+        self._fd = fd
+
+    @property
+    def encoding(self):
+        """ Get the encoding of the stream
+
+        Returns:
+            :obj:`str`: encoding
+        """
+        return 'utf-8'
+
+    @property
+    def errors(self):
+        """ Get the handling of the characters which can't be encoded
+
+        Returns:
+            :obj:`str`: error handler
+        """
+        return 'replace'
+
+    def fileno(self):
+        """ Get the descriptor of the file of the spool
+
+        Returns:
+            :obj:`int`: file descriptor
+        """
+        return self._fd
+
+    def isatty(self):
+        """ Get whether the stream is a terminal
+
+        Returns:
+            :obj:`bool`: :obj:`False`
+        """
+        return False
+
+    def writable(self):
+        """ Get whether the stream can be written to
+
+        Returns:
+            :obj:`bool`: :obj:`True`
+        """
+        return True
+
+    def write(self, message):
+        """ Append text to the file of the spool
+
+        Args:
+            message (:obj:`str`): text
+
+        Returns:
+            :obj:`int`: number of characters written
+        """
+        os.write(self._fd, message.encode(self.encoding, errors=self.errors))
+        return len(message)
+
+
+class SpooledOutputErrorCapturer(StandardOutputErrorCapturer):
+    """ Context manager which captures standard output and error to the :obj:`OutputSpool` of
+    :obj:`spooled_output_capture`, and captures them as :obj:`StandardOutputErrorCapturer` does outside of this
+    context
+
+    Within :obj:`spooled_output_capture`, entering and exiting the context only redirects the file descriptors (or the
+    Python streams) of standard output and error, and the captured output is read back from the spool, truncated, when
+    it is requested. Captured output isn't relayed.
+
+    Attributes:
+        offset (:obj:`int`): offset of the captured output in the spool
+        length (:obj:`int`): length of the captured output
+    """
+
+    def __init__(self, level=StandardOutputErrorCapturerLevel.c, relay=False, termination_delay=0.01, disabled=False):
+        """
+        Args:
+            level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which stdout/stderr should be captured
+            relay (:obj:`bool`): if :obj:`True`, collect the standard output/error streams and continue to pass
+                them along. if :obj:`False`, collect the stream, squash them, and do not pass them along. Ignored within
+                :obj:`spooled_output_capture`.
+            termination_delay (:obj:`float`, optional): The number of seconds to wait before terminating
+                the output relay process.
+            disabled (:obj:`bool`, optional): whether to capture standard output and error
+        """
+        self._spool = None if disabled else getattr(_spooling, 'spool', None)
+        if self._spool is None:
+            super(SpooledOutputErrorCapturer, self).__init__(level=level, relay=relay,
+                                                             termination_delay=termination_delay, disabled=disabled)
+        else:
+            self.level = level
+            self.relay = relay
+            self.disabled = disabled
+        self.offset = None
+        self.length = None
+
+    def __enter__(self):
+        """ Enter a context """
+        if self._spool is None:
+            return super(SpooledOutputErrorCapturer, self).__enter__()
+
+        self.offset = self._spool.tell()
+        self._prev = self._spool.redirect(self.level)
+        _spooling.capturers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Exit a context """
+        if self._spool is None:
+            return super(SpooledOutputErrorCapturer, self).__exit__(exc_type, exc_value, traceback)
+
+        _spooling.capturers.pop()
+        self._spool.restore(self._prev)
+        self.length = self._spool.tell() - self.offset
+
+    def get_location(self):
+        """ Get the location of the output captured so far in the spool
+
+        Returns:
+            :obj:`dict`: name of the spool file, and offset and length of the output in the file
+        """
+        return {
+            'file': os.path.basename(self._spool.filename),
+            'offset': self.offset,
+            'length': self._spool.tell() - self.offset if self.length is None else self.length,
+        }
+
+    def get_text(self):
+        """ Get the captured standard output/error
+
+        Returns:
+            :obj:`str`: captured standard output/error, truncated to :obj:`OutputSpool.max_output_size` bytes within
+                :obj:`spooled_output_capture`
+        """
+        if self._spool is None:
+            return super(SpooledOutputErrorCapturer, self).get_text()
+
+        location = self.get_location()
+        return self._spool.read(location['offset'], location['length'])
+
+
+@contextlib.contextmanager
+def spooled_output_capture(filename, max_output_size=DEFAULT_MAX_LOGGED_OUTPUT_SIZE):
+    """ Capture the standard output and error of the COMBINE/OMEX archives and SED documents executed in the current
+    thread to a single spool file, rather than capturing them separately for each task and output
+
+    :obj:`biosimulators_utils.combine.exec.exec_sedml_docs_in_archive` and
+    :obj:`biosimulators_utils.sedml.exec.exec_sed_doc` capture the output of each document, task and output with the
+    :obj:`StandardOutputErrorCapturer` of their modules. Within this context, they capture output with
+    :obj:`SpooledOutputErrorCapturer`, which appends the output to the spool in the threads which entered the context.
+    The cost of capturing the output of each task is constant, and the logs hold at most :obj:`max_output_size` bytes
+    of the output of each task.
+
+    Args:
+        filename (:obj:`str`): path to the spool file
+        max_output_size (:obj:`int`, optional): maximum number of bytes of the output of each task which are logged
+
+    Yields:
+        :obj:`OutputSpool`: spool
+    """
+    global _capturers_users
+
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    spool = OutputSpool(filename, max_output_size=max_output_size)
+
+    with _capturers_lock:
+        if not _capturers_users:
+            sedml_exec.StandardOutputErrorCapturer = SpooledOutputErrorCapturer
+            combine_exec.StandardOutputErrorCapturer = SpooledOutputErrorCapturer
+        _capturers_users += 1
+
+    prev_spool = getattr(_spooling, 'spool', None)
+    prev_capturers = getattr(_spooling, 'capturers', [])
+    _spooling.spool = spool
+    _spooling.capturers = []
+    try:
+        yield spool
+    finally:
+        _spooling.spool = prev_spool
+        _spooling.capturers = prev_capturers
+        spool.close()
+
+        with _capturers_lock:
+            _capturers_users -= 1
+            if not _capturers_users:
+                sedml_exec.StandardOutputErrorCapturer = StandardOutputErrorCapturer
+                combine_exec.StandardOutputErrorCapturer = StandardOutputErrorCapturer
+
+
+def exec_sed_task_with_spooled_output(task_executer, task, variables, preprocessed_task=None, log=None, config=None):
+    """ Execute a task and record the location of its standard output and error in the spool of
+    :obj:`spooled_output_capture` in its log (``output`` of :obj:`TaskLog.simulator_details`)
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute the task
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        preprocessed_task (:obj:`PreprocessedTask`, optional): preprocessed information about the task
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`VariableResults`: results of variables
+            :obj:`TaskLog`: log
+    """
+    capturers = getattr(_spooling, 'capturers', None)
+    capturer = capturers[-1] if capturers else None
+
+    try:
+        return task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+    finally:
+        if log is not None and capturer is not None:
+            log.simulator_details = dict(log.simulator_details or {})
+            log.simulator_details['output'] = capturer.get_location()
+
+
+def is_spooling_output():
+    """ Get whether the standard output and error of the current thread are captured to a spool
+
+    Returns:
+        :obj:`bool`: :obj:`True` within :obj:`spooled_output_capture`
+    """
+    return getattr(_spooling, 'spool', None) is not None
+
+
+def _flush_standard_output_error():
+    """ Flush the buffers of standard output and error of Python and of the C library """
+    global _libc
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:  # pragma: no cover
+            pass
+
+    try:
+        if _libc is None:
+            _libc = ctypes.CDLL(None)
+        _libc.fflush(None)
+    except Exception:  # pragma: no cover: the C library can't be loaded this way on Windows
+        pass
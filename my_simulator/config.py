@@ -0,0 +1,216 @@
+""" Configuration for the BioSimulators interface to MySimulator
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+import os
+
+__all__ = ['SimulatorConfig', 'get_simulator_config']
+
+DEFAULT_MODEL_CACHE_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_XPATH_CACHE_MAX_ENTRIES = 1024
+DEFAULT_VALIDATION_CACHE_MAX_ENTRIES = 16384
+DEFAULT_SHARED_RESULTS_MIN_SIZE = 64 * 1024
+DEFAULT_RESULT_STORE_MAX_SIZE = 1024 * 1024 * 1024
+DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE = 16 * 1024 * 1024
+DEFAULT_CHECKPOINT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_OUTPUT_QUEUE_SIZE = 8
+DEFAULT_MAX_LOGGED_OUTPUT_SIZE = 64 * 1024
+
+
+class SimulatorConfig(object):
+    """ Configuration for MySimulator
+
+    Attributes:
+        MODEL_CACHE_MAX_SIZE (:obj:`int`): maximum total size (bytes) of the model files whose parsed models are
+            cached; ``0`` disables the cache
+        MODEL_CACHE_COPY_MODELS (:obj:`bool`): whether to hand out copies of cached models rather than shared instances.
+            Shared instances are only safe if the simulation methods do not modify models.
+        XPATH_CACHE_MAX_ENTRIES (:obj:`int`): maximum number of sets of resolved variable targets which are cached;
+            ``0`` disables the cache
+        VALIDATION_CACHE_MAX_ENTRIES (:obj:`int`): maximum number of digests of validated tasks which are kept in memory;
+            ``0`` disables the in-memory cache
+        VALIDATION_CACHE_DIR (:obj:`str`): directory to persist the digests of validated tasks to, so that tasks are not
+            re-validated by subsequent runs; :obj:`None` means that the cache is not persisted
+        RESULT_STORE_DIR (:obj:`str`): directory to store the results of tasks in, so that subsequent executions of tasks
+            whose inputs are unchanged return the stored results rather than re-executing the tasks; :obj:`None` disables
+            the store
+        RESULT_STORE_MAX_SIZE (:obj:`int`): maximum total size (bytes) of the stored results; the least recently used
+            results are evicted to respect this size
+        NUM_WORKERS (:obj:`int`): number of worker processes used to execute the independent tasks of each SED document,
+            and the replicates of the ensembles of the tasks which are executed by the current process; ``1`` executes
+            tasks serially
+        SHARED_RESULTS_MIN_SIZE (:obj:`int`): minimum total size (bytes) of the results of a task executed by a worker
+            process for them to be transferred to the parent process through a memory-mapped file rather than pickled;
+            ``0`` disables the transfer through files
+        STREAM_CHUNK_SIZE (:obj:`int`): number of time points which simulation methods that support streaming
+            (``streaming_method`` in :obj:`KISAO_METHOD_MAP`) produce at a time; ``0`` disables streaming
+        MAPPED_RESULTS (:obj:`bool`): whether the tasks of SED documents write the results of their variables to HDF5
+            files in the output directory and return memory-mapped views of them, rather than holding them in memory.
+            The files are removed once the outputs of each document have been written.
+        LOG_MEMORY (:obj:`bool`): whether to log the increase in the peak memory of the process during each phase of the
+            execution of each task, in addition to the duration of each phase
+        ENSEMBLE_AGGREGATE (:obj:`str`): results of ensembles of replicates of stochastic simulations; :obj:`None` returns
+            the trajectories of the replicates stacked into arrays with one row per replicate, and ``mean``, ``variance``,
+            ``std``, ``median`` or ``quantile:<q>`` (e.g., ``quantile:0.95``) returns a running aggregate of the replicates
+        SELECTIVE_ARCHIVE_EXTRACTION (:obj:`bool`): whether to skip the extraction of the SED-ML files of COMBINE/OMEX
+            archives which won't be executed and of their figures and media, unless the executed SED-ML files reference
+            them, rather than extracting all of their files
+        ARCHIVE_IN_MEMORY_MAX_SIZE (:obj:`int`): maximum size (bytes) of the files of COMBINE/OMEX archives which are
+            decompressed into memory and written at once; larger files are streamed to disk
+        SHARE_TIME_COURSES (:obj:`bool`): whether to execute the time courses of the tasks of each SED document which only
+            differ in their output start times, output end times and numbers of time points with a single simulation, for
+            simulation methods which can record arbitrary time points (``time_points_arg`` in :obj:`KISAO_METHOD_MAP`).
+            The shared simulation records the union of the time points of the tasks. Adaptive methods step to each of
+            these time points, so the results of each task can differ slightly (within the tolerances of the method)
+            from those of its own simulation; this is only equivalent for methods which sample a dense output (e.g., an
+            interpolant of the solution) at the requested time points rather than stepping to them.
+        CHECKPOINT_CACHE_MAX_SIZE (:obj:`int`): maximum total size (bytes) of the states of simulations at their output start
+            times which are cached in memory, so that subsequent simulations of the same models from the same initial times
+            resume from these states rather than integrating from the initial times, for simulation methods which support
+            checkpoints (``checkpoint_method`` in :obj:`KISAO_METHOD_MAP`); ``0`` disables the in-memory cache
+        CHECKPOINT_CACHE_DIR (:obj:`str`): directory to persist the cached states which are numeric arrays to, so that
+            subsequent runs also resume from them; :obj:`None` means that the cache is not persisted
+        ASYNC_OUTPUTS (:obj:`bool`): whether to write the reports of SED documents with a background thread, so that the
+            execution of the next tasks of the documents proceeds while the reports of the previous tasks are written;
+            plots are generated immediately, and reports are logged as succeeded once they are queued and as failed
+            once the documents have executed if they then can't be written
+        OUTPUT_QUEUE_SIZE (:obj:`int`): maximum number of reports which are queued to be written in the background; the
+            execution of tasks waits while the queue is full
+        SPOOL_STANDARD_OUTPUT (:obj:`bool`): whether to capture the standard output and error of the tasks of COMBINE/OMEX
+            archives to a single file in the output directory of each archive, rather than separately for each task,
+            and to record the location of the output of each task in the file in its log
+        MAX_LOGGED_OUTPUT_SIZE (:obj:`int`): maximum number of bytes of the output of each task which are held in its
+            log, when standard output and error are spooled
+    """
+
+    def __init__(self,
+                 MODEL_CACHE_MAX_SIZE=DEFAULT_MODEL_CACHE_MAX_SIZE,
+                 MODEL_CACHE_COPY_MODELS=True,
+                 XPATH_CACHE_MAX_ENTRIES=DEFAULT_XPATH_CACHE_MAX_ENTRIES,
+                 VALIDATION_CACHE_MAX_ENTRIES=DEFAULT_VALIDATION_CACHE_MAX_ENTRIES,
+                 VALIDATION_CACHE_DIR=None,
+                 RESULT_STORE_DIR=None,
+                 RESULT_STORE_MAX_SIZE=DEFAULT_RESULT_STORE_MAX_SIZE,
+                 NUM_WORKERS=1,
+                 SHARED_RESULTS_MIN_SIZE=DEFAULT_SHARED_RESULTS_MIN_SIZE,
+                 STREAM_CHUNK_SIZE=0,
+                 MAPPED_RESULTS=False,
+                 LOG_MEMORY=False,
+                 ENSEMBLE_AGGREGATE=None,
+                 SELECTIVE_ARCHIVE_EXTRACTION=False,
+                 ARCHIVE_IN_MEMORY_MAX_SIZE=DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE,
+                 SHARE_TIME_COURSES=False,
+                 CHECKPOINT_CACHE_MAX_SIZE=DEFAULT_CHECKPOINT_CACHE_MAX_SIZE,
+                 CHECKPOINT_CACHE_DIR=None,
+                 ASYNC_OUTPUTS=False,
+                 OUTPUT_QUEUE_SIZE=DEFAULT_OUTPUT_QUEUE_SIZE,
+                 SPOOL_STANDARD_OUTPUT=False,
+                 MAX_LOGGED_OUTPUT_SIZE=DEFAULT_MAX_LOGGED_OUTPUT_SIZE):
+        """
+        Args:
+            MODEL_CACHE_MAX_SIZE (:obj:`int`, optional): maximum total size (bytes) of the model files whose parsed models
+                are cached; ``0`` disables the cache
+            MODEL_CACHE_COPY_MODELS (:obj:`bool`, optional): whether to hand out copies of cached models rather than
+                shared instances
+            XPATH_CACHE_MAX_ENTRIES (:obj:`int`, optional): maximum number of sets of resolved variable targets which are
+                cached; ``0`` disables the cache
+            VALIDATION_CACHE_MAX_ENTRIES (:obj:`int`, optional): maximum number of digests of validated tasks which are
+                kept in memory; ``0`` disables the in-memory cache
+            VALIDATION_CACHE_DIR (:obj:`str`, optional): directory to persist the digests of validated tasks to
+            RESULT_STORE_DIR (:obj:`str`, optional): directory to store the results of tasks in; :obj:`None` disables the
+                store
+            RESULT_STORE_MAX_SIZE (:obj:`int`, optional): maximum total size (bytes) of the stored results
+            NUM_WORKERS (:obj:`int`, optional): number of worker processes used to execute the independent tasks of each
+                SED document, and the replicates of the ensembles of the tasks which are executed by the current process;
+                ``1`` executes tasks serially
+            SHARED_RESULTS_MIN_SIZE (:obj:`int`, optional): minimum total size (bytes) of the results of a task executed by
+                a worker process for them to be transferred through a memory-mapped file; ``0`` disables the transfer
+                through files
+            STREAM_CHUNK_SIZE (:obj:`int`, optional): number of time points which simulation methods that support
+                streaming produce at a time; ``0`` disables streaming
+            MAPPED_RESULTS (:obj:`bool`, optional): whether the tasks of SED documents write the results of their
+                variables to HDF5 files in the output directory and return memory-mapped views of them
+            LOG_MEMORY (:obj:`bool`, optional): whether to log the increase in the peak memory of the process during each
+                phase of the execution of each task
+            ENSEMBLE_AGGREGATE (:obj:`str`, optional): results of ensembles of replicates of stochastic simulations;
+                :obj:`None` returns the stacked trajectories of the replicates
+            SELECTIVE_ARCHIVE_EXTRACTION (:obj:`bool`, optional): whether to only extract the files of COMBINE/OMEX
+                archives which are needed to execute them
+            ARCHIVE_IN_MEMORY_MAX_SIZE (:obj:`int`, optional): maximum size (bytes) of the files of COMBINE/OMEX archives
+                which are decompressed into memory; larger files are streamed to disk
+            SHARE_TIME_COURSES (:obj:`bool`, optional): whether to execute the time courses of the tasks of each SED
+                document which only differ in their output time points with a single simulation, whose results can
+                differ slightly from those of separate simulations for adaptive methods without dense output
+            CHECKPOINT_CACHE_MAX_SIZE (:obj:`int`, optional): maximum total size (bytes) of the states of simulations at
+                their output start times which are cached in memory; ``0`` disables the in-memory cache
+            CHECKPOINT_CACHE_DIR (:obj:`str`, optional): directory to persist the cached states to
+            ASYNC_OUTPUTS (:obj:`bool`, optional): whether to write the reports of SED documents with a background
+                thread
+            OUTPUT_QUEUE_SIZE (:obj:`int`, optional): maximum number of reports which are queued to be written in the
+                background
+            SPOOL_STANDARD_OUTPUT (:obj:`bool`, optional): whether to capture the standard output and error of the tasks
+                of COMBINE/OMEX archives to a single file in the output directory of each archive
+            MAX_LOGGED_OUTPUT_SIZE (:obj:`int`, optional): maximum number of bytes of the output of each task which are
+                held in its log, when standard output and error are spooled
+        """
+        self.MODEL_CACHE_MAX_SIZE = MODEL_CACHE_MAX_SIZE
+        self.MODEL_CACHE_COPY_MODELS = MODEL_CACHE_COPY_MODELS
+        self.XPATH_CACHE_MAX_ENTRIES = XPATH_CACHE_MAX_ENTRIES
+        self.VALIDATION_CACHE_MAX_ENTRIES = VALIDATION_CACHE_MAX_ENTRIES
+        self.VALIDATION_CACHE_DIR = VALIDATION_CACHE_DIR
+        self.RESULT_STORE_DIR = RESULT_STORE_DIR
+        self.RESULT_STORE_MAX_SIZE = RESULT_STORE_MAX_SIZE
+        self.NUM_WORKERS = NUM_WORKERS
+        self.SHARED_RESULTS_MIN_SIZE = SHARED_RESULTS_MIN_SIZE
+        self.STREAM_CHUNK_SIZE = STREAM_CHUNK_SIZE
+        self.MAPPED_RESULTS = MAPPED_RESULTS
+        self.LOG_MEMORY = LOG_MEMORY
+        self.ENSEMBLE_AGGREGATE = ENSEMBLE_AGGREGATE
+        self.SELECTIVE_ARCHIVE_EXTRACTION = SELECTIVE_ARCHIVE_EXTRACTION
+        self.ARCHIVE_IN_MEMORY_MAX_SIZE = ARCHIVE_IN_MEMORY_MAX_SIZE
+        self.SHARE_TIME_COURSES = SHARE_TIME_COURSES
+        self.CHECKPOINT_CACHE_MAX_SIZE = CHECKPOINT_CACHE_MAX_SIZE
+        self.CHECKPOINT_CACHE_DIR = CHECKPOINT_CACHE_DIR
+        self.ASYNC_OUTPUTS = ASYNC_OUTPUTS
+        self.OUTPUT_QUEUE_SIZE = OUTPUT_QUEUE_SIZE
+        self.SPOOL_STANDARD_OUTPUT = SPOOL_STANDARD_OUTPUT
+        self.MAX_LOGGED_OUTPUT_SIZE = MAX_LOGGED_OUTPUT_SIZE
+
+
+def get_simulator_config():
+    """ Get the configuration for MySimulator from environment variables
+
+    Returns:
+        :obj:`SimulatorConfig`: configuration
+    """
+    return SimulatorConfig(
+        MODEL_CACHE_MAX_SIZE=int(os.environ.get('MY_SIMULATOR_MODEL_CACHE_MAX_SIZE', DEFAULT_MODEL_CACHE_MAX_SIZE)),
+        MODEL_CACHE_COPY_MODELS=os.environ.get('MY_SIMULATOR_MODEL_CACHE_COPY_MODELS', '1').lower() in ['1', 'true'],
+        XPATH_CACHE_MAX_ENTRIES=int(os.environ.get('MY_SIMULATOR_XPATH_CACHE_MAX_ENTRIES', DEFAULT_XPATH_CACHE_MAX_ENTRIES)),
+        VALIDATION_CACHE_MAX_ENTRIES=int(os.environ.get('MY_SIMULATOR_VALIDATION_CACHE_MAX_ENTRIES',
+                                                        DEFAULT_VALIDATION_CACHE_MAX_ENTRIES)),
+        VALIDATION_CACHE_DIR=os.environ.get('MY_SIMULATOR_VALIDATION_CACHE_DIR', None) or None,
+        RESULT_STORE_DIR=os.environ.get('MY_SIMULATOR_RESULT_STORE_DIR', None) or None,
+        RESULT_STORE_MAX_SIZE=int(os.environ.get('MY_SIMULATOR_RESULT_STORE_MAX_SIZE', DEFAULT_RESULT_STORE_MAX_SIZE)),
+        NUM_WORKERS=int(os.environ.get('MY_SIMULATOR_NUM_WORKERS', '1')),
+        SHARED_RESULTS_MIN_SIZE=int(os.environ.get('MY_SIMULATOR_SHARED_RESULTS_MIN_SIZE', DEFAULT_SHARED_RESULTS_MIN_SIZE)),
+        STREAM_CHUNK_SIZE=int(os.environ.get('MY_SIMULATOR_STREAM_CHUNK_SIZE', '0')),
+        MAPPED_RESULTS=os.environ.get('MY_SIMULATOR_MAPPED_RESULTS', '0').lower() in ['1', 'true'],
+        LOG_MEMORY=os.environ.get('MY_SIMULATOR_LOG_MEMORY', '0').lower() in ['1', 'true'],
+        ENSEMBLE_AGGREGATE=os.environ.get('MY_SIMULATOR_ENSEMBLE_AGGREGATE', None) or None,
+        SELECTIVE_ARCHIVE_EXTRACTION=os.environ.get('MY_SIMULATOR_SELECTIVE_ARCHIVE_EXTRACTION', '0').lower() in ['1', 'true'],
+        ARCHIVE_IN_MEMORY_MAX_SIZE=int(os.environ.get('MY_SIMULATOR_ARCHIVE_IN_MEMORY_MAX_SIZE',
+                                                      DEFAULT_ARCHIVE_IN_MEMORY_MAX_SIZE)),
+        SHARE_TIME_COURSES=os.environ.get('MY_SIMULATOR_SHARE_TIME_COURSES', '0').lower() in ['1', 'true'],
+        CHECKPOINT_CACHE_MAX_SIZE=int(os.environ.get('MY_SIMULATOR_CHECKPOINT_CACHE_MAX_SIZE',
+                                                     DEFAULT_CHECKPOINT_CACHE_MAX_SIZE)),
+        CHECKPOINT_CACHE_DIR=os.environ.get('MY_SIMULATOR_CHECKPOINT_CACHE_DIR', None) or None,
+        ASYNC_OUTPUTS=os.environ.get('MY_SIMULATOR_ASYNC_OUTPUTS', '0').lower() in ['1', 'true'],
+        OUTPUT_QUEUE_SIZE=int(os.environ.get('MY_SIMULATOR_OUTPUT_QUEUE_SIZE', DEFAULT_OUTPUT_QUEUE_SIZE)),
+        SPOOL_STANDARD_OUTPUT=os.environ.get('MY_SIMULATOR_SPOOL_STANDARD_OUTPUT', '0').lower() in ['1', 'true'],
+        MAX_LOGGED_OUTPUT_SIZE=int(os.environ.get('MY_SIMULATOR_MAX_LOGGED_OUTPUT_SIZE', DEFAULT_MAX_LOGGED_OUTPUT_SIZE)),
+    )
@@ -6,7 +6,26 @@
 :License: <License, e.g., MIT>
 """
 
-from .data_model import KISAO_METHOD_MAP
+from .algorithms import get_algorithm_table
+from .archive import selective_archive_extraction
+from .batch import exec_combine_archives
+from .cache import get_model_cache, get_xpath_cache, get_validation_cache, get_result_store, get_checkpoint_cache
+from .capture import SPOOL_FILENAME, spooled_output_capture, exec_sed_task_with_spooled_output, is_spooling_output
+from .config import get_simulator_config
+from .data_model import KISAO_METHOD_MAP, PreprocessedTask
+from .ensemble import get_ensemble_settings, exec_ensemble
+from .mapped import create_mapped_results, write_mapped_results, open_mapped_results
+from .outputs import asynchronous_output_writing, fail_unwritten_outputs
+from .parallel import TaskResult, exec_tasks_in_parallel, exec_precomputed_sed_task, is_task_worker
+from .pruning import get_selected_output_ids, validate_output_ids, prune_sed_doc, skip_pruned_tasks_and_outputs
+from .scan import can_apply_model_changes_in_memory, batched_repeated_task_execution
+from .timecourse import get_time_points, get_shared_time_points, exec_shared_time_courses, exec_unshared_sed_task
+from .transport import ResultsTransport
+from .utils import (get_simulator_version, get_file_digest, get_sed_task_digest, get_sed_task_results_digest,
+                    get_checkpoint_digest,
+                    get_variable_result_ids,
+                    get_model_attribute_change_target, get_variable_results_from_matrix,
+                    get_variable_results_from_chunks, PhaseTimer)
 from biosimulators_utils.combine.exec import exec_sedml_docs_in_archive
 from biosimulators_utils.config import get_config, Config  # noqa: F401
 from biosimulators_utils.log.data_model import CombineArchiveLog, TaskLog, StandardOutputErrorCapturerLevel  # noqa: F401
@@ -16,24 +35,25 @@ from biosimulators_utils.sedml import validation
 from biosimulators_utils.sedml.data_model import (Task, ModelLanguage, ModelAttributeChange,  # noqa: F401
                                                   UniformTimeCourseSimulation, Variable)
 from biosimulators_utils.sedml.exec import exec_sed_doc as base_exec_sed_doc
+from biosimulators_utils.sedml.exceptions import SedmlExecutionError
+from biosimulators_utils.sedml.io import SedmlSimulationReader
 from biosimulators_utils.simulator.utils import get_algorithm_substitution_policy
-from biosimulators_utils.utils.core import parse_value, raise_errors_warnings
-from kisao.utils import get_preferred_substitute_algorithm_by_ids
-from my_simulator import read_model, get_sed_variables_from_results
-
-__all__ = ['get_simulator_version', 'exec_sedml_docs_in_combine_archive', 'exec_sed_doc', 'exec_sed_task', 'preprocess_sed_task']
-
-
-def get_simulator_version():
-    """ Get the version of MySimulator
-
-    Returns:
-        :obj:`str`: version
-    """
-    return my_simulator.__version__
-
-
-def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None):
+from biosimulators_utils.utils.core import raise_errors_warnings
+import collections
+import contextlib
+import copy
+import functools
+from my_simulator import get_results_matrix, set_model_attribute
+import numpy
+import os
+import shutil
+import tempfile
+
+__all__ = ['get_simulator_version', 'exec_sedml_docs_in_combine_archive', 'exec_sedml_docs_in_combine_archives',
+           'exec_sed_doc', 'exec_sed_task', 'preprocess_sed_task']
+
+
+def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None, simulator_config=None, output_ids=None):
     """ Execute the SED tasks defined in a COMBINE/OMEX archive and save the outputs
 
     Args:
@@ -46,24 +66,81 @@ def exec_sedml_docs_in_combine_archive(archive_filename, out_dir, config=None):
               with reports at keys ``{ relative-path-to-SED-ML-file-within-archive }/{ report.id }`` within the HDF5 file
 
         config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
+        output_ids (:obj:`list` of :obj:`str`, optional): ids of the outputs (reports and plots) to generate, optionally
+            prefixed by the locations of their SED documents within the archive (e.g., ``simulation.sedml/report``).
+            Only the tasks needed by these outputs are executed. :obj:`None` means all outputs.
 
     Returns:
         :obj:`tuple`:
 
             * :obj:`SedDocumentResults`: results
             * :obj:`CombineArchiveLog`: log
+
+    Raises:
+        :obj:`ValueError`: if some of :obj:`output_ids` don't select any output of the SED documents of the archive
+    """
+    simulator_config = simulator_config or get_simulator_config()
+
+    # Only extract the SED-ML files which will be executed and the files which they reference
+    if simulator_config.SELECTIVE_ARCHIVE_EXTRACTION:
+        extraction = selective_archive_extraction(in_memory_max_size=simulator_config.ARCHIVE_IN_MEMORY_MAX_SIZE)
+    else:
+        extraction = contextlib.nullcontext()
+
+    # Capture the standard output and error of the tasks to a single file, rather than separately for each task
+    if simulator_config.SPOOL_STANDARD_OUTPUT:
+        capture = spooled_output_capture(os.path.join(out_dir, SPOOL_FILENAME),
+                                         max_output_size=simulator_config.MAX_LOGGED_OUTPUT_SIZE)
+    else:
+        capture = contextlib.nullcontext()
+
+    # Collect the requested output ids which select outputs of the SED documents, to report the ids which select none
+    selected_output_ids = set()
+
+    sed_doc_executer = functools.partial(exec_sed_doc, simulator_config=simulator_config, output_ids=output_ids,
+                                         selected_output_ids=selected_output_ids)
+    with extraction, capture:
+        results, log = exec_sedml_docs_in_archive(sed_doc_executer, archive_filename, out_dir,
+                                                  apply_xml_model_changes=True,
+                                                  config=config)
+
+    validate_output_ids(output_ids, selected_output_ids)
+    return results, log
+
+
+def exec_sedml_docs_in_combine_archives(archive_filenames, out_dir, num_workers=1, config=None, simulator_config=None):
+    """ Execute the SED tasks defined in a batch of COMBINE/OMEX archives in a single process (or a pool of worker
+    processes) and save their outputs
+
+    Args:
+        archive_filenames (:obj:`list` of :obj:`str`): paths to COMBINE/OMEX archives or to directories which contain
+            archives
+        out_dir (:obj:`str`): path to store the outputs of the archives. The outputs of each archive are saved to
+            ``{ out_dir }/{ path-of-archive-without-extension }``, as described for
+            :obj:`exec_sedml_docs_in_combine_archive`, and a summary of the batch is saved to ``{ out_dir }/batch.json``.
+        num_workers (:obj:`int`, optional): number of worker processes; ``1`` executes the archives serially in the current
+            process
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
+
+    Returns:
+        :obj:`dict`: summary of the execution of the batch, including the status, duration and exception of each archive
     """
-    return exec_sedml_docs_in_archive(exec_sed_doc, archive_filename, out_dir,
-                                      apply_xml_model_changes=True,
-                                      config=config)
+    return exec_combine_archives(exec_sedml_docs_in_combine_archive, archive_filenames, out_dir,
+                                 num_workers=num_workers, config=config, simulator_config=simulator_config)
 
 
 def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
                  apply_xml_model_changes=False,
                  log=None, indent=0, pretty_print_modified_xml_models=False,
-                 log_level=StandardOutputErrorCapturerLevel.c, config=None):
+                 log_level=StandardOutputErrorCapturerLevel.c, config=None, simulator_config=None, output_ids=None,
+                 selected_output_ids=None):
     """ Execute the tasks specified in a SED document and generate the specified outputs
 
+    Only the tasks which are needed to generate the outputs (data sets of reports and curves and surfaces of plots) are
+    executed.
+
     Args:
         doc (:obj:`SedDocument` or :obj:`str`): SED document or a path to SED-ML file which defines a SED document
         working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
@@ -83,7 +160,119 @@ def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
         pretty_print_modified_xml_models (:obj:`bool`, optional): if :obj:`True`, pretty print modified XML models
         log_level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which to log output
         config (:obj:`Config`, optional): BioSimulators common configuration
-        simulator_config (:obj:`SimulatorConfig`, optional): tellurium configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration. If
+            :obj:`SimulatorConfig.NUM_WORKERS` is greater than 1, independent tasks are executed on a pool of worker
+            processes before the outputs are generated, and the iterations of each repeated task are executed on a pool
+            of worker processes when the repeated task is reached.
+        output_ids (:obj:`list` of :obj:`str`, optional): ids of the outputs to generate, optionally prefixed by
+            :obj:`rel_out_path` (e.g., ``simulation.sedml/report``); :obj:`None` means all outputs. The tasks and
+            outputs which are not needed are logged as skipped.
+        selected_output_ids (:obj:`set` of :obj:`str`, optional): set to which the ids of :obj:`output_ids` which select
+            outputs of the document are added, to check the ids across the documents of an archive; :obj:`None` means
+            that each of :obj:`output_ids` must select an output of the document
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`ReportResults`: results of each report
+            * :obj:`SedDocumentLog`: log of the document
+
+    Raises:
+        :obj:`ValueError`: if :obj:`selected_output_ids` is :obj:`None` and some of :obj:`output_ids` don't select any
+            output of the document
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or get_simulator_config()
+
+    if isinstance(doc, str):
+        doc = SedmlSimulationReader().run(doc)
+
+    # Only execute the tasks which are needed to generate the requested outputs
+    doc_selected_output_ids = get_selected_output_ids(doc, output_ids, rel_out_path=rel_out_path)
+    if selected_output_ids is None:
+        validate_output_ids(output_ids, doc_selected_output_ids)
+    else:
+        selected_output_ids.update(doc_selected_output_ids)
+
+    pruned_doc = prune_sed_doc(doc, output_ids=output_ids, rel_out_path=rel_out_path)
+    if log:
+        skip_pruned_tasks_and_outputs(log, doc, pruned_doc)
+    doc = pruned_doc
+
+    # Write the results of the tasks to HDF5 files in the output directory and read them back as memory-mapped views,
+    # rather than holding them in memory
+    if simulator_config.MAPPED_RESULTS:
+        os.makedirs(base_out_path, exist_ok=True)
+        results_dir = tempfile.mkdtemp(prefix='.results-', dir=base_out_path)
+    else:
+        results_dir = None
+
+    task_executer = functools.partial(exec_sed_task, simulator_config=simulator_config, results_dir=results_dir)
+
+    # Transfer large results from worker processes through memory-mapped files. The files are removed once the outputs
+    # of the document have been written.
+    if simulator_config.NUM_WORKERS > 1 and simulator_config.SHARED_RESULTS_MIN_SIZE:
+        transport = ResultsTransport(simulator_config.SHARED_RESULTS_MIN_SIZE)
+    else:
+        transport = None
+
+    # Write the reports in the background, so that the next tasks execute while the reports of the previous tasks are
+    # written. The reports are written from the results of the tasks, so all of them are written before the results are
+    # released.
+    if simulator_config.ASYNC_OUTPUTS:
+        output_writing = asynchronous_output_writing(max_queue_size=simulator_config.OUTPUT_QUEUE_SIZE)
+    else:
+        output_writing = contextlib.nullcontext()
+
+    output_writer = None
+    try:
+        with output_writing as output_writer:
+            results, log = _exec_sed_doc(task_executer, doc, working_dir, base_out_path, rel_out_path=rel_out_path,
+                                         apply_xml_model_changes=apply_xml_model_changes, log=log, indent=indent,
+                                         pretty_print_modified_xml_models=pretty_print_modified_xml_models,
+                                         log_level=log_level, config=config, simulator_config=simulator_config,
+                                         transport=transport, results_dir=results_dir)
+    finally:
+        output_errors = output_writer.get_errors() if output_writer else []
+        if output_errors and log:
+            fail_unwritten_outputs(log, output_errors)
+        if transport:
+            transport.release()
+        if results_dir:
+            shutil.rmtree(results_dir, ignore_errors=True)
+
+    if output_errors:
+        raise SedmlExecutionError('The SED document did not execute successfully:\n\n  {}'.format(
+            '\n\n  '.join('Output `{}` could not be written.\n  {}: {}'.format(
+                output_id, exception.__class__.__name__, str(exception).replace('\n', '\n  '))
+                for output_id, exception in output_errors)))
+
+    return results, log
+
+
+def _exec_sed_doc(task_executer, doc, working_dir, base_out_path, rel_out_path=None, apply_xml_model_changes=False,
+                  log=None, indent=0, pretty_print_modified_xml_models=False,
+                  log_level=StandardOutputErrorCapturerLevel.c, config=None,
+                  simulator_config=None, transport=None, results_dir=None):
+    """ Execute the tasks of a SED document, possibly in batches and in parallel, and generate its outputs
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute each task
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document
+        base_out_path (:obj:`str`): path to store the outputs
+        rel_out_path (:obj:`str`, optional): path relative to :obj:`base_out_path` to store the outputs
+        apply_xml_model_changes (:obj:`bool`, optional): if :obj:`True`, apply any model changes specified in the SED-ML file
+        log (:obj:`SedDocumentLog`, optional): log of the document
+        indent (:obj:`int`, optional): degree to indent status messages
+        pretty_print_modified_xml_models (:obj:`bool`, optional): if :obj:`True`, pretty print modified XML models
+        log_level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which to log output
+        config (:obj:`Config`): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`): MySimulator configuration
+        transport (:obj:`ResultsTransport`, optional): transport for the results of the tasks executed by worker
+            processes
+        results_dir (:obj:`str`, optional): directory in which to write the results of the tasks to HDF5 files;
+            :obj:`None` means that the results are held in memory
 
     Returns:
         :obj:`tuple`:
@@ -91,27 +280,101 @@ def exec_sed_doc(doc, working_dir, base_out_path, rel_out_path=None,
             * :obj:`ReportResults`: results of each report
             * :obj:`SedDocumentLog`: log of the document
     """
-    return base_exec_sed_doc(exec_sed_task, doc, working_dir, base_out_path,
-                             rel_out_path=rel_out_path,
-                             apply_xml_model_changes=apply_xml_model_changes,
-                             log=log,
-                             indent=indent,
-                             pretty_print_modified_xml_models=pretty_print_modified_xml_models,
-                             log_level=log_level,
-                             config=config)
+    # If all of the model changes are attribute changes, apply them in memory to the preprocessed models rather than
+    # to copies of the model files, and execute the iterations of each repeated task in batches (in parallel, with
+    # multiple workers) when the repeated task is reached, preprocessing each of its sub-tasks once
+    if can_apply_model_changes_in_memory(doc):
+        apply_xml_model_changes = False
+        repeated_task_execution = batched_repeated_task_execution(
+            task_executer, functools.partial(preprocess_sed_task, simulator_config=simulator_config),
+            num_workers=simulator_config.NUM_WORKERS, transport=transport)
+    else:
+        repeated_task_execution = contextlib.nullcontext()
+
+    # Execute the time courses of the tasks which only differ in their output time points with a single simulation
+    if simulator_config.SHARE_TIME_COURSES:
+        shared_task_results, unshared_tasks = exec_shared_time_courses(
+            functools.partial(_exec_shared_time_course, simulator_config=simulator_config, results_dir=results_dir),
+            doc, working_dir, config=config)
+    else:
+        shared_task_results, unshared_tasks = {}, {}
+
+    # Record why the time courses of tasks couldn't be shared in the logs of the tasks
+    if unshared_tasks:
+        task_executer = functools.partial(exec_unshared_sed_task, unshared_tasks, task_executer)
+
+    precomputed_task_ids = set(shared_task_results)
+
+    if simulator_config.NUM_WORKERS > 1:
+        task_results = exec_tasks_in_parallel(task_executer, doc, working_dir, simulator_config.NUM_WORKERS,
+                                              apply_xml_model_changes=apply_xml_model_changes,
+                                              pretty_print_modified_xml_models=pretty_print_modified_xml_models,
+                                              config=config, transport=transport, exclude_task_ids=shared_task_results,
+                                              log_level=log_level)
+        if task_results is not None:
+            task_executer = functools.partial(exec_precomputed_sed_task, task_results, task_executer)
+            precomputed_task_ids.update(task_results.keys())
+
+    if shared_task_results:
+        task_executer = functools.partial(exec_precomputed_sed_task, shared_task_results, task_executer)
+
+    # Record the location of the output of each task in the spool of its standard output and error
+    if is_spooling_output():
+        task_executer = functools.partial(exec_sed_task_with_spooled_output, task_executer)
+
+    # Preprocess each task once, before it is executed, rather than in :obj:`exec_sed_task`
+    preprocessed_task_executer = functools.partial(_preprocess_sed_doc_task, precomputed_task_ids,
+                                                   simulator_config=simulator_config)
+
+    with repeated_task_execution:
+        return base_exec_sed_doc(task_executer, doc, working_dir, base_out_path,
+                                 rel_out_path=rel_out_path,
+                                 apply_xml_model_changes=apply_xml_model_changes,
+                                 log=log,
+                                 indent=indent,
+                                 pretty_print_modified_xml_models=pretty_print_modified_xml_models,
+                                 log_level=log_level,
+                                 config=config,
+                                 preprocessed_task_executer=preprocessed_task_executer)
+
+
+def _preprocess_sed_doc_task(precomputed_task_ids, task, variables, config=None, simulator_config=None):
+    """ Preprocess a task of a SED document before :obj:`biosimulators_utils.sedml.exec.exec_sed_doc` executes it
+
+    Repeated tasks aren't preprocessed, because their sub-tasks can have different models and simulations, whereas
+    :obj:`biosimulators_utils.sedml.exec.exec_sed_doc` passes the same preprocessed task to each sub-task. Tasks whose
+    results have already been computed (e.g., by worker processes) aren't preprocessed either. If the result store is
+    enabled, tasks are preprocessed by :obj:`exec_sed_task`, only if their results haven't been stored.
 
+    Args:
+        precomputed_task_ids (:obj:`set` of :obj:`str`): ids of the tasks whose results have already been computed
+        task (:obj:`AbstractTask`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
 
-def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None):
+    Returns:
+        :obj:`PreprocessedTask`: preprocessed information about the task, or :obj:`None` if the task isn't preprocessed
+    """
+    if not isinstance(task, Task) or task.id in precomputed_task_ids or get_result_store().dirname:
+        return None
+    return preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
+
+
+def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None, simulator_config=None, results_dir=None):
     ''' Execute a task and save its results
 
     Args:
         task (:obj:`Task`): task
         variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
-        preprocessed_task (:obj:`object`, optional): preprocessed information about the task, including possible
+        preprocessed_task (:obj:`PreprocessedTask`, optional): preprocessed information about the task, including possible
             model changes and variables. This can be used to avoid repeatedly executing the same initialization
             for repeated calls to this method.
         log (:obj:`TaskLog`, optional): log for the task
         config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
+        results_dir (:obj:`str`, optional): directory in which to write the results of the variables to an HDF5 file,
+            whose memory-mapped views are returned; :obj:`None` means that the results are held in memory
 
     Returns:
         :obj:`tuple`:
@@ -125,112 +388,376 @@ def exec_sed_task(task, variables, preprocessed_task=None, log=None, config=None
         :obj:`NotImplementedError`: if the task is not of a supported type or involves an unsuported feature
     '''
     config = config or get_config()
+    simulator_config = simulator_config or get_simulator_config()
     if config.LOG and not log:
         log = TaskLog()
 
-    if preprocessed_task is None:
-        preprocessed_task = preprocess_sed_task(task, variables, config=config)
+    # record the duration of each phase of the execution of the task, if the execution is logged
+    timer = PhaseTimer(enabled=config.LOG, measure_memory=simulator_config.LOG_MEMORY)
 
     #############################################################
-    model = task.model
-    sim = task.simulation
-
-    if config.VALIDATE_SEDML:
-        # Validate task
-        raise_errors_warnings(validation.validate_task(task),
-                              error_summary='Task `{}` is invalid.'.format(task.id))
-
-        # Validate that the model is encoded in a supported language
-        raise_errors_warnings(validation.validate_model_language(model.language, ModelLanguage.SBML),
-                              error_summary='Language for model `{}` is not supported.'.format(model.id))
-
-        # Validate that the model changes are of the supported types
-        raise_errors_warnings(validation.validate_model_change_types(model.changes, ()),
-                              error_summary='Changes for model `{}` are not supported.'.format(model.id))
+    # If the result store is enabled, return the results of a previous execution of the task with identical inputs
+    # (including the algorithm substitution policy, which determines the executed algorithm). The task is validated
+    # first, so that invalid tasks fail as they would if they were executed.
+    result_store = get_result_store()
+    if result_store.dirname:
+        if config.VALIDATE_SEDML:
+            with timer.phase('validation'):
+                _validate_sed_task_once(task, variables)
+
+        with timer.phase('store'):
+            results_digest = get_sed_task_results_digest(task, variables, get_file_digest(task.model.source),
+                                                         options=(simulator_config.ENSEMBLE_AGGREGATE,
+                                                                  get_algorithm_substitution_policy(config=config).value))
+            stored_results = result_store.get(results_digest)
+
+        if stored_results is not None:
+            variable_results, algorithm, simulator_details = stored_results
+            if config.LOG:
+                log.algorithm = algorithm
+                log.simulator_details = dict(simulator_details or {})
+                log.simulator_details['stored'] = True
+                log.simulator_details['timings'] = dict(timer.timings)
+            return variable_results, log
 
-        # Validate model changes
-        raise_errors_warnings(*validation.validate_model_changes(task.model),
-                              error_summary='Changes for model `{}` are invalid.'.format(model.id))
-
-        # Validate that the simulation is a supported type of simulation
-        raise_errors_warnings(validation.validate_simulation_type(sim, (UniformTimeCourseSimulation, )),
-                              error_summary='{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id))
-
-        # Validate time course settings
-        raise_errors_warnings(*validation.validate_simulation(sim),
-                              error_summary='Simulation `{}` is invalid.'.format(sim.id))
-
-        # Validate that variables of data generators have valid symbols and targets
-        raise_errors_warnings(*validation.validate_data_generator_variables(variables),
-                              error_summary='Data generator variables for task `{}` are invalid.'.format(task.id))
-
-    # If the model is encoded in XML, check that the XPaths for the variables are valid
-    target_x_paths_ids = validation.validate_target_xpaths(variables, model.source, attr='id')
+    if preprocessed_task is None:
+        preprocessed_task = preprocess_sed_task(task, variables, config=config, simulator_config=simulator_config)
 
-    # Check that the simulation tool can produce each variables -- the simulation tool supports each symbol and target
+    # Report the durations of the preprocessing of the task once, with the first execution of the preprocessed task
+    timer.update(preprocessed_task.timer)
+    preprocessed_task.timer = PhaseTimer(enabled=False)
 
     #############################################################
-    # Read the model located at `task.model.source`; `exec_sedml_docs_in_archive` has already resolved the model and
-    # applied any changes
-    model = read_model(task.model.source, language=task.model.language)
+    # Get the model, simulation method and algorithm arguments resolved by :obj:`preprocess_sed_task`
+    model = preprocessed_task.model
+    simulation_method = preprocessed_task.simulation_method
+    simulation_args = dict(preprocessed_task.simulation_args)
 
     #############################################################
-    # Load the algorithm specified by `simulation.algorithm`
-    alg_kisao_id = get_preferred_substitute_algorithm_by_ids(
-        simulation.algorithm.kisao_id, KISAO_METHOD_MAP.keys(),
-        substitution_policy=get_algorithm_substitution_policy(config=config))
-    simulation_method_properties = KISAO_METHOD_MAP[exec_kisao_id]
-    simulation_method = simulation_method_properties['method']
-
-    #############################################################
-    # Apply the algorithm parameter changes specified by `simulation.algorithm.parameter_changes`
-    simulation_args = {}
-    if alg_kisao_id == simulation.algorithm.kisao_id:
-        for change in task.simulation.algorithm.changes:
-            parameter_properties = simulation_method_properties['parameters'].get(change.kisao_id, None)
-
-            if parameter_properties is None:
-                raise NotImplementedError("".join([
-                    "Algorithm parameter with KiSAO id '{}' is not supported. ".format(change.kisao_id),
-                    "Parameter must have one of the following KiSAO ids:\n  - {}".format('\n  - '.join(
-                        '{}: {}'.format(kisao_id, parameter['name'])
-                        for kisao_id, parameter in simulation_method_properties['parameters'].items())),
-                ]))
-
-            simulation_args[parameter_properties['arg']] = parse_value(change.new_value, parameter_properties['type'])
+    # Apply the changes to the model (e.g., the values of the parameters of each iteration of a parameter scan) in memory
+    # to a copy of the preprocessed model, rather than writing and reading a modified copy of the model file
+    if task.model.changes:
+        with timer.phase('changes'):
+            model = _apply_model_changes(model, task.model, preprocessed_task.model_change_targets)
 
     #############################################################
     # Configure the simulation. For example, for time course simulations set up the time points to record
-    simulation_args['initial_time'] = task.simulation.initial_time
-    simulation_args['output_start_time'] = task.simulation.output_start_time
-    simulation_args['output_end_time'] = task.simulation.output_end_time
-    simulation_args['number_of_points'] = task.simulation.number_of_points
+    sim = task.simulation
+    simulation_args['initial_time'] = sim.initial_time
+    simulation_args['output_start_time'] = sim.output_start_time
+    simulation_args['output_end_time'] = sim.output_end_time
+    simulation_args['number_of_points'] = sim.number_of_points
 
     #############################################################
     # Execute the simulation and record the results
-    results = simulation_method(model, **simulation_args)
+    streaming_method = preprocessed_task.simulation_method_properties.get('streaming_method', None)
+    if simulator_config.STREAM_CHUNK_SIZE and streaming_method:
+        # Stream the results in chunks of time points and copy the results of the variables from each chunk, so that the
+        # results of the entire model are never held in memory at once
+        simulation_method = streaming_method
+        simulation_args['chunk_size'] = simulator_config.STREAM_CHUNK_SIZE
+    simulate = functools.partial(_simulate, model, simulation_method, simulation_method is streaming_method, variables,
+                                 preprocessed_task.variable_result_ids, sim.number_of_points + 1)
+
+    seed_arg = preprocessed_task.simulation_method_properties.get('seed_arg', None)
+    if preprocessed_task.number_of_runs > 1:
+        # Execute an ensemble of replicates, each with an independent seed, and return their stacked trajectories or an
+        # aggregate of them. Tasks which are executed by worker processes execute their replicates serially, rather than
+        # starting a nested pool of worker processes for each of the tasks which are executed at once.
+        with timer.phase('simulation'):
+            variable_results, seed = exec_ensemble(simulate, simulation_args, seed_arg, preprocessed_task.number_of_runs,
+                                                   seed=preprocessed_task.seed,
+                                                   aggregate=simulator_config.ENSEMBLE_AGGREGATE,
+                                                   num_workers=1 if is_task_worker() else simulator_config.NUM_WORKERS)
+
+        if results_dir:
+            with timer.phase('results'):
+                fid, results_filename = tempfile.mkstemp(suffix='.h5', dir=results_dir)
+                os.close(fid)
+                write_mapped_results(results_filename, variable_results)
+                variable_results = open_mapped_results(results_filename)
+
+    else:
+        if preprocessed_task.seed is not None:
+            simulation_args[seed_arg] = preprocessed_task.seed
+        if results_dir:
+            fid, results_filename = tempfile.mkstemp(suffix='.h5', dir=results_dir)
+            os.close(fid)
+        else:
+            results_filename = None
+
+        # Resume deterministic simulations from the cached state of the model at their output start time, if the
+        # simulation method supports checkpoints
+        run_simulation_args, checkpoint = _resume_from_checkpoint(preprocessed_task, model, task.model.changes,
+                                                                  simulation_args, timer=timer)
+        variable_results = simulate(run_simulation_args, timer=timer, results_filename=results_filename)
 
     #############################################################
-    # Transform the results to an instance of :obj:`VariableResults`
-    variable_results = VariableResults()
-    for variable in variables:
-        variable_results[variable.id] = get_sed_variables_from_results(results, target_x_paths_ids, variable.id)
+    # Store the results, unless they are a random sample which is not reproducible (an unseeded stochastic simulation)
+    if result_store.dirname and (seed_arg is None or preprocessed_task.seed is not None):
+        with timer.phase('store'):
+            result_store.add(results_digest, variable_results,
+                             algorithm=preprocessed_task.algorithm_kisao_id,
+                             simulator_details={
+                                 'method': simulation_method.__module__ + '.' + simulation_method.__name__,
+                                 'arguments': simulation_args,
+                             })
 
     #############################################################
     # log action
     if config.LOG:
-        log.algorithm = alg_kisao_id
+        log.algorithm = preprocessed_task.algorithm_kisao_id
         log.simulator_details = {
             'method': simulation_method.__module__ + '.' + simulation_method.__name__,
             'arguments': simulation_args,
+            'timings': dict(timer.timings),
         }
+        if timer.measure_memory:
+            log.simulator_details['memory'] = dict(timer.memory)
+        if preprocessed_task.number_of_runs == 1 and checkpoint:
+            log.simulator_details['checkpoint'] = checkpoint
+        if preprocessed_task.number_of_runs > 1:
+            log.simulator_details['ensemble'] = {
+                'numberOfRuns': preprocessed_task.number_of_runs,
+                'seed': seed,
+                'aggregate': simulator_config.ENSEMBLE_AGGREGATE or 'trajectories',
+            }
 
     #############################################################
     # Return the results of the variables and the log
     return variable_results, log
 
 
-def preprocess_sed_task(task, variables, config=None):
+def _simulate(model, simulation_method, streamed, variables, variable_result_ids, number_of_points, simulation_args,
+              timer=None, results_filename=None):
+    """ Execute a simulation and get the results of its variables
+
+    Args:
+        model (:obj:`object`): model
+        simulation_method (:obj:`types.FunctionType`): simulation method
+        streamed (:obj:`bool`): whether the simulation method is a streaming method, which yields its results in chunks
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        variable_result_ids (:obj:`list` of :obj:`str`): id of the result of the simulation for each variable
+        number_of_points (:obj:`int`): number of recorded time points
+        simulation_args (:obj:`dict`): arguments for the simulation method
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the simulation
+        results_filename (:obj:`str`, optional): path to an HDF5 file to write the results of the variables to; the
+            results are returned as memory-mapped views of the file
+
+    Returns:
+        :obj:`VariableResults`: results of the variables
+    """
+    timer = timer or PhaseTimer(enabled=False)
+
+    if streamed:
+        # copy the results of the variables from each chunk directly into the file, if any
+        if results_filename:
+            allocate = functools.partial(create_mapped_results, results_filename, [variable.id for variable in variables])
+        else:
+            allocate = None
+
+        with timer.phase('simulation'):
+            chunks = simulation_method(model, **simulation_args)
+            variable_results = get_variable_results_from_chunks(variables, variable_result_ids, chunks, number_of_points,
+                                                                allocate=allocate)
+
+        if results_filename:
+            variable_results = open_mapped_results(results_filename)
+        return variable_results
+
+    with timer.phase('simulation'):
+        results = simulation_method(model, **simulation_args)
+
+    #############################################################
+    # Transform the results to an instance of :obj:`VariableResults`. `get_results_matrix` returns the id of each
+    # recorded model element (and time) and a matrix with one row for each id, from which the results of all of the
+    # variables are sliced at once.
+    with timer.phase('results'):
+        result_ids, result_matrix = get_results_matrix(results)
+        variable_results = get_variable_results_from_matrix(variables, variable_result_ids, result_ids, result_matrix)
+
+        if results_filename:
+            write_mapped_results(results_filename, variable_results)
+            variable_results = open_mapped_results(results_filename)
+        return variable_results
+
+
+def _resume_from_checkpoint(preprocessed_task, model, model_changes, simulation_args, timer=None):
+    """ Get the arguments to resume a simulation from the state of its model at its output start time, integrating the
+    model to its output start time and caching its state there if the checkpoint cache doesn't already contain the state
+
+    Only deterministic simulations whose methods support checkpoints (``checkpoint_method`` and ``initial_state_arg`` in
+    :obj:`KISAO_METHOD_MAP`) and whose output start times are after their initial times are resumed from checkpoints.
+
+    Args:
+        preprocessed_task (:obj:`PreprocessedTask`): preprocessed information about the task
+        model (:obj:`object`): model, with the changes applied
+        model_changes (:obj:`list` of :obj:`ModelChange`): changes applied to the model
+        simulation_args (:obj:`dict`): arguments for the simulation method
+        timer (:obj:`PhaseTimer`, optional): timer for the phases of the simulation
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`dict`: arguments for the simulation method, which start the simulation at its output start time from
+                the checkpoint, or :obj:`simulation_args` if the simulation isn't resumed from a checkpoint
+            :obj:`dict`: description of the checkpoint for the log of the task, or :obj:`None`
+    """
+    timer = timer or PhaseTimer(enabled=False)
+
+    properties = preprocessed_task.simulation_method_properties
+    checkpoint_method = properties.get('checkpoint_method', None)
+    initial_state_arg = properties.get('initial_state_arg', None)
+    if (
+        not checkpoint_method
+        or not initial_state_arg
+        or properties.get('seed_arg', None)
+        or preprocessed_task.model_digest is None
+        or simulation_args['output_start_time'] <= simulation_args['initial_time']
+    ):
+        return simulation_args, None
+
+    checkpoint_cache = get_checkpoint_cache()
+    if not checkpoint_cache.enabled:
+        return simulation_args, None
+
+    # the state doesn't depend on which model elements are recorded
+    observables_arg = properties.get('observables_arg', None)
+    algorithm_args = {name: value for name, value in preprocessed_task.simulation_args.items() if name != observables_arg}
+
+    with timer.phase('checkpoint'):
+        digest = get_checkpoint_digest(preprocessed_task.model_digest, model_changes, preprocessed_task.algorithm_kisao_id,
+                                       algorithm_args, simulation_args['initial_time'], simulation_args['output_start_time'])
+        state = checkpoint_cache.get_checkpoint(digest)
+        cached = state is not None
+        if not cached:
+            state = checkpoint_method(model, **{name: value for name, value in simulation_args.items() if name != 'chunk_size'})
+            checkpoint_cache.add_checkpoint(digest, state)
+
+    run_simulation_args = dict(simulation_args)
+    run_simulation_args['initial_time'] = simulation_args['output_start_time']
+    run_simulation_args[initial_state_arg] = state
+    return run_simulation_args, {
+        'initialTime': simulation_args['initial_time'],
+        'outputStartTime': simulation_args['output_start_time'],
+        'cached': cached,
+    }
+
+
+def _exec_shared_time_course(tasks, variables, config=None, simulator_config=None, results_dir=None):
+    """ Execute the time courses of tasks which only differ in their output start times, output end times and numbers of
+    time points with a single simulation, from their initial time to their latest output end time, which records the
+    union of their time points, and slice the results of each task from it
+
+    Args:
+        tasks (:obj:`list` of :obj:`Task`): tasks, which share their model, initial time and algorithm
+        variables (:obj:`list` of :obj:`list` of :obj:`Variable`): variables that should be recorded for each task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
+        results_dir (:obj:`str`, optional): directory in which to write the results of the variables of each task to an
+            HDF5 file, whose memory-mapped views are returned; :obj:`None` means that the results are held in memory
+
+    Returns:
+        :obj:`dict` of :obj:`str` to :obj:`TaskResult`: dictionary that maps the id of each task to its result, or
+            :obj:`None` if the simulation method can't record arbitrary time points or is stochastic
+    """
+    config = config or get_config()
+    simulator_config = simulator_config or get_simulator_config()
+
+    # record the duration of each phase of the execution of the tasks, if the execution is logged
+    timer = PhaseTimer(enabled=config.LOG, measure_memory=simulator_config.LOG_MEMORY)
+
+    #############################################################
+    # Preprocess the tasks with the variables of all of the tasks. Only simulation methods which can record arbitrary time
+    # points can execute the tasks together. The replicates of stochastic methods aren't shared by tasks, as they aren't
+    # when the tasks are executed individually.
+    if config.VALIDATE_SEDML:
+        with timer.phase('validation'):
+            for task, task_variables in zip(tasks[1:], variables[1:]):
+                _validate_sed_task(task, task_variables)
+
+    all_variables = [variable for task_variables in variables for variable in task_variables]
+    preprocessed_task = preprocess_sed_task(tasks[0], all_variables, config=config, simulator_config=simulator_config)
+    timer.update(preprocessed_task.timer)
+
+    time_points_arg = preprocessed_task.simulation_method_properties.get('time_points_arg', None)
+    if not time_points_arg or preprocessed_task.simulation_method_properties.get('seed_arg', None):
+        return None
+
+    model = preprocessed_task.model
+    if tasks[0].model.changes:
+        with timer.phase('changes'):
+            model = _apply_model_changes(model, tasks[0].model, preprocessed_task.model_change_targets)
+
+    #############################################################
+    # Execute the simulation
+    time_points = get_shared_time_points([task.simulation for task in tasks])
+
+    simulation_args = dict(preprocessed_task.simulation_args)
+    simulation_args['initial_time'] = tasks[0].simulation.initial_time
+    simulation_args['output_start_time'] = float(time_points[0])
+    simulation_args['output_end_time'] = float(time_points[-1])
+    simulation_args['number_of_points'] = len(time_points) - 1
+    simulation_args[time_points_arg] = time_points
+
+    run_simulation_args, checkpoint = _resume_from_checkpoint(preprocessed_task, model, tasks[0].model.changes,
+                                                              simulation_args, timer=timer)
+
+    simulation_method = preprocessed_task.simulation_method
+    with timer.phase('simulation'):
+        results = simulation_method(model, **run_simulation_args)
+
+    with timer.phase('results'):
+        result_ids, result_matrix = get_results_matrix(results)
+
+    #############################################################
+    # Slice the results of the variables of each task at its time points
+    task_results = {}
+    i_variable = 0
+    for task, task_variables in zip(tasks, variables):
+        variable_result_ids = preprocessed_task.variable_result_ids[i_variable:i_variable + len(task_variables)]
+        i_variable += len(task_variables)
+
+        with timer.phase('results'):
+            task_time_points = numpy.searchsorted(time_points, get_time_points(task.simulation))
+            variable_results = get_variable_results_from_matrix(task_variables, variable_result_ids, result_ids,
+                                                                result_matrix[:, task_time_points])
+
+            if results_dir:
+                fid, results_filename = tempfile.mkstemp(suffix='.h5', dir=results_dir)
+                os.close(fid)
+                write_mapped_results(results_filename, variable_results)
+                variable_results = open_mapped_results(results_filename)
+
+        if config.LOG:
+            sim = task.simulation
+            task_simulation_args = dict(preprocessed_task.simulation_args)
+            task_simulation_args['initial_time'] = sim.initial_time
+            task_simulation_args['output_start_time'] = sim.output_start_time
+            task_simulation_args['output_end_time'] = sim.output_end_time
+            task_simulation_args['number_of_points'] = sim.number_of_points
+            simulator_details = {
+                'method': simulation_method.__module__ + '.' + simulation_method.__name__,
+                'arguments': task_simulation_args,
+                'timings': dict(timer.timings),
+                'sharedTimeCourse': {
+                    'tasks': [task.id for task in tasks],
+                    'numberOfPoints': len(time_points) - 1,
+                },
+            }
+            if checkpoint:
+                simulator_details['checkpoint'] = checkpoint
+        else:
+            simulator_details = None
+
+        task_results[task.id] = TaskResult(variable_results=variable_results,
+                                           algorithm=preprocessed_task.algorithm_kisao_id,
+                                           simulator_details=simulator_details)
+
+    return task_results
+
+
+def preprocess_sed_task(task, variables, config=None, simulator_config=None):
     """ Preprocess a SED task, including its possible model changes and variables. This is useful for avoiding
     repeatedly initializing tasks on repeated calls of :obj:`exec_sed_task`.
 
@@ -238,8 +765,209 @@ def preprocess_sed_task(task, variables, config=None):
         task (:obj:`Task`): task
         variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
         config (:obj:`Config`, optional): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
 
     Returns:
-        :obj:`object`: preprocessed information about the task
+        :obj:`PreprocessedTask`: preprocessed information about the task
+
+    Raises:
+        :obj:`ValueError`: if the task or an aspect of the task is not valid, or the requested output variables
+            could not be recorded
+        :obj:`NotImplementedError`: if the task is not of a supported type or involves an unsuported feature
     """
-    pass
+    config = config or get_config()
+    simulator_config = simulator_config or get_simulator_config()
+
+    # record the duration of each phase of the preprocessing, if the execution is logged
+    timer = PhaseTimer(enabled=config.LOG, measure_memory=simulator_config.LOG_MEMORY)
+
+    model = task.model
+    sim = task.simulation
+
+    # Validate the task, unless an identical task already passed validation
+    if config.VALIDATE_SEDML:
+        with timer.phase('validation'):
+            _validate_sed_task_once(task, variables)
+
+    # If the model is encoded in XML, check that the XPaths for the variables are valid. The XPaths are only resolved
+    # once for each model content and set of targets.
+    with timer.phase('targets'):
+        model_digest = get_file_digest(model.source)
+        target_x_paths_ids = get_xpath_cache().validate_target_xpaths(variables, model.source, attr='id', digest=model_digest)
+
+        # Check that the simulation tool can produce each variables -- the simulation tool supports each symbol and target
+        variable_result_ids = get_variable_result_ids(variables, target_x_paths_ids)
+
+        # Resolve the model elements whose attributes are changed, so that the changes can be applied in memory
+        model_change_targets = _get_model_change_targets(model.changes, model.source, model_digest)
+
+    #############################################################
+    # Read the model located at `task.model.source`; `exec_sedml_docs_in_archive` has already resolved the model and
+    # applied any changes. Models with identical content are only parsed once per process.
+    with timer.phase('model'):
+        sim_model = get_model_cache().read_model(model.source, model.language, digest=model_digest)
+
+    with timer.phase('algorithm'):
+        #############################################################
+        # Load the algorithm specified by `simulation.algorithm`. The algorithms of `KISAO_METHOD_MAP` and the parsers
+        # of their parameters are precomputed, so this doesn't traverse the KiSAO ontology for supported algorithms.
+        algorithm_table = get_algorithm_table()
+        alg_kisao_id = algorithm_table.get_algorithm(sim.algorithm.kisao_id,
+                                                     get_algorithm_substitution_policy(config=config))
+        simulation_method_properties = KISAO_METHOD_MAP[alg_kisao_id]
+
+        #############################################################
+        # Apply the algorithm parameter changes specified by `simulation.algorithm.parameter_changes`
+        # For stochastic methods, the number of runs and seed parameters configure the ensemble of replicates of the
+        # simulation rather than arguments of the simulation method
+        number_of_runs = 1
+        seed = None
+        if alg_kisao_id == sim.algorithm.kisao_id:
+            changes = sim.algorithm.changes
+            if simulation_method_properties.get('seed_arg', None):
+                number_of_runs, seed, changes = get_ensemble_settings(changes)
+            simulation_args = algorithm_table.parse_parameter_changes(alg_kisao_id, changes)
+        else:
+            simulation_args = {}
+
+    #############################################################
+    # If the simulation method supports it, only record the model elements needed by the variables, in the order of the
+    # variables
+    observables_arg = simulation_method_properties.get('observables_arg', None)
+    if observables_arg:
+        simulation_args[observables_arg] = list(collections.OrderedDict.fromkeys(variable_result_ids))
+
+    #############################################################
+    # Return the information needed to execute the task
+    return PreprocessedTask(
+        model=sim_model,
+        algorithm_kisao_id=alg_kisao_id,
+        simulation_method_properties=simulation_method_properties,
+        simulation_args=simulation_args,
+        target_x_paths_ids=target_x_paths_ids,
+        variable_result_ids=variable_result_ids,
+        model_change_targets=model_change_targets,
+        number_of_runs=number_of_runs,
+        seed=seed,
+        timer=timer,
+        model_digest=model_digest,
+    )
+
+
+def _get_model_change_targets(changes, model_source, model_digest):
+    """ Get the ids of the model elements and the names of the attributes changed by model attribute changes
+
+    Args:
+        changes (:obj:`list` of :obj:`ModelAttributeChange`): model attribute changes
+        model_source (:obj:`str`): path to the model
+        model_digest (:obj:`str`): digest of the content of the model
+
+    Returns:
+        :obj:`dict`: dictionary that maps the target of each change to the id of the changed model element and the name of
+            the changed attribute
+
+    Raises:
+        :obj:`NotImplementedError`: if the target of a change is not an attribute of a model element
+        :obj:`ValueError`: if the target of a change doesn't match exactly one model element
+    """
+    if not changes:
+        return {}
+
+    element_targets = {}
+    for change in changes:
+        element_target, attribute = get_model_attribute_change_target(change)
+        element_targets[change.target] = (
+            Variable(target=element_target, target_namespaces=change.target_namespaces), attribute)
+
+    element_ids = get_xpath_cache().validate_target_xpaths([element for element, _ in element_targets.values()],
+                                                           model_source, attr='id', digest=model_digest)
+
+    return {
+        target: (element_ids[element.target], attribute)
+        for target, (element, attribute) in element_targets.items()
+    }
+
+
+def _apply_model_changes(model, sed_model, model_change_targets):
+    """ Apply the changes of a SED model to a copy of a model
+
+    Args:
+        model (:obj:`object`): model read by :obj:`my_simulator.read_model`
+        sed_model (:obj:`Model`): SED model, whose changes should be applied
+        model_change_targets (:obj:`dict`): dictionary that maps the targets of changes to the ids of the changed model
+            elements and the names of the changed attributes. The targets of other changes are resolved on demand.
+
+    Returns:
+        :obj:`object`: copy of the model with the changes applied
+    """
+    unresolved_changes = [change for change in sed_model.changes if change.target not in model_change_targets]
+    if unresolved_changes:
+        model_change_targets = dict(model_change_targets)
+        model_change_targets.update(_get_model_change_targets(unresolved_changes, sed_model.source,
+                                                              get_file_digest(sed_model.source)))
+
+    model = copy.deepcopy(model)
+    for change in sed_model.changes:
+        element_id, attribute = model_change_targets[change.target]
+        set_model_attribute(model, element_id, attribute, change.new_value)
+    return model
+
+
+def _validate_sed_task_once(task, variables):
+    """ Validate a task, unless an identical task already passed validation
+
+    Args:
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+
+    Raises:
+        :obj:`ValueError`: if the task or an aspect of the task is not valid
+    """
+    validation_cache = get_validation_cache()
+    task_digest = get_sed_task_digest(task, variables)
+    if not validation_cache.is_valid(task_digest):
+        _validate_sed_task(task, variables)
+        validation_cache.add_valid(task_digest)
+
+
+def _validate_sed_task(task, variables):
+    """ Validate that a SED task is valid and that it only involves features supported by MySimulator
+
+    Args:
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+
+    Raises:
+        :obj:`ValueError`: if the task or an aspect of the task is not valid
+        :obj:`NotImplementedError`: if the task is not of a supported type or involves an unsuported feature
+    """
+    model = task.model
+    sim = task.simulation
+
+    # Validate task
+    raise_errors_warnings(validation.validate_task(task),
+                          error_summary='Task `{}` is invalid.'.format(task.id))
+
+    # Validate that the model is encoded in a supported language
+    raise_errors_warnings(validation.validate_model_language(model.language, ModelLanguage.SBML),
+                          error_summary='Language for model `{}` is not supported.'.format(model.id))
+
+    # Validate that the model changes are of the supported types
+    raise_errors_warnings(validation.validate_model_change_types(model.changes, (ModelAttributeChange, )),
+                          error_summary='Changes for model `{}` are not supported.'.format(model.id))
+
+    # Validate model changes
+    raise_errors_warnings(*validation.validate_model_changes(task.model),
+                          error_summary='Changes for model `{}` are invalid.'.format(model.id))
+
+    # Validate that the simulation is a supported type of simulation
+    raise_errors_warnings(validation.validate_simulation_type(sim, (UniformTimeCourseSimulation, )),
+                          error_summary='{} `{}` is not supported.'.format(sim.__class__.__name__, sim.id))
+
+    # Validate time course settings
+    raise_errors_warnings(*validation.validate_simulation(sim),
+                          error_summary='Simulation `{}` is invalid.'.format(sim.id))
+
+    # Validate that variables of data generators have valid symbols and targets
+    raise_errors_warnings(*validation.validate_data_generator_variables(variables),
+                          error_summary='Data generator variables for task `{}` are invalid.'.format(task.id))
@@ -6,11 +6,12 @@
 :License: <License, e.g., MIT>
 """
 
+from .utils import PhaseTimer
 from biosimulators_utils.data_model import ValueType
 import collections
 import my_simulator
 
-__all__ = ['KISAO_METHOD_MAP']
+__all__ = ['KISAO_METHOD_MAP', 'PreprocessedTask']
 
 KISAO_METHOD_MAP = collections.OrderedDict([
     ('KISAO_XXXXXXXX', {
@@ -18,12 +19,102 @@ KISAO_METHOD_MAP = collections.OrderedDict([
         'method': my_simulator.simulation_method,
         'parameters': {
             'KISAO_XXXXXXXX': {
-                'name': {
-                    'argument_name': 'rtol',
-                    'type': ValueType.float,
-                    'default': 1e-8,
-                }
+                'name': 'relative tolerance',
+                'arg': 'rtol',
+                'type': ValueType.float,
+                'default': 1e-8,
             },
         }
     })
 ])
+# :obj:`collections.OrderedDict`: dictionary that maps the KiSAO id of each supported algorithm to its name, the method
+# which executes the algorithm and its parameters. Each parameter has a name, the name of the argument of the method
+# through which its value is passed (``arg``), a type and a default value. Each entry can also have
+#
+# * ``streaming_method``: a generator with the same arguments as ``method`` plus ``chunk_size`` which yields the results
+#   of a time course in chunks of at most ``chunk_size`` time points, as tuples of the ids of the recorded elements and a
+#   matrix with one row for each id
+# * ``observables_arg``: name of the argument of ``method`` (and ``streaming_method``) through which the ids of the model
+#   elements (and time) which should be recorded are passed, for methods which can limit their results to these elements
+# * ``seed_arg``: name of the argument of ``method`` (and ``streaming_method``) through which the seed of the random number
+#   generator of a stochastic method is passed. Simulations of these methods also accept the number of runs
+#   (``KISAO_0000498``) and seed (``KISAO_0000488``) parameters, and execute ensembles of replicates with independent seeds
+#   when the number of runs is greater than 1 (see :obj:`my_simulator.ensemble`).
+# * ``time_points_arg``: name of the argument of ``method`` through which an array of the time points at which the results
+#   should be recorded is passed, instead of the uniform grid defined by ``output_start_time``, ``output_end_time`` and
+#   ``number_of_points``, for methods which can sample their trajectories at arbitrary times (e.g., from the dense output
+#   of their integrators). If :obj:`SimulatorConfig.SHARE_TIME_COURSES` is enabled, the time courses of the tasks which
+#   only differ in their output time points are then executed with a single simulation (see
+#   :obj:`my_simulator.timecourse`). Only methods which sample a dense output, rather than stepping to each time point,
+#   then record the same trajectories as separate simulations.
+# * ``checkpoint_method``: a function with the same arguments as ``method`` which integrates a model from ``initial_time``
+#   to ``output_start_time`` and returns the state of the simulation at ``output_start_time``
+# * ``initial_state_arg``: name of the argument of ``method`` (and ``streaming_method``) through which a state returned by
+#   ``checkpoint_method`` is passed, from which the simulation resumes at ``initial_time``. For methods with both
+#   properties, the states of deterministic simulations at their output start times are cached (see
+#   :obj:`my_simulator.cache.CheckpointCache`), so that simulations of the same models from the same initial times to the
+#   same output start times don't integrate the discarded transients again.
+
+
+class PreprocessedTask(object):
+    """ Information about a SED task which is reused across repeated executions of the task
+
+    Attributes:
+        model (:obj:`object`): model read by :obj:`my_simulator.read_model`
+        algorithm_kisao_id (:obj:`str`): KiSAO id of the algorithm that is executed
+        simulation_method_properties (:obj:`dict`): entry of :obj:`KISAO_METHOD_MAP` for the executed algorithm
+        simulation_args (:obj:`dict`): arguments for the simulation method parsed from the algorithm parameter changes
+        target_x_paths_ids (:obj:`dict`): dictionary that maps the target of each variable to the id of the
+            corresponding model element
+        variable_result_ids (:obj:`list` of :obj:`str`): id of the result of the simulation for each variable
+        model_change_targets (:obj:`dict`): dictionary that maps the target of each model attribute change to the id of
+            the changed model element and the name of the changed attribute. The changes are applied to copies of
+            :obj:`model` when the task is executed.
+        number_of_runs (:obj:`int`): number of replicates of the simulation, for stochastic methods
+        seed (:obj:`int`): seed of the random number generator of the simulation, or of the ensemble of its replicates;
+            :obj:`None` means that no seed was specified
+        timer (:obj:`PhaseTimer`): durations of the phases of the preprocessing of the task
+        model_digest (:obj:`str`): digest of the content of the model file
+    """
+
+    def __init__(self, model=None, algorithm_kisao_id=None, simulation_method_properties=None, simulation_args=None,
+                 target_x_paths_ids=None, variable_result_ids=None, model_change_targets=None, number_of_runs=1,
+                 seed=None, timer=None, model_digest=None):
+        """
+        Args:
+            model (:obj:`object`, optional): model read by :obj:`my_simulator.read_model`
+            algorithm_kisao_id (:obj:`str`, optional): KiSAO id of the algorithm that is executed
+            simulation_method_properties (:obj:`dict`, optional): entry of :obj:`KISAO_METHOD_MAP` for the executed algorithm
+            simulation_args (:obj:`dict`, optional): arguments for the simulation method parsed from the algorithm
+                parameter changes
+            target_x_paths_ids (:obj:`dict`, optional): dictionary that maps the target of each variable to the id of the
+                corresponding model element
+            variable_result_ids (:obj:`list` of :obj:`str`, optional): id of the result of the simulation for each variable
+            model_change_targets (:obj:`dict`, optional): dictionary that maps the target of each model attribute change
+                to the id of the changed model element and the name of the changed attribute
+            number_of_runs (:obj:`int`, optional): number of replicates of the simulation, for stochastic methods
+            seed (:obj:`int`, optional): seed of the random number generator of the simulation, or of the ensemble of its
+                replicates
+            timer (:obj:`PhaseTimer`, optional): durations of the phases of the preprocessing of the task
+            model_digest (:obj:`str`, optional): digest of the content of the model file
+        """
+        self.model = model
+        self.algorithm_kisao_id = algorithm_kisao_id
+        self.simulation_method_properties = simulation_method_properties
+        self.simulation_args = simulation_args or {}
+        self.target_x_paths_ids = target_x_paths_ids or {}
+        self.variable_result_ids = variable_result_ids or []
+        self.model_change_targets = model_change_targets or {}
+        self.number_of_runs = number_of_runs
+        self.seed = seed
+        self.timer = timer or PhaseTimer(enabled=False)
+        self.model_digest = model_digest
+
+    @property
+    def simulation_method(self):
+        """ Get the simulation method for the executed algorithm
+
+        Returns:
+            :obj:`types.FunctionType`: simulation method
+        """
+        return self.simulation_method_properties['method']
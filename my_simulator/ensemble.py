@@ -0,0 +1,393 @@
+""" Methods for executing ensembles of replicates of stochastic simulations and aggregating their results
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .parallel import get_worker_context
+from biosimulators_utils.report.data_model import VariableResults
+import concurrent.futures
+import numpy
+
+__all__ = [
+    'NUMBER_OF_RUNS_KISAO_ID',
+    'SEED_KISAO_ID',
+    'get_ensemble_settings',
+    'get_replicate_seeds',
+    'RunningMoments',
+    'RunningQuantile',
+    'EnsembleAggregator',
+    'exec_ensemble',
+]
+
+NUMBER_OF_RUNS_KISAO_ID = 'KISAO_0000498'
+# :obj:`str`: KiSAO id of the algorithm parameter for the number of replicates of a stochastic simulation
+
+SEED_KISAO_ID = 'KISAO_0000488'
+# :obj:`str`: KiSAO id of the algorithm parameter for the seed of the random number generator of a stochastic simulation
+
+AGGREGATES = ('mean', 'variance', 'std', 'median')
+# :obj:`tuple` of :obj:`str`: names of the aggregates of ensembles, in addition to quantiles (``quantile:<q>``)
+
+
+def get_ensemble_settings(changes):
+    """ Get the number of replicates and the seed of an ensemble from the changes to the parameters of a stochastic
+    algorithm
+
+    Args:
+        changes (:obj:`list` of :obj:`AlgorithmParameterChange`): changes to the parameters of the algorithm
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`int`: number of replicates
+            * :obj:`int`: seed, or :obj:`None` if no seed was specified
+            * :obj:`list` of :obj:`AlgorithmParameterChange`: other changes
+
+    Raises:
+        :obj:`ValueError`: if the number of replicates is less than 1 or the seed is negative
+    """
+    number_of_runs = 1
+    seed = None
+    other_changes = []
+    for change in changes:
+        if change.kisao_id == NUMBER_OF_RUNS_KISAO_ID:
+            number_of_runs = int(change.new_value)
+            if number_of_runs < 1:
+                raise ValueError('The number of runs must be at least 1, not {}.'.format(number_of_runs))
+        elif change.kisao_id == SEED_KISAO_ID:
+            seed = int(change.new_value)
+            if seed < 0:
+                raise ValueError('The seed must be non-negative, not {}.'.format(seed))
+        else:
+            other_changes.append(change)
+    return number_of_runs, seed, other_changes
+
+
+def get_replicate_seeds(seed, number_of_runs):
+    """ Get independent seeds for the random number generators of the replicates of an ensemble
+
+    The seeds are drawn from independent streams spawned from the seed of the ensemble
+    (:obj:`numpy.random.SeedSequence`), so that the random numbers of the replicates are not correlated.
+
+    Args:
+        seed (:obj:`int`): seed of the ensemble, or :obj:`None` to draw a seed from the entropy of the operating system
+        number_of_runs (:obj:`int`): number of replicates
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`list` of :obj:`int`: seed of each replicate
+            * :obj:`int`: seed of the ensemble, which can be used to reproduce the ensemble
+    """
+    seed_sequence = numpy.random.SeedSequence(seed)
+    seeds = [int(child.generate_state(1)[0]) for child in seed_sequence.spawn(number_of_runs)]
+    return seeds, seed_sequence.entropy
+
+
+class RunningMoments(object):
+    """ Running mean and variance of a sequence of arrays (Welford's algorithm)
+
+    Attributes:
+        count (:obj:`int`): number of arrays
+        mean (:obj:`numpy.ndarray`): mean
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._sum_squared_deviations = None
+
+    def add(self, value):
+        """ Add an array
+
+        Args:
+            value (:obj:`numpy.ndarray`): array
+        """
+        value = numpy.asarray(value, dtype=numpy.float64)
+        self.count += 1
+        if self.mean is None:
+            self.mean = value.copy()
+            self._sum_squared_deviations = numpy.zeros_like(value)
+        else:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._sum_squared_deviations += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """ Get the sample variance
+
+        Returns:
+            :obj:`numpy.ndarray`: sample variance, or NaN if there are fewer than two arrays
+        """
+        if self.count < 2:
+            return numpy.full_like(self.mean, numpy.nan)
+        return self._sum_squared_deviations / (self.count - 1)
+
+
+class RunningQuantile(object):
+    """ Running estimate of a quantile of each element of a sequence of arrays, in constant memory (the P-squared
+    algorithm of Jain and Chlamtac, 1985)
+
+    Attributes:
+        quantile (:obj:`float`): quantile (e.g., ``0.5`` for the median)
+        count (:obj:`int`): number of arrays
+    """
+
+    def __init__(self, quantile):
+        """
+        Args:
+            quantile (:obj:`float`): quantile, between 0 and 1
+        """
+        if not 0. < quantile < 1.:
+            raise ValueError('Quantiles must be between 0 and 1, not {}.'.format(quantile))
+        self.quantile = quantile
+        self.count = 0
+        self._initial_values = []
+        self._heights = None
+        self._positions = None
+        self._desired_positions = numpy.array([0., 2. * quantile, 4. * quantile, 2. + 2. * quantile, 4.])
+        self._desired_position_increments = numpy.array([0., quantile / 2., quantile, (1. + quantile) / 2., 1.])
+
+    def add(self, value):
+        """ Add an array
+
+        Args:
+            value (:obj:`numpy.ndarray`): array
+        """
+        value = numpy.asarray(value, dtype=numpy.float64)
+        self.count += 1
+
+        if self._heights is None:
+            self._initial_values.append(value.ravel().copy())
+            if self.count == 5:
+                self._heights = numpy.sort(numpy.array(self._initial_values), axis=0)
+                self._positions = numpy.tile(numpy.arange(5.)[:, numpy.newaxis], (1, self._heights.shape[1]))
+                self._shape = value.shape
+                self._initial_values = None
+            return
+
+        value = value.ravel()
+        heights = self._heights
+        positions = self._positions
+
+        # update the extreme markers and increment the positions of the markers above the new value
+        heights[0] = numpy.minimum(heights[0], value)
+        heights[4] = numpy.maximum(heights[4], value)
+        cell = numpy.sum(value >= heights[1:4], axis=0)
+        positions += numpy.arange(5)[:, numpy.newaxis] > cell
+        self._desired_positions += self._desired_position_increments
+
+        # adjust the heights of the middle markers
+        for i_marker in range(1, 4):
+            offset = self._desired_positions[i_marker] - positions[i_marker]
+            adjust = (
+                ((offset >= 1.) & (positions[i_marker + 1] - positions[i_marker] > 1.))
+                | ((offset <= -1.) & (positions[i_marker - 1] - positions[i_marker] < -1.))
+            )
+            if not numpy.any(adjust):
+                continue
+
+            direction = numpy.sign(offset[adjust])
+            height = heights[i_marker, adjust]
+            lower_height = heights[i_marker - 1, adjust]
+            upper_height = heights[i_marker + 1, adjust]
+            position = positions[i_marker, adjust]
+            lower_position = positions[i_marker - 1, adjust]
+            upper_position = positions[i_marker + 1, adjust]
+
+            parabolic_height = height + direction / (upper_position - lower_position) * (
+                (position - lower_position + direction) * (upper_height - height) / (upper_position - position)
+                + (upper_position - position - direction) * (height - lower_height) / (position - lower_position)
+            )
+            linear_height = numpy.where(
+                direction > 0,
+                height + (upper_height - height) / (upper_position - position),
+                height - (lower_height - height) / (lower_position - position),
+            )
+            heights[i_marker, adjust] = numpy.where(
+                (lower_height < parabolic_height) & (parabolic_height < upper_height), parabolic_height, linear_height)
+            positions[i_marker, adjust] += direction
+
+    @property
+    def value(self):
+        """ Get the estimate of the quantile
+
+        Returns:
+            :obj:`numpy.ndarray`: estimate of the quantile of each element
+        """
+        if self._heights is None:
+            return numpy.quantile(numpy.array(self._initial_values), self.quantile, axis=0).reshape(
+                numpy.asarray(self._initial_values[0]).shape)
+        return self._heights[2].reshape(self._shape)
+
+
+class EnsembleAggregator(object):
+    """ Collects the results of the replicates of an ensemble, either as stacked trajectories or as a running aggregate,
+    whose memory doesn't grow with the number of replicates
+
+    Attributes:
+        number_of_runs (:obj:`int`): number of replicates
+        aggregate (:obj:`str`): :obj:`None` to stack the trajectories of the replicates, or the name of an aggregate
+            (``mean``, ``variance``, ``std``, ``median`` or ``quantile:<q>``, e.g., ``quantile:0.95``)
+    """
+
+    def __init__(self, number_of_runs, aggregate=None):
+        """
+        Args:
+            number_of_runs (:obj:`int`): number of replicates
+            aggregate (:obj:`str`, optional): :obj:`None` to stack the trajectories of the replicates, or the name of an
+                aggregate
+
+        Raises:
+            :obj:`ValueError`: if the aggregate is not supported
+        """
+        self.number_of_runs = number_of_runs
+        self.aggregate = aggregate or None
+
+        if self.aggregate is None or self.aggregate in ('mean', 'variance', 'std'):
+            self._build_accumulator = RunningMoments
+        elif self.aggregate == 'median':
+            self._build_accumulator = lambda: RunningQuantile(0.5)
+        elif self.aggregate.startswith('quantile:'):
+            try:
+                quantile = float(self.aggregate[len('quantile:'):])
+            except ValueError:
+                quantile = None
+            if quantile is None or not 0. < quantile < 1.:
+                raise ValueError('`{}` is not a valid quantile. Quantiles must be between 0 and 1.'.format(self.aggregate))
+            self._build_accumulator = lambda: RunningQuantile(quantile)
+        else:
+            raise ValueError('`{}` is not a supported aggregate. The aggregate must be one of the following:\n  - {}'.format(
+                self.aggregate, '\n  - '.join(AGGREGATES + ('quantile:<q>',))))
+
+        self._results = {}
+
+    def add(self, i_run, variable_results):
+        """ Add the results of a replicate
+
+        Args:
+            i_run (:obj:`int`): index of the replicate
+            variable_results (:obj:`VariableResults`): results of the variables of the replicate
+        """
+        for variable_id, result in variable_results.items():
+            if self.aggregate is None:
+                stacked_results = self._results.get(variable_id, None)
+                if stacked_results is None:
+                    stacked_results = self._results[variable_id] = numpy.full(
+                        (self.number_of_runs,) + numpy.shape(result), numpy.nan)
+                stacked_results[i_run] = result
+            else:
+                accumulator = self._results.get(variable_id, None)
+                if accumulator is None:
+                    accumulator = self._results[variable_id] = self._build_accumulator()
+                accumulator.add(result)
+
+    def get_variable_results(self):
+        """ Get the stacked trajectories or the aggregate of the results of the replicates
+
+        Returns:
+            :obj:`VariableResults`: stacked trajectories (one row per replicate) or aggregate of each variable
+        """
+        variable_results = VariableResults()
+        for variable_id, result in self._results.items():
+            if self.aggregate is None:
+                variable_results[variable_id] = result
+            elif self.aggregate == 'mean':
+                variable_results[variable_id] = result.mean
+            elif self.aggregate == 'variance':
+                variable_results[variable_id] = result.variance
+            elif self.aggregate == 'std':
+                variable_results[variable_id] = numpy.sqrt(result.variance)
+            else:
+                variable_results[variable_id] = result.value
+        return variable_results
+
+
+def exec_ensemble(simulate, simulation_args, seed_arg, number_of_runs, seed=None, aggregate=None, num_workers=1):
+    """ Execute an ensemble of replicates of a stochastic simulation, each with an independent seed, and collect their
+    results
+
+    Args:
+        simulate (:obj:`types.FunctionType`): function which executes a replicate given the arguments for the simulation
+            method, and returns the results of its variables (:obj:`VariableResults`)
+        simulation_args (:obj:`dict`): arguments for the simulation method
+        seed_arg (:obj:`str`): name of the argument of the simulation method for the seed of its random number generator
+        number_of_runs (:obj:`int`): number of replicates
+        seed (:obj:`int`, optional): seed of the ensemble; :obj:`None` draws a seed from the entropy of the operating
+            system
+        aggregate (:obj:`str`, optional): :obj:`None` to stack the trajectories of the replicates, or the name of an
+            aggregate (see :obj:`EnsembleAggregator`)
+        num_workers (:obj:`int`, optional): number of worker processes; ``1`` executes the replicates in the current
+            process. To use multiple processes, :obj:`simulate` must be picklable.
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`VariableResults`: stacked trajectories or aggregate of each variable
+            * :obj:`int`: seed of the ensemble
+    """
+    aggregator = EnsembleAggregator(number_of_runs, aggregate=aggregate)
+    replicate_seeds, seed = get_replicate_seeds(seed, number_of_runs)
+
+    num_workers = min(num_workers, number_of_runs)
+    if num_workers > 1:
+        # keep a bounded number of replicates in flight, so that the results of the replicates are aggregated as they
+        # arrive rather than held in memory
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, mp_context=get_worker_context(),
+                                                    initializer=_init_worker,
+                                                    initargs=(simulate, simulation_args, seed_arg)) as executor:
+            pending = {}
+            i_next_run = 0
+            while i_next_run < number_of_runs or pending:
+                while i_next_run < number_of_runs and len(pending) < 2 * num_workers:
+                    pending[executor.submit(_exec_replicate, replicate_seeds[i_next_run])] = i_next_run
+                    i_next_run += 1
+
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    aggregator.add(pending.pop(future), future.result())
+
+    else:
+        for i_run, replicate_seed in enumerate(replicate_seeds):
+            replicate_simulation_args = dict(simulation_args)
+            replicate_simulation_args[seed_arg] = replicate_seed
+            aggregator.add(i_run, simulate(replicate_simulation_args))
+
+    return aggregator.get_variable_results(), seed
+
+
+_worker_simulate = None
+_worker_simulation_args = None
+_worker_seed_arg = None
+
+
+def _init_worker(simulate, simulation_args, seed_arg):
+    """ Initialize a worker process for executing replicates
+
+    Args:
+        simulate (:obj:`types.FunctionType`): function which executes a replicate
+        simulation_args (:obj:`dict`): arguments for the simulation method
+        seed_arg (:obj:`str`): name of the argument of the simulation method for the seed of its random number generator
+    """
+    global _worker_simulate, _worker_simulation_args, _worker_seed_arg
+    _worker_simulate = simulate
+    _worker_simulation_args = simulation_args
+    _worker_seed_arg = seed_arg
+
+
+def _exec_replicate(seed):
+    """ Execute a replicate in a worker process
+
+    Args:
+        seed (:obj:`int`): seed of the replicate
+
+    Returns:
+        :obj:`VariableResults`: results of the variables of the replicate
+    """
+    simulation_args = dict(_worker_simulation_args)
+    simulation_args[_worker_seed_arg] = seed
+    return _worker_simulate(simulation_args)
@@ -0,0 +1,119 @@
+""" Methods for backing the results of tasks with HDF5 files, which are read back as memory-mapped arrays rather than held
+in memory
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.report.data_model import VariableResults
+import h5py
+import numpy
+
+__all__ = [
+    'RESULTS_DATASET',
+    'MappedVariableResults',
+    'create_mapped_results',
+    'write_mapped_results',
+    'open_mapped_results',
+]
+
+RESULTS_DATASET = 'results'
+# :obj:`str`: name of the HDF5 dataset of the matrix of the results of the variables of a task
+
+
+class MappedVariableResults(VariableResults):
+    """ Results of the variables of a task which are memory-mapped views of the rows of a matrix in an HDF5 file
+
+    Instances are pickled as the path to their file, so that worker processes can return them to the parent process
+    without copying the results.
+
+    Attributes:
+        filename (:obj:`str`): path to the HDF5 file
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        """
+        Args:
+            filename (:obj:`str`): path to the HDF5 file
+            *args (:obj:`list`): positional arguments for :obj:`dict`
+            **kwargs (:obj:`dict`): keyword arguments for :obj:`dict`
+        """
+        super(MappedVariableResults, self).__init__(*args, **kwargs)
+        self.filename = filename
+
+    def __reduce__(self):
+        return (open_mapped_results, (self.filename,))
+
+
+def create_mapped_results(filename, variable_ids, shape, dtype):
+    """ Create an HDF5 file for the matrix of the results of the variables of a task and map the matrix into memory
+
+    The matrix is stored contiguously and is allocated when the file is created, so that it can be memory-mapped.
+    Empty matrices, which HDF5 doesn't allocate, are returned as in-memory arrays.
+
+    Args:
+        filename (:obj:`str`): path to the HDF5 file
+        variable_ids (:obj:`list` of :obj:`str`): id of the variable of each row of the matrix
+        shape (:obj:`tuple` of :obj:`int`): shape of the matrix (number of variables, number of time points)
+        dtype (:obj:`numpy.dtype`): data type of the matrix
+
+    Returns:
+        :obj:`numpy.memmap`: writable memory-mapped matrix
+    """
+    dtype = numpy.dtype(dtype)
+
+    dataset_create_props = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    dataset_create_props.set_alloc_time(h5py.h5d.ALLOC_TIME_EARLY)
+    dataset_create_props.set_fill_time(h5py.h5d.FILL_TIME_NEVER)
+
+    with h5py.File(filename, 'w') as file:
+        dataset = file.create_dataset(RESULTS_DATASET, shape=shape, dtype=dtype, dcpl=dataset_create_props)
+        dataset.attrs['variableIds'] = list(variable_ids)
+        offset = dataset.id.get_offset()
+
+    if offset is None or not numpy.prod(shape):
+        return numpy.empty(shape, dtype=dtype)
+    return numpy.memmap(filename, dtype=dtype, mode='r+', offset=offset, shape=shape)
+
+
+def write_mapped_results(filename, variable_results):
+    """ Write the results of the variables of a task to an HDF5 file
+
+    Args:
+        filename (:obj:`str`): path to the HDF5 file
+        variable_results (:obj:`VariableResults`): results of the variables, which must be arrays of the same shape
+    """
+    values = list(variable_results.values())
+    shape = (len(values),) + (numpy.shape(values[0]) if values else ())
+    dtype = numpy.result_type(*values) if values else numpy.float64
+
+    matrix = create_mapped_results(filename, list(variable_results.keys()), shape, dtype)
+    for i_variable, value in enumerate(values):
+        matrix[i_variable] = value
+    if isinstance(matrix, numpy.memmap):
+        matrix.flush()
+
+
+def open_mapped_results(filename):
+    """ Map the results of the variables of a task from an HDF5 file into memory
+
+    The file is mapped copy-on-write, so modifications of the results are private to the process.
+
+    Args:
+        filename (:obj:`str`): path to the HDF5 file
+
+    Returns:
+        :obj:`MappedVariableResults`: results of the variables
+    """
+    with h5py.File(filename, 'r') as file:
+        dataset = file[RESULTS_DATASET]
+        variable_ids = [str(variable_id) for variable_id in dataset.attrs['variableIds']]
+        offset = dataset.id.get_offset()
+        if offset is None or not dataset.size:
+            matrix = dataset[...]
+        else:
+            matrix = numpy.memmap(filename, dtype=dataset.dtype, mode='c', offset=offset, shape=dataset.shape)
+
+    return MappedVariableResults(filename, zip(variable_ids, matrix))
@@ -0,0 +1,205 @@
+""" Methods for writing the reports of SED documents in the background, while their tasks execute
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .config import DEFAULT_OUTPUT_QUEUE_SIZE
+from biosimulators_utils.log.data_model import Status
+from biosimulators_utils.report.data_model import ReportFormat
+from biosimulators_utils.report.io import ReportWriter
+from biosimulators_utils.sedml import exec as sedml_exec
+from biosimulators_utils.sedml.data_model import Report
+import collections
+import contextlib
+import os
+import queue
+import threading
+
+__all__ = [
+    'OutputWriter',
+    'AsynchronousReportWriter',
+    'asynchronous_output_writing',
+    'fail_unwritten_outputs',
+]
+
+_output_writing = threading.local()
+_writers_lock = threading.Lock()
+_writers_users = 0
+
+
+class OutputWriter(object):
+    """ Background thread which writes outputs (e.g., reports) in the order in which they are submitted
+
+    The queue of writes is bounded, so that submitting writes blocks while the thread is :obj:`max_queue_size` writes
+    behind. Writes which are superseded by a later write of the same file (e.g., the report of a document which is
+    rewritten after each of the tasks which contribute to it) before they start are skipped.
+
+    Attributes:
+        max_queue_size (:obj:`int`): maximum number of writes which are queued
+    """
+
+    def __init__(self, max_queue_size=DEFAULT_OUTPUT_QUEUE_SIZE):
+        """
+        Args:
+            max_queue_size (:obj:`int`, optional): maximum number of writes which are queued
+        """
+        self.max_queue_size = max_queue_size
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._latest_writes = {}
+        self._errors = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='my-simulator-output-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, key, output_id, func, *args, **kwargs):
+        """ Queue a write of an output
+
+        Args:
+            key (:obj:`tuple`): key of the written file, which is shared by the writes which supersede each other
+            output_id (:obj:`str`): id of the output
+            func (:obj:`types.FunctionType`): function which writes the output
+            *args (:obj:`list`): positional arguments for :obj:`func`
+            **kwargs (:obj:`dict`): keyword arguments for :obj:`func`
+        """
+        with self._lock:
+            i_write = self._latest_writes[key] = self._latest_writes.get(key, 0) + 1
+        self._queue.put((key, i_write, output_id, func, args, kwargs))
+
+    def _run(self):
+        """ Write the queued outputs until :obj:`close` is called """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+
+                key, i_write, output_id, func, args, kwargs = item
+                with self._lock:
+                    if self._latest_writes[key] != i_write:
+                        continue
+
+                try:
+                    func(*args, **kwargs)
+                    exception = None
+                except Exception as caught_exception:
+                    exception = caught_exception
+
+                with self._lock:
+                    if exception is None:
+                        self._errors.pop(key, None)
+                    else:
+                        self._errors[key] = (output_id, exception)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """ Wait until all of the queued outputs have been written """
+        self._queue.join()
+
+    def close(self):
+        """ Write all of the queued outputs and stop the thread """
+        self._queue.put(None)
+        self._thread.join()
+
+    def get_errors(self):
+        """ Get the errors of the writes of outputs whose latest write failed
+
+        Returns:
+            :obj:`list` of :obj:`tuple`: id of each output and the exception of its first failed write (e.g., of the
+                first of the formats of a report)
+        """
+        with self._lock:
+            errors = collections.OrderedDict()
+            for output_id, exception in self._errors.values():
+                errors.setdefault(output_id, exception)
+            return list(errors.items())
+
+
+class AsynchronousReportWriter(ReportWriter):
+    """ Report writer which queues reports to the :obj:`OutputWriter` of :obj:`asynchronous_output_writing`, and writes
+    reports immediately outside of this context
+    """
+
+    def run(self, report, results, base_path, rel_path, format=ReportFormat.h5, type=Report):
+        """ Save a report
+
+        Args:
+            report (:obj:`Report`): report
+            results (:obj:`DataSetResults`): results of the data sets
+            base_path (:obj:`str`): path to save results
+            rel_path (:obj:`str`): path to save results relative to :obj:`base_path`
+            format (:obj:`ReportFormat`, optional): report format
+            type (:obj:`type`): type of output (e.g., subclass of :obj:`Output` such as :obj:`Report`, :obj:`Plot2D`)
+        """
+        writer = getattr(_output_writing, 'writer', None)
+        run = super(AsynchronousReportWriter, self).run
+        if writer is None:
+            return run(report, results, base_path, rel_path, format=format, type=type)
+
+        writer.submit(('report', base_path, rel_path, format), os.path.basename(rel_path),
+                      run, report, results, base_path, rel_path, format=format, type=type)
+
+
+@contextlib.contextmanager
+def asynchronous_output_writing(max_queue_size=DEFAULT_OUTPUT_QUEUE_SIZE):
+    """ Write the reports of SED documents executed in the current thread with a background thread, so that the
+    execution of the next tasks proceeds while the reports of the previous tasks are written
+
+    :obj:`biosimulators_utils.sedml.exec.exec_sed_doc` writes reports with the :obj:`ReportWriter` of its module.
+    Within this context, it writes reports with an :obj:`OutputWriter` in the threads which entered the context, and
+    immediately in other threads. All of the reports have been written when the context exits. Because the reports are
+    written by a single thread, the results which they are written from must remain valid until the context exits.
+
+    Plots are still generated immediately, because the state of :obj:`matplotlib.pyplot` (e.g., its current figure and
+    ``rcParams``) is global and isn't thread-safe.
+
+    :obj:`biosimulators_utils.sedml.exec.exec_sed_doc` logs reports as succeeded once they have been queued. The
+    reports which then can't be written must be recorded as failed with :obj:`fail_unwritten_outputs` after the context
+    exits.
+
+    Args:
+        max_queue_size (:obj:`int`, optional): maximum number of writes which are queued
+
+    Yields:
+        :obj:`OutputWriter`: writer, whose :obj:`OutputWriter.get_errors` reports the outputs which couldn't be written
+    """
+    global _writers_users
+
+    with _writers_lock:
+        if not _writers_users:
+            sedml_exec.ReportWriter = AsynchronousReportWriter
+        _writers_users += 1
+
+    writer = OutputWriter(max_queue_size=max_queue_size)
+    prev_writer = getattr(_output_writing, 'writer', None)
+    _output_writing.writer = writer
+    try:
+        yield writer
+    finally:
+        _output_writing.writer = prev_writer
+        writer.close()
+
+        with _writers_lock:
+            _writers_users -= 1
+            if not _writers_users:
+                sedml_exec.ReportWriter = ReportWriter
+
+
+def fail_unwritten_outputs(log, errors):
+    """ Record that the outputs of a SED document which were logged as succeeded when they were queued, but which
+    couldn't be written in the background, failed
+
+    Args:
+        log (:obj:`SedDocumentLog`): log of the document
+        errors (:obj:`list` of :obj:`tuple`): id of each output which couldn't be written and the exception of its write
+            (see :obj:`OutputWriter.get_errors`)
+    """
+    for output_id, exception in errors:
+        output_log = (log.outputs or {}).get(output_id, None)
+        if output_log is not None:
+            output_log.status = Status.FAILED
+            output_log.exception = exception
+            output_log.export()
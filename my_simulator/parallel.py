@@ -0,0 +1,307 @@
+""" Methods for executing the independent tasks of SED documents in parallel
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .capture import SPOOL_FILENAME, OutputSpool
+from .transport import open_variable_results
+from biosimulators_utils.log.data_model import StandardOutputErrorCapturerLevel, TaskLog
+from biosimulators_utils.sedml.data_model import Task, ComputeModelChange
+from biosimulators_utils.sedml.utils import get_variables_for_task, resolve_model_and_apply_xml_changes
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+__all__ = [
+    'TaskResult',
+    'get_worker_context',
+    'init_task_worker',
+    'is_task_worker',
+    'tasks_share_state',
+    'exec_tasks_in_parallel',
+    'exec_precomputed_sed_task',
+]
+
+
+class TaskResult(object):
+    """ Result of the execution of a task by a worker process
+
+    Attributes:
+        variable_results (:obj:`VariableResults`): results of the variables of the task
+        algorithm (:obj:`str`): KiSAO id of the executed algorithm
+        simulator_details (:obj:`dict`): additional simulator-specific information
+        exception (:obj:`Exception`): exception raised by the execution of the task, if any
+        output (:obj:`str`): standard output and error of the execution of the task, if they were captured
+    """
+
+    def __init__(self, variable_results=None, algorithm=None, simulator_details=None, exception=None, output=None):
+        """
+        Args:
+            variable_results (:obj:`VariableResults`, optional): results of the variables of the task
+            algorithm (:obj:`str`, optional): KiSAO id of the executed algorithm
+            simulator_details (:obj:`dict`, optional): additional simulator-specific information
+            exception (:obj:`Exception`, optional): exception raised by the execution of the task, if any
+            output (:obj:`str`, optional): standard output and error of the execution of the task, if they were captured
+        """
+        self.variable_results = variable_results
+        self.algorithm = algorithm
+        self.simulator_details = simulator_details
+        self.exception = exception
+        self.output = output
+
+
+def get_worker_context():
+    """ Get the context with which pools of worker processes start their workers
+
+    Workers aren't forked from the executing process, whose other threads (e.g., which write outputs or extract
+    archives) could hold locks at the time of the fork. Workers are started by a fork server where it is available, and
+    are spawned otherwise. Consequently, the functions and arguments submitted to the workers must be picklable.
+
+    Returns:
+        :obj:`multiprocessing.context.BaseContext`: context
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+_task_worker = False
+# :obj:`bool`: whether the current process is a worker process which executes tasks
+
+
+def init_task_worker():
+    """ Initialize a worker process which executes tasks (or the iterations of repeated tasks) """
+    global _task_worker
+    _task_worker = True
+
+
+def is_task_worker():
+    """ Determine whether the current process is a worker process which executes tasks. Pools of these workers already
+    execute :obj:`SimulatorConfig.NUM_WORKERS` tasks at once, so the tasks which they execute shouldn't start nested pools
+    of worker processes.
+
+    Returns:
+        :obj:`bool`: :obj:`True` if the current process is a worker process which executes tasks
+    """
+    return _task_worker
+
+
+def tasks_share_state(tasks):
+    """ Determine whether the execution of a list of tasks could depend on the execution of other tasks, in which case
+    the tasks must be executed serially
+
+    Only basic tasks whose model changes do not read the values of other models are considered to be independent. Repeated
+    tasks are executed serially because their sub-tasks may depend on the state of the models of previous iterations.
+
+    Args:
+        tasks (:obj:`list` of :obj:`AbstractTask`): tasks
+
+    Returns:
+        :obj:`bool`: :obj:`True` if the tasks should be executed serially
+    """
+    for task in tasks:
+        if not isinstance(task, Task):
+            return True
+
+        for change in task.model.changes:
+            if isinstance(change, ComputeModelChange) and change.variables:
+                return True
+
+    return False
+
+
+def exec_tasks_in_parallel(task_executer, doc, working_dir, num_workers,
+                           apply_xml_model_changes=False, pretty_print_modified_xml_models=False, config=None,
+                           transport=None, exclude_task_ids=(), log_level=StandardOutputErrorCapturerLevel.c):
+    """ Execute the tasks of a SED document which record variables on a pool of worker processes
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute each task (e.g., :obj:`my_simulator.core.exec_sed_task`)
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        num_workers (:obj:`int`): number of worker processes
+        apply_xml_model_changes (:obj:`bool`, optional): if :obj:`True`, apply any model changes specified in the SED-ML file
+        pretty_print_modified_xml_models (:obj:`bool`, optional): if :obj:`True`, pretty print modified XML models
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        transport (:obj:`ResultsTransport`, optional): transport for the results of the tasks; :obj:`None` pickles
+            the results
+        exclude_task_ids (:obj:`collections.abc.Container` of :obj:`str`, optional): ids of tasks which have already been
+            executed and should not be executed again
+        log_level (:obj:`StandardOutputErrorCapturerLevel`, optional): level at which the workers capture the standard
+            output and error of the tasks, if the execution is logged
+
+    Returns:
+        :obj:`dict` of :obj:`str` to :obj:`TaskResult`: dictionary that maps the id of each task to its result, in the
+            order of the tasks in the document, or :obj:`None` if the tasks must be executed serially
+    """
+    tasks = [task for task in doc.tasks if task.id not in exclude_task_ids and get_variables_for_task(doc, task)]
+    if num_workers < 2 or len(tasks) < 2 or tasks_share_state(tasks):
+        return None
+
+    args = (working_dir, apply_xml_model_changes, pretty_print_modified_xml_models, config, transport, log_level)
+
+    task_results = {}
+    interrupted_tasks = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(num_workers, len(tasks)),
+                                                mp_context=get_worker_context(),
+                                                initializer=init_task_worker) as executor:
+        futures = [executor.submit(_exec_task_in_worker, task_executer, doc, task.id, *args) for task in tasks]
+        for task, future in zip(tasks, futures):
+            try:
+                task_results[task.id] = future.result()
+            except concurrent.futures.process.BrokenProcessPool:
+                interrupted_tasks.append(task)
+            except Exception as exception:
+                # e.g., the exception of the task couldn't be pickled
+                task_results[task.id] = TaskResult(exception=exception)
+
+    # If a worker died (e.g., because it ran out of memory), the pool is broken and all of its unfinished tasks are
+    # interrupted. Execute each of these tasks again in its own worker, so that only the tasks which kill their workers
+    # fail.
+    for task in interrupted_tasks:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=get_worker_context(),
+                                                    initializer=init_task_worker) as executor:
+            future = executor.submit(_exec_task_in_worker, task_executer, doc, task.id, *args)
+            try:
+                task_results[task.id] = future.result()
+            except Exception as exception:
+                task_results[task.id] = TaskResult(exception=exception)
+
+    return {task.id: task_results[task.id] for task in tasks}
+
+
+def _exec_task_in_worker(task_executer, doc, task_id, working_dir,
+                         apply_xml_model_changes, pretty_print_modified_xml_models, config, transport, log_level):
+    """ Resolve the model of a task, apply its changes and execute the task, capturing its standard output and error if
+    the execution is logged
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute the task
+        doc (:obj:`SedDocument`): SED document
+        task_id (:obj:`str`): id of the task
+        working_dir (:obj:`str`): working directory of the SED document
+        apply_xml_model_changes (:obj:`bool`): if :obj:`True`, apply any model changes specified in the SED-ML file
+        pretty_print_modified_xml_models (:obj:`bool`): if :obj:`True`, pretty print modified XML models
+        config (:obj:`Config`): BioSimulators common configuration
+        transport (:obj:`ResultsTransport`): transport for the results of the task, or :obj:`None` to pickle the results
+        log_level (:obj:`StandardOutputErrorCapturerLevel`): level at which to capture the standard output and error
+
+    Returns:
+        :obj:`TaskResult`: result of the task
+    """
+    if config is not None and not config.LOG:
+        return _exec_task(task_executer, doc, task_id, working_dir, apply_xml_model_changes,
+                          pretty_print_modified_xml_models, config, transport)
+
+    # Capture the output by redirecting the standard output and error of the worker to a file. The relay process of
+    # :obj:`StandardOutputErrorCapturer` can't be started by workers which weren't forked.
+    dirname = tempfile.mkdtemp()
+    try:
+        spool = OutputSpool(os.path.join(dirname, SPOOL_FILENAME))
+        prev = spool.redirect(log_level)
+        try:
+            task_result = _exec_task(task_executer, doc, task_id, working_dir, apply_xml_model_changes,
+                                     pretty_print_modified_xml_models, config, transport)
+        finally:
+            spool.restore(prev)
+            spool.close()
+
+        with open(spool.filename, 'rb') as file:
+            task_result.output = file.read().decode(errors='ignore')
+    finally:
+        shutil.rmtree(dirname)
+
+    return task_result
+
+
+def _exec_task(task_executer, doc, task_id, working_dir,
+               apply_xml_model_changes, pretty_print_modified_xml_models, config, transport):
+    """ Resolve the model of a task, apply its changes and execute the task
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute the task
+        doc (:obj:`SedDocument`): SED document
+        task_id (:obj:`str`): id of the task
+        working_dir (:obj:`str`): working directory of the SED document
+        apply_xml_model_changes (:obj:`bool`): if :obj:`True`, apply any model changes specified in the SED-ML file
+        pretty_print_modified_xml_models (:obj:`bool`): if :obj:`True`, pretty print modified XML models
+        config (:obj:`Config`): BioSimulators common configuration
+        transport (:obj:`ResultsTransport`): transport for the results of the task, or :obj:`None` to pickle the results
+
+    Returns:
+        :obj:`TaskResult`: result of the task
+    """
+    task = next(task for task in doc.tasks if task.id == task_id)
+    variables = get_variables_for_task(doc, task)
+    log = TaskLog(id=task.id) if config is None or config.LOG else None
+
+    temp_model_source = None
+    try:
+        temp_model, temp_model_source = resolve_model_and_apply_xml_changes(
+            task.model, doc, working_dir,
+            apply_xml_model_changes=apply_xml_model_changes,
+            pretty_print_modified_xml_models=pretty_print_modified_xml_models)[0:2]
+        task.model.source = temp_model.source
+        task.model.changes = temp_model.changes
+
+        variable_results, log = task_executer(task, variables, log=log, config=config)
+        if transport:
+            variable_results = transport.share(variable_results)
+        return TaskResult(variable_results=variable_results,
+                          algorithm=log.algorithm if log else None,
+                          simulator_details=log.simulator_details if log else None)
+
+    except Exception as exception:
+        return TaskResult(exception=exception)
+
+    finally:
+        if temp_model_source:
+            os.remove(temp_model_source)
+
+
+def exec_precomputed_sed_task(task_results, task_executer, task, variables, preprocessed_task=None, log=None, config=None):
+    """ Return the results of a task which was executed by :obj:`exec_tasks_in_parallel`, or execute the task if it
+    was not executed in parallel
+
+    The standard output and error which the workers captured are written to the standard output, so that they are
+    captured into the log of the task.
+
+    Args:
+        task_results (:obj:`dict` of :obj:`str` to :obj:`TaskResult`): dictionary that maps the id of each task executed in
+            parallel to its result
+        task_executer (:obj:`types.FunctionType`): function to execute tasks which were not executed in parallel
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        preprocessed_task (:obj:`PreprocessedTask`, optional): preprocessed information about the task
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`VariableResults`: results of variables
+            :obj:`TaskLog`: log
+    """
+    task_result = task_results.get(task.id, None)
+    if task_result is None:
+        return task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+
+    # replay the output of the task, so that it is captured into the log of the task
+    if task_result.output:
+        sys.stdout.write(task_result.output)
+        sys.stdout.flush()
+
+    if task_result.exception is not None:
+        raise task_result.exception
+
+    if log:
+        log.algorithm = task_result.algorithm
+        log.simulator_details = task_result.simulator_details
+
+    return open_variable_results(task_result.variable_results), log
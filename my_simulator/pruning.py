@@ -0,0 +1,155 @@
+""" Methods for pruning the tasks of SED documents which are not needed to generate the requested outputs
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.log.data_model import Status
+from biosimulators_utils.sedml.data_model import Report, Plot2D, Plot3D
+import copy
+import os
+
+__all__ = [
+    'is_output_selected',
+    'get_selected_output_ids',
+    'validate_output_ids',
+    'get_data_generators_for_output',
+    'prune_sed_doc',
+    'skip_pruned_tasks_and_outputs',
+]
+
+
+def is_output_selected(output, output_ids, rel_out_path=None):
+    """ Determine whether an output is one of the requested outputs
+
+    Args:
+        output (:obj:`Output`): output
+        output_ids (:obj:`list` of :obj:`str`): ids of the requested outputs, optionally prefixed by the location of
+            their SED document within its COMBINE/OMEX archive (e.g., ``simulation.sedml/report``); :obj:`None` means
+            that all outputs are requested
+        rel_out_path (:obj:`str`, optional): location of the SED document within its COMBINE/OMEX archive
+
+    Returns:
+        :obj:`bool`: :obj:`True` if the output was requested
+    """
+    if output_ids is None:
+        return True
+    return output.id in output_ids or (rel_out_path is not None and os.path.join(rel_out_path, output.id) in output_ids)
+
+
+def get_selected_output_ids(doc, output_ids, rel_out_path=None):
+    """ Get the requested output ids which select outputs of a SED document
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        output_ids (:obj:`list` of :obj:`str`): ids of the requested outputs, optionally prefixed by the location of
+            their SED document within its COMBINE/OMEX archive; :obj:`None` means that all outputs are requested
+        rel_out_path (:obj:`str`, optional): location of the SED document within its COMBINE/OMEX archive
+
+    Returns:
+        :obj:`list` of :obj:`str`: ids of :obj:`output_ids` which select outputs of the document
+    """
+    if output_ids is None:
+        return []
+    return [output_id for output_id in output_ids
+            if any(is_output_selected(output, [output_id], rel_out_path=rel_out_path) for output in doc.outputs)]
+
+
+def validate_output_ids(output_ids, selected_output_ids):
+    """ Check that each of the requested output ids selects an output
+
+    Args:
+        output_ids (:obj:`list` of :obj:`str`): ids of the requested outputs; :obj:`None` means that all outputs are
+            requested
+        selected_output_ids (:obj:`set` of :obj:`str`): ids of :obj:`output_ids` which select outputs (see
+            :obj:`get_selected_output_ids`)
+
+    Raises:
+        :obj:`ValueError`: if some of the requested output ids don't select any output
+    """
+    unselected_output_ids = [output_id for output_id in (output_ids or []) if output_id not in selected_output_ids]
+    if unselected_output_ids:
+        raise ValueError('No outputs have the requested ids:\n  - {}'.format(
+            '\n  - '.join('`{}`'.format(output_id) for output_id in unselected_output_ids)))
+
+
+def get_data_generators_for_output(output):
+    """ Get the data generators of an output
+
+    Args:
+        output (:obj:`Output`): output
+
+    Returns:
+        :obj:`list` of :obj:`DataGenerator`: data generators
+    """
+    if isinstance(output, Report):
+        return [data_set.data_generator for data_set in output.data_sets]
+
+    if isinstance(output, Plot2D):
+        return [data_generator
+                for curve in output.curves
+                for data_generator in (curve.x_data_generator, curve.y_data_generator)]
+
+    if isinstance(output, Plot3D):
+        return [data_generator
+                for surface in output.surfaces
+                for data_generator in (surface.x_data_generator, surface.y_data_generator, surface.z_data_generator)]
+
+    return []
+
+
+def prune_sed_doc(doc, output_ids=None, rel_out_path=None):
+    """ Get a copy of a SED document which only contains the requested outputs and the data generators and tasks needed
+    to generate them
+
+    The sub-tasks of the repeated tasks which are needed are executed as part of these repeated tasks, whether or not
+    they remain top-level tasks of the pruned document.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+        output_ids (:obj:`list` of :obj:`str`, optional): ids of the requested outputs, optionally prefixed by the
+            location of their SED document within its COMBINE/OMEX archive; :obj:`None` means all outputs
+        rel_out_path (:obj:`str`, optional): location of the SED document within its COMBINE/OMEX archive
+
+    Returns:
+        :obj:`SedDocument`: pruned copy of the document. Its models, simulations, data generators, outputs and tasks
+            are the objects of :obj:`doc`.
+    """
+    outputs = [output for output in doc.outputs if is_output_selected(output, output_ids, rel_out_path=rel_out_path)]
+
+    data_generators = set()
+    for output in outputs:
+        data_generators.update(get_data_generators_for_output(output))
+
+    tasks = set()
+    for data_generator in data_generators:
+        for variable in data_generator.variables:
+            if variable.task is not None:
+                tasks.add(variable.task)
+
+    pruned_doc = copy.copy(doc)
+    pruned_doc.outputs = outputs
+    pruned_doc.data_generators = [data_generator for data_generator in doc.data_generators if data_generator in data_generators]
+    pruned_doc.tasks = [task for task in doc.tasks if task in tasks]
+    return pruned_doc
+
+
+def skip_pruned_tasks_and_outputs(log, doc, pruned_doc):
+    """ Record that the tasks and outputs which were pruned from a SED document were skipped
+
+    Args:
+        log (:obj:`SedDocumentLog`): log of the document
+        doc (:obj:`SedDocument`): SED document
+        pruned_doc (:obj:`SedDocument`): pruned copy of the document
+    """
+    for task in set(doc.tasks).difference(pruned_doc.tasks):
+        task_log = (log.tasks or {}).get(task.id, None)
+        if task_log is not None:
+            task_log.status = Status.SKIPPED
+
+    for output in set(doc.outputs).difference(pruned_doc.outputs):
+        output_log = (log.outputs or {}).get(output.id, None)
+        if output_log is not None:
+            output_log.status = Status.SKIPPED
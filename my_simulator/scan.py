@@ -0,0 +1,331 @@
+""" Methods for executing the iterations of repeated tasks (e.g., parameter scans) in batches, with their model changes applied
+in memory
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .parallel import TaskResult, get_worker_context, init_task_worker
+from .transport import open_variable_results
+from biosimulators_utils.log.data_model import TaskLog
+from biosimulators_utils.report.data_model import VariableResults
+from biosimulators_utils.sedml import exec as sedml_exec
+from biosimulators_utils.sedml.data_model import (Task, RepeatedTask, ModelAttributeChange, FunctionalRange,
+                                                  SetValueComputeModelChange)
+from biosimulators_utils.sedml.utils import resolve_range, calc_compute_model_change_new_value
+from biosimulators_utils.utils.core import pad_arrays_to_consistent_shapes
+import collections
+import concurrent.futures
+import contextlib
+import copy
+import numpy
+import threading
+
+__all__ = [
+    'can_apply_model_changes_in_memory',
+    'is_batchable_repeated_task',
+    'get_repeated_task_iterations',
+    'exec_repeated_task_in_batches',
+    'batched_repeated_task_execution',
+]
+
+_batched_execution = threading.local()
+_executers_lock = threading.Lock()
+_executers_users = 0
+_base_exec_repeated_task = sedml_exec.exec_repeated_task
+
+
+def can_apply_model_changes_in_memory(doc):
+    """ Determine whether all of the changes to the models of a SED document, including the changes of the iterations of its
+    repeated tasks, can be applied in memory by :obj:`my_simulator.core.exec_sed_task`, rather than by modifying copies
+    of the model files
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`bool`: :obj:`True` if all of the changes are model attribute changes, or set value changes which do not
+            read the values of models
+    """
+    for model in doc.models:
+        for change in model.changes:
+            if not isinstance(change, ModelAttributeChange):
+                return False
+
+    for task in doc.tasks:
+        if isinstance(task, RepeatedTask):
+            for change in task.changes:
+                if change.variables or change.symbol:
+                    return False
+
+            for range in [task.range] + task.ranges + [change.range for change in task.changes if change.range]:
+                if isinstance(range, FunctionalRange) and range.variables:
+                    return False
+
+    return True
+
+
+def is_batchable_repeated_task(task):
+    """ Determine whether the iterations of a task can be executed in a batch
+
+    Args:
+        task (:obj:`AbstractTask`): task
+
+    Returns:
+        :obj:`bool`: :obj:`True` if the task is a repeated task whose sub-tasks are basic tasks
+    """
+    return (
+        isinstance(task, RepeatedTask)
+        and all(isinstance(sub_task.task, Task) for sub_task in task.sub_tasks)
+        and all(isinstance(change, SetValueComputeModelChange) for change in task.changes)
+    )
+
+
+def get_repeated_task_iterations(task, models):
+    """ Get the sub-tasks of each iteration of a repeated task, with the changes of the iteration appended to the changes of
+    their models, in the order in which :obj:`biosimulators_utils.sedml.exec.exec_repeated_task` executes them
+
+    As with :obj:`biosimulators_utils.sedml.exec.exec_repeated_task`, changes accumulate across iterations unless the
+    models are reset for each iteration. Only the last of the accumulated changes of each target is kept, so that the
+    number of changes of each iteration doesn't grow with the number of previous iterations.
+
+    Args:
+        task (:obj:`RepeatedTask`): repeated task whose sub-tasks are basic tasks
+        models (:obj:`dict` of :obj:`str` to :obj:`Model`): dictionary that maps the id of each model of the sub-tasks to
+            the model with its resolved source and changes
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`Task`: sub-tasks of each iteration, with their changes
+    """
+    main_range_values = resolve_range(task.range)
+    range_values = {}
+    for range in task.ranges:
+        range_values[range.id] = resolve_range(range)
+    for change in task.changes:
+        if change.range:
+            range_values[change.range.id] = resolve_range(change.range)
+
+    sub_tasks = sorted(task.sub_tasks, key=lambda sub_task: sub_task.order)
+
+    appended_changes = collections.defaultdict(collections.OrderedDict)
+    iterations = []
+    for i_main_range, main_range_value in enumerate(main_range_values):
+        if task.reset_model_for_each_iteration:
+            appended_changes = collections.defaultdict(collections.OrderedDict)
+
+        current_range_values = {task.range.id: main_range_value}
+        for range in task.ranges:
+            current_range_values[range.id] = range_values[range.id][i_main_range]
+        for change in task.changes:
+            if change.range:
+                current_range_values[change.range.id] = range_values[change.range.id][i_main_range]
+
+        for change in task.changes:
+            new_value = calc_compute_model_change_new_value(change, variable_values={}, range_values=current_range_values)
+            if new_value == int(new_value):
+                new_value = str(int(new_value))
+            else:
+                new_value = str(new_value)
+            # a later change of a target overrides its earlier changes
+            key = (change.target, tuple(sorted((change.target_namespaces or {}).items())))
+            model_changes = appended_changes[change.model.id]
+            model_changes.pop(key, None)
+            model_changes[key] = ModelAttributeChange(
+                target=change.target, target_namespaces=change.target_namespaces, new_value=new_value)
+
+        iteration = []
+        for sub_task in sub_tasks:
+            model = copy.copy(models[sub_task.task.model.id])
+            model.changes = model.changes + list(appended_changes[model.id].values())
+
+            iteration_task = copy.copy(sub_task.task)
+            iteration_task.model = model
+            iteration.append(iteration_task)
+        iterations.append(iteration)
+
+    return iterations
+
+
+def exec_repeated_task_in_batches(task, task_executer, task_preprocessor, variables, num_workers=1, config=None,
+                                  transport=None):
+    """ Execute the iterations of a repeated task whose sub-tasks are basic tasks and whose models have been resolved. The
+    sub-tasks are preprocessed once, and then their iterations are executed back-to-back, with the changes of each
+    iteration applied in memory. Optionally, the iterations are divided among a pool of worker processes.
+
+    Args:
+        task (:obj:`RepeatedTask`): repeated task whose sub-tasks are basic tasks (:obj:`is_batchable_repeated_task`)
+        task_executer (:obj:`types.FunctionType`): function to execute each task (e.g., :obj:`my_simulator.core.exec_sed_task`)
+        task_preprocessor (:obj:`types.FunctionType`): function to preprocess each task
+            (e.g., :obj:`my_simulator.core.preprocess_sed_task`)
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        num_workers (:obj:`int`, optional): number of worker processes; ``1`` executes the iterations in the current process
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        transport (:obj:`ResultsTransport`, optional): transport for the results of the iterations executed by worker
+            processes; :obj:`None` pickles the results
+
+    Returns:
+        :obj:`VariableResults`: results of the variables for each iteration and sub-task, in the same format as
+            :obj:`biosimulators_utils.sedml.exec.exec_repeated_task`
+
+    Raises:
+        :obj:`Exception`: the exception of the first iteration which failed
+    """
+    sub_tasks = sorted(task.sub_tasks, key=lambda sub_task: sub_task.order)
+    models = {sub_task.task.model.id: sub_task.task.model for sub_task in sub_tasks}
+    iteration_tasks = [
+        iteration_task
+        for iteration in get_repeated_task_iterations(task, models)
+        for iteration_task in iteration
+    ]
+
+    num_batches = max(1, min(num_workers, len(iteration_tasks)))
+    batches = [iteration_tasks[i_batch::num_batches] for i_batch in range(num_batches)]
+    if num_batches > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_batches, mp_context=get_worker_context(),
+                                                    initializer=init_task_worker) as executor:
+            batch_results = list(executor.map(_exec_batch,
+                                              [task_executer] * num_batches,
+                                              [task_preprocessor] * num_batches,
+                                              batches,
+                                              [variables] * num_batches,
+                                              [config] * num_batches,
+                                              [transport] * num_batches))
+    else:
+        batch_results = [_exec_batch(task_executer, task_preprocessor, batches[0], variables, config)]
+
+    # restore the order of the iterations
+    task_results = [
+        batch_results[i_iteration_task % num_batches][i_iteration_task // num_batches]
+        for i_iteration_task in range(len(iteration_tasks))
+    ]
+    for task_result in task_results:
+        if task_result.exception is not None:
+            raise task_result.exception
+
+    # shape the results of the sub-tasks to a consistent size, as :obj:`biosimulators_utils.sedml.exec.exec_repeated_task`
+    # does
+    iteration_variable_results = [open_variable_results(task_result.variable_results) for task_result in task_results]
+    arrays = [
+        iteration_variable_results[i_iteration_task].get(variable.id, None)
+        for variable in variables
+        for i_iteration_task in range(len(iteration_tasks))
+    ]
+    padded_arrays = pad_arrays_to_consistent_shapes(arrays)
+
+    num_sub_tasks = len(sub_tasks)
+    variable_results = VariableResults()
+    for i_variable, variable in enumerate(variables):
+        variable_arrays = padded_arrays[i_variable * len(iteration_tasks):(i_variable + 1) * len(iteration_tasks)]
+        variable_results[variable.id] = numpy.array([
+            variable_arrays[i_iteration_task:i_iteration_task + num_sub_tasks]
+            for i_iteration_task in range(0, len(iteration_tasks), num_sub_tasks)
+        ])
+    return variable_results
+
+
+def _exec_batch(task_executer, task_preprocessor, tasks, variables, config, transport=None):
+    """ Execute a batch of iterations of the sub-tasks of a repeated task, preprocessing each sub-task once
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute each task
+        task_preprocessor (:obj:`types.FunctionType`): function to preprocess each task
+        tasks (:obj:`list` of :obj:`Task`): iterations of the sub-tasks
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        config (:obj:`Config`): BioSimulators common configuration
+        transport (:obj:`ResultsTransport`, optional): transport for the results of the iterations, or :obj:`None` to
+            return the results as they are
+
+    Returns:
+        :obj:`list` of :obj:`TaskResult`: result of each iteration
+    """
+    preprocessed_tasks = {}
+    task_results = []
+    for task in tasks:
+        try:
+            preprocessed_task = preprocessed_tasks.get(task.id, None)
+            if preprocessed_task is None:
+                preprocessed_task = preprocessed_tasks[task.id] = task_preprocessor(task, variables, config=config)
+
+            log = TaskLog(id=task.id) if config is None or config.LOG else None
+            variable_results, log = task_executer(task, variables, preprocessed_task=preprocessed_task, log=log,
+                                                  config=config)
+            if transport:
+                variable_results = transport.share(variable_results)
+            task_results.append(TaskResult(variable_results=variable_results,
+                                           algorithm=log.algorithm if log else None,
+                                           simulator_details=log.simulator_details if log else None))
+
+        except Exception as exception:
+            task_results.append(TaskResult(exception=exception))
+
+    return task_results
+
+
+def _exec_repeated_task(task, task_executer, task_vars, doc, apply_xml_model_changes=False, config=None, **kwargs):
+    """ Execute a repeated task with :obj:`exec_repeated_task_in_batches` if it was reached by the execution of a SED
+    document in a thread which entered :obj:`batched_repeated_task_execution` and its iterations can be executed in
+    batches, or otherwise with :obj:`biosimulators_utils.sedml.exec.exec_repeated_task`
+
+    Args:
+        task (:obj:`RepeatedTask`): task
+        task_executer (:obj:`types.FunctionType`): function to execute each task
+        task_vars (:obj:`list` of :obj:`Variable`): variables that task must record
+        doc (:obj:`SedDocument`): SED document
+        apply_xml_model_changes (:obj:`bool`, optional): if :obj:`True`, apply any model changes specified in the SED-ML
+            file to copies of the model files
+        config (:obj:`Config`, optional): BioSimulators common configuration
+        **kwargs: other arguments of :obj:`biosimulators_utils.sedml.exec.exec_repeated_task`
+
+    Returns:
+        :obj:`VariableResults`: results of the variables
+    """
+    settings = getattr(_batched_execution, 'settings', None)
+    if settings is None or apply_xml_model_changes or not is_batchable_repeated_task(task):
+        return _base_exec_repeated_task(task, task_executer, task_vars, doc,
+                                        apply_xml_model_changes=apply_xml_model_changes, config=config, **kwargs)
+
+    batch_task_executer, task_preprocessor, num_workers, transport = settings
+    return exec_repeated_task_in_batches(task, batch_task_executer, task_preprocessor, task_vars,
+                                         num_workers=num_workers, config=config, transport=transport)
+
+
+@contextlib.contextmanager
+def batched_repeated_task_execution(task_executer, task_preprocessor, num_workers=1, transport=None):
+    """ Execute the iterations of the repeated tasks of the SED documents executed in the current thread, whose sub-tasks
+    are basic tasks, with :obj:`exec_repeated_task_in_batches`
+
+    :obj:`biosimulators_utils.sedml.exec.exec_sed_doc` executes repeated tasks with the :obj:`exec_repeated_task` of its
+    module. Within this context, the repeated tasks which are executed in the threads which entered the context, and
+    whose model changes are applied in memory (:obj:`can_apply_model_changes_in_memory`), are executed in batches when
+    they are reached; other repeated tasks are executed as usual. The results of the iterations of each repeated task
+    are only used by that repeated task.
+
+    Args:
+        task_executer (:obj:`types.FunctionType`): function to execute each iteration of the sub-tasks
+            (e.g., :obj:`my_simulator.core.exec_sed_task`)
+        task_preprocessor (:obj:`types.FunctionType`): function to preprocess each sub-task
+            (e.g., :obj:`my_simulator.core.preprocess_sed_task`)
+        num_workers (:obj:`int`, optional): number of worker processes; ``1`` executes the iterations in the current process
+        transport (:obj:`ResultsTransport`, optional): transport for the results of the iterations executed by worker
+            processes; :obj:`None` pickles the results
+    """
+    global _executers_users
+
+    with _executers_lock:
+        if not _executers_users:
+            sedml_exec.exec_repeated_task = _exec_repeated_task
+        _executers_users += 1
+
+    prev_settings = getattr(_batched_execution, 'settings', None)
+    _batched_execution.settings = (task_executer, task_preprocessor, num_workers, transport)
+    try:
+        yield
+    finally:
+        _batched_execution.settings = prev_settings
+
+        with _executers_lock:
+            _executers_users -= 1
+            if not _executers_users:
+                sedml_exec.exec_repeated_task = _base_exec_repeated_task
@@ -0,0 +1,339 @@
+""" Long-lived server for executing COMBINE/OMEX archives on request, which amortizes the start-up of MySimulator (importing
+its libraries, reading models) across archives
+
+Requests and responses are JSON objects, one per line, exchanged via standard input and output or via a UNIX socket.
+
+* Requests to execute archives: ``{"id": ..., "archive": "path/to/archive.omex", "outDir": "path/to/outputs"}``
+* Request to stop the server: ``{"id": ..., "command": "shutdown"}``. The server stops accepting requests, finishes the
+  archives which it already accepted, responds, and exits. Reaching the end of the input or receiving ``SIGTERM`` also
+  stops the server.
+
+Responses echo the ``id`` of their request and contain the summary of the execution of the archive (``status``,
+``duration``, ``exception``) in the same format as the summaries of batches (:obj:`my_simulator.batch`). Archives are
+executed concurrently, so their responses can be sent in a different order than their requests.
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .batch import _exec_combine_archive
+from .parallel import get_worker_context
+from biosimulators_utils.log.data_model import Status
+import concurrent.futures
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+
+__all__ = [
+    'SHUTDOWN_COMMAND',
+    'Server',
+]
+
+SHUTDOWN_COMMAND = 'shutdown'
+# :obj:`str`: command for stopping the server
+
+
+class Server(object):
+    """ Server for executing COMBINE/OMEX archives on request
+
+    Archives are executed by a pool of long-lived worker processes, which keep the simulator, its libraries and the
+    models that they have read (:obj:`my_simulator.cache`) in memory between requests. If a worker process dies (e.g.,
+    because it ran out of memory), the archives which the pool was executing fail, and the pool is replaced.
+
+    Attributes:
+        archive_executer (:obj:`types.FunctionType`): function to execute each archive
+            (e.g., :obj:`my_simulator.core.exec_sedml_docs_in_combine_archive`)
+        max_concurrency (:obj:`int`): maximum number of archives which are executed concurrently. Reading further requests
+            is paused until one of these archives has been executed.
+        config (:obj:`Config`): BioSimulators common configuration
+        simulator_config (:obj:`SimulatorConfig`): MySimulator configuration
+        draining (:obj:`bool`): whether the server has stopped accepting requests
+    """
+
+    def __init__(self, archive_executer, max_concurrency=1, config=None, simulator_config=None):
+        """
+        Args:
+            archive_executer (:obj:`types.FunctionType`): function to execute each archive
+            max_concurrency (:obj:`int`, optional): maximum number of archives which are executed concurrently
+            config (:obj:`Config`, optional): BioSimulators common configuration
+            simulator_config (:obj:`SimulatorConfig`, optional): MySimulator configuration
+        """
+        if max_concurrency < 1:
+            raise ValueError('The maximum concurrency must be at least 1, not {}.'.format(max_concurrency))
+
+        self.archive_executer = archive_executer
+        self.max_concurrency = max_concurrency
+        self.config = config
+        self.simulator_config = simulator_config
+        self.draining = False
+        self._executor = self._create_executor()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def submit(self, request, respond):
+        """ Handle a request
+
+        Args:
+            request (:obj:`dict`): request
+            respond (:obj:`types.FunctionType`): function which sends a response (:obj:`dict`) to the client
+
+        Returns:
+            :obj:`concurrent.futures.Future`: future for the execution of the archive, or :obj:`None` if the request
+                was answered immediately (e.g., because it was invalid)
+        """
+        request_id = request.get('id', None) if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError('Requests must be JSON objects.')
+
+            if request.get('command', None) == SHUTDOWN_COMMAND:
+                self.drain()
+                respond({'id': request_id, 'status': Status.SUCCEEDED.value})
+                return None
+
+            if request.get('command', None) is not None:
+                raise ValueError('`{}` is not a command. The only command is `{}`.'.format(
+                    request['command'], SHUTDOWN_COMMAND))
+
+            if not isinstance(request.get('archive', None), str) or not isinstance(request.get('outDir', None), str):
+                raise ValueError('Requests must have an `archive` and an `outDir`.')
+
+            self._slots.acquire()
+            try:
+                with self._lock:
+                    if self.draining:
+                        raise RuntimeError('The server is shutting down and no longer accepts requests.')
+
+                    args = (self.archive_executer, request['archive'], request['outDir'], self.config,
+                            self.simulator_config)
+                    executor = self._executor
+                    try:
+                        future = executor.submit(_exec_combine_archive, *args)
+                    except concurrent.futures.process.BrokenProcessPool:
+                        self._replace_broken_executor(executor)
+                        executor = self._executor
+                        future = executor.submit(_exec_combine_archive, *args)
+            except Exception:
+                self._slots.release()
+                raise
+
+        except Exception as exception:
+            respond(_get_failure_response(request_id, exception))
+            return None
+
+        future.add_done_callback(lambda future: self._respond(future, executor, request, respond))
+        return future
+
+    def handle_line(self, line, respond):
+        """ Handle a JSON-encoded request
+
+        Args:
+            line (:obj:`str` or :obj:`bytes`): JSON-encoded request
+            respond (:obj:`types.FunctionType`): function which sends a response (:obj:`dict`) to the client
+
+        Returns:
+            :obj:`concurrent.futures.Future`: future for the execution of the archive, or :obj:`None` if the request
+                was answered immediately
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as exception:
+            respond(_get_failure_response(None, exception))
+            return None
+        return self.submit(request, respond)
+
+    def _respond(self, future, executor, request, respond):
+        """ Send the summary of the execution of an archive to the client
+
+        Args:
+            future (:obj:`concurrent.futures.Future`): future for the execution of the archive
+            executor (:obj:`concurrent.futures.ProcessPoolExecutor`): pool of worker processes which executed the archive
+            request (:obj:`dict`): request
+            respond (:obj:`types.FunctionType`): function which sends a response to the client
+        """
+        exception = future.exception()
+
+        # replace the pool before releasing the slot, so that the next archive is executed by the new pool
+        if isinstance(exception, concurrent.futures.process.BrokenProcessPool):
+            with self._lock:
+                self._replace_broken_executor(executor)
+
+        self._slots.release()
+
+        if exception:
+            # the worker process which executed the archive died
+            summary = _get_failure_response(request.get('id', None), exception)
+            summary['archive'] = request['archive']
+        else:
+            summary = future.result()
+            summary['id'] = request.get('id', None)
+        summary['outDir'] = request['outDir']
+        respond(summary)
+
+    def _create_executor(self):
+        """ Create a pool of worker processes
+
+        Returns:
+            :obj:`concurrent.futures.ProcessPoolExecutor`: pool of worker processes
+        """
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.max_concurrency, mp_context=get_worker_context())
+
+    def _replace_broken_executor(self, executor):
+        """ Replace a pool of worker processes which broke because one of its workers died, unless the pool was already
+        replaced or the server is shutting down. The caller must hold the lock of the server.
+
+        Args:
+            executor (:obj:`concurrent.futures.ProcessPoolExecutor`): broken pool of worker processes
+        """
+        if self._executor is executor and not self.draining:
+            self._executor = self._create_executor()
+            executor.shutdown(wait=False)
+
+    def drain(self):
+        """ Stop accepting requests, and wait for the accepted archives to be executed """
+        with self._lock:
+            self.draining = True
+        self._executor.shutdown(wait=True)
+
+    def serve_stream(self, in_stream, out_stream):
+        """ Read requests from a stream and write their responses to another stream until the end of the input stream or
+        a request to stop the server
+
+        Args:
+            in_stream (:obj:`io.TextIOBase`): stream of requests
+            out_stream (:obj:`io.TextIOBase`): stream to write responses to
+        """
+        respond = _build_stream_responder(out_stream)
+        for line in in_stream:
+            if line.strip():
+                self.handle_line(line, respond)
+            if self.draining:
+                break
+        self.drain()
+
+    def serve_stdio(self):
+        """ Read requests from standard input and write their responses to standard output until the end of standard
+        input, a request to stop the server, or ``SIGTERM``
+
+        The standard output of the archives (e.g., the progress of their execution) is redirected to standard error so
+        that it cannot corrupt the responses.
+        """
+        sys.stdout.flush()
+        out_stream = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+        signal.signal(signal.SIGTERM, _raise_termination)
+        try:
+            self.serve_stream(sys.stdin, out_stream)
+        except _Termination:
+            self.drain()
+        finally:
+            out_stream.close()
+
+    def serve_unix_socket(self, path):
+        """ Accept connections via a UNIX socket, and read requests from and write responses to each connection until
+        a request to stop the server or ``SIGTERM``
+
+        Args:
+            path (:obj:`str`): path of the socket
+        """
+        server = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                respond = _build_stream_responder(self.wfile, binary=True)
+                responded = []
+                for line in self.rfile:
+                    if line.strip():
+                        future = server.handle_line(line, respond)
+                        if future:
+                            # callbacks are called in the order in which they were added, after the response was sent
+                            event = threading.Event()
+                            future.add_done_callback(lambda future, event=event: event.set())
+                            responded.append(event)
+                    if server.draining:
+                        threading.Thread(target=socket_server.shutdown).start()
+                        break
+
+                # keep the connection open until the responses to its requests have been sent
+                for event in responded:
+                    event.wait()
+
+        if os.path.exists(path):
+            os.remove(path)
+        socket_server = socketserver.ThreadingUnixStreamServer(path, RequestHandler)
+        socket_server.daemon_threads = False
+        socket_server.block_on_close = True
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=socket_server.shutdown).start())
+        try:
+            with socket_server:
+                socket_server.serve_forever()
+                self.drain()
+        finally:
+            os.remove(path)
+
+
+class _Termination(Exception):
+    """ Exception which interrupts reading requests from standard input when the server receives ``SIGTERM`` """
+    pass
+
+
+def _raise_termination(signum, frame):
+    """ Handle ``SIGTERM`` by interrupting reading requests from standard input
+
+    Args:
+        signum (:obj:`int`): signal number
+        frame (:obj:`types.FrameType`): current stack frame
+
+    Raises:
+        :obj:`_Termination`
+    """
+    raise _Termination()
+
+
+def _get_failure_response(request_id, exception):
+    """ Get a response for a request which failed
+
+    Args:
+        request_id (:obj:`object`): id of the request
+        exception (:obj:`Exception`): reason for the failure
+
+    Returns:
+        :obj:`dict`: response
+    """
+    return {
+        'id': request_id,
+        'status': Status.FAILED.value,
+        'exception': {
+            'type': exception.__class__.__name__,
+            'message': str(exception),
+        },
+    }
+
+
+def _build_stream_responder(stream, binary=False):
+    """ Build a thread-safe function which writes responses to a stream
+
+    Args:
+        stream (:obj:`io.IOBase`): stream
+        binary (:obj:`bool`, optional): whether the stream is a binary stream
+
+    Returns:
+        :obj:`types.FunctionType`: function which writes a response (:obj:`dict`) to the stream
+    """
+    lock = threading.Lock()
+
+    def respond(response):
+        line = json.dumps(response) + '\n'
+        with lock:
+            stream.write(line.encode() if binary else line)
+            stream.flush()
+
+    return respond
@@ -0,0 +1,199 @@
+""" Methods for executing the time courses of tasks which only differ in their output time points with a single simulation
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.sedml.data_model import Task, RepeatedTask, ModelAttributeChange, UniformTimeCourseSimulation
+from biosimulators_utils.sedml.utils import get_variables_for_task, resolve_model_and_apply_xml_changes
+from biosimulators_utils.warnings import warn, BioSimulatorsWarning
+import collections
+import copy
+import numpy
+import os
+
+__all__ = [
+    'get_time_points',
+    'get_shared_time_points',
+    'get_shared_time_course_signature',
+    'plan_shared_time_courses',
+    'exec_shared_time_courses',
+    'exec_unshared_sed_task',
+]
+
+
+def get_time_points(simulation):
+    """ Get the time points which a uniform time course simulation records
+
+    Args:
+        simulation (:obj:`UniformTimeCourseSimulation`): simulation
+
+    Returns:
+        :obj:`numpy.ndarray`: time points
+    """
+    return numpy.linspace(simulation.output_start_time, simulation.output_end_time, simulation.number_of_points + 1)
+
+
+def get_shared_time_points(simulations):
+    """ Get the union of the time points which uniform time course simulations record
+
+    Args:
+        simulations (:obj:`list` of :obj:`UniformTimeCourseSimulation`): simulations
+
+    Returns:
+        :obj:`numpy.ndarray`: sorted, unique time points, which include the time points of each simulation exactly
+    """
+    return numpy.unique(numpy.concatenate([get_time_points(simulation) for simulation in simulations]))
+
+
+def get_shared_time_course_signature(task):
+    """ Get a signature of the model, initial time and algorithm of a task, which is shared by the tasks whose time courses
+    can be executed with a single simulation
+
+    Args:
+        task (:obj:`AbstractTask`): task
+
+    Returns:
+        :obj:`tuple`: signature, or :obj:`None` if the task isn't a uniform time course of a model whose changes are
+            model attribute changes
+    """
+    if (
+        not isinstance(task, Task)
+        or not isinstance(task.simulation, UniformTimeCourseSimulation)
+        or any(not isinstance(change, ModelAttributeChange) for change in task.model.changes)
+    ):
+        return None
+
+    sim = task.simulation
+    return (
+        task.model.id,
+        sim.initial_time,
+        sim.algorithm.kisao_id,
+        tuple((change.kisao_id, change.new_value) for change in sim.algorithm.changes),
+    )
+
+
+def plan_shared_time_courses(doc):
+    """ Group the tasks of a SED document which record variables and which are time courses of the same model, from the
+    same initial time and with the same algorithm, and which only differ in their output start times, output end times
+    and numbers of time points
+
+    Tasks which are also sub-tasks of repeated tasks are excluded because their executions as sub-tasks apply the changes
+    of the iterations of the repeated tasks.
+
+    Args:
+        doc (:obj:`SedDocument`): SED document
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`Task`: groups of at least two tasks, in the order of the tasks in the document
+    """
+    sub_task_ids = set()
+    repeated_tasks = [task for task in doc.tasks if isinstance(task, RepeatedTask)]
+    while repeated_tasks:
+        repeated_task = repeated_tasks.pop()
+        for sub_task in repeated_task.sub_tasks:
+            sub_task_ids.add(sub_task.task.id)
+            if isinstance(sub_task.task, RepeatedTask):
+                repeated_tasks.append(sub_task.task)
+
+    groups = collections.OrderedDict()
+    for task in doc.tasks:
+        signature = get_shared_time_course_signature(task)
+        if signature is not None and task.id not in sub_task_ids and get_variables_for_task(doc, task):
+            groups.setdefault(signature, []).append(task)
+
+    return [tasks for tasks in groups.values() if len(tasks) > 1]
+
+
+def exec_shared_time_courses(group_executer, doc, working_dir, config=None):
+    """ Execute each group of tasks of a SED document planned by :obj:`plan_shared_time_courses` with a single simulation
+
+    Groups which the group executer can't execute are skipped, so that their tasks are executed individually. Groups
+    whose tasks are invalid or unsupported (the execution of the group raises :obj:`ValueError` or
+    :obj:`NotImplementedError`) are also skipped, with a warning, so that their tasks report their errors
+    individually; their errors are returned, to be recorded in the logs of the tasks with
+    :obj:`exec_unshared_sed_task`. Other errors are raised.
+
+    Args:
+        group_executer (:obj:`types.FunctionType`): function to execute a group of tasks, which receives the tasks, the
+            variables of each task and :obj:`config`, and returns a dictionary that maps the id of each task to its
+            :obj:`TaskResult`, or :obj:`None` if the tasks can't be executed together
+        doc (:obj:`SedDocument`): SED document
+        working_dir (:obj:`str`): working directory of the SED document (path relative to which models are located)
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`dict` of :obj:`str` to :obj:`TaskResult`: dictionary that maps the id of each executed task to its
+              result
+            * :obj:`dict` of :obj:`str` to :obj:`dict`: dictionary that maps the id of each task of the groups whose
+              execution failed to the ids of the tasks of its group and the error of the execution
+    """
+    task_results = {}
+    unshared_tasks = {}
+
+    for tasks in plan_shared_time_courses(doc):
+        temp_model_source = None
+        try:
+            model, temp_model_source, _, _ = resolve_model_and_apply_xml_changes(tasks[0].model, doc, working_dir,
+                                                                                 apply_xml_model_changes=False)
+            resolved_tasks = []
+            for task in tasks:
+                resolved_task = copy.copy(task)
+                resolved_task.model = model
+                resolved_tasks.append(resolved_task)
+
+            group_results = group_executer(resolved_tasks, [get_variables_for_task(doc, task) for task in tasks],
+                                           config=config)
+        except (ValueError, NotImplementedError) as exception:
+            group_results = None
+
+            task_ids = [task.id for task in tasks]
+            warn('The time courses of tasks {} could not be executed with a single simulation, and are executed '
+                 'individually:\n  {}'.format(
+                     ', '.join('`{}`'.format(task_id) for task_id in task_ids), str(exception).replace('\n', '\n  ')),
+                 BioSimulatorsWarning)
+            for task_id in task_ids:
+                unshared_tasks[task_id] = {
+                    'tasks': task_ids,
+                    'exception': '{}: {}'.format(exception.__class__.__name__, exception),
+                }
+        finally:
+            if temp_model_source:
+                os.remove(temp_model_source)
+
+        if group_results:
+            task_results.update(group_results)
+
+    return task_results, unshared_tasks
+
+
+def exec_unshared_sed_task(unshared_tasks, task_executer, task, variables, preprocessed_task=None, log=None, config=None):
+    """ Execute a task, and record in its log (``sharedTimeCourse`` of :obj:`TaskLog.simulator_details`) why its time
+    course couldn't be executed with those of the other tasks of its group by :obj:`exec_shared_time_courses`
+
+    Args:
+        unshared_tasks (:obj:`dict` of :obj:`str` to :obj:`dict`): dictionary that maps the id of each task of the groups
+            whose execution failed to the ids of the tasks of its group and the error of the execution
+        task_executer (:obj:`types.FunctionType`): function to execute the task
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        preprocessed_task (:obj:`PreprocessedTask`, optional): preprocessed information about the task
+        log (:obj:`TaskLog`, optional): log for the task
+        config (:obj:`Config`, optional): BioSimulators common configuration
+
+    Returns:
+        :obj:`tuple`:
+
+            :obj:`VariableResults`: results of variables
+            :obj:`TaskLog`: log
+    """
+    try:
+        return task_executer(task, variables, preprocessed_task=preprocessed_task, log=log, config=config)
+    finally:
+        if log is not None and task.id in unshared_tasks:
+            log.simulator_details = dict(log.simulator_details or {})
+            log.simulator_details['sharedTimeCourse'] = unshared_tasks[task.id]
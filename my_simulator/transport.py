@@ -0,0 +1,172 @@
+""" Methods for transferring the results of tasks from worker processes to the parent process through memory-mapped files,
+rather than pickling them
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from .mapped import MappedVariableResults
+from biosimulators_utils.report.data_model import VariableResults
+import mmap
+import numpy
+import os
+import shutil
+import tempfile
+
+__all__ = [
+    'get_shared_memory_dir',
+    'SharedVariableResults',
+    'ResultsTransport',
+    'open_variable_results',
+]
+
+ALIGNMENT = 64
+# :obj:`int`: alignment (bytes) of the arrays within the files of shared results
+
+
+def get_shared_memory_dir():
+    """ Get a directory for the files of shared results, preferring a directory which is backed by memory (``/dev/shm``)
+
+    Returns:
+        :obj:`str`: directory, or :obj:`None` to use the default temporary directory
+    """
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+
+class SharedVariableResults(object):
+    """ Handle to the results of the variables of a task which were written to a file by a worker process. The handle is
+    small, so it is cheap to pickle back to the parent process, which maps the file into its memory.
+
+    Attributes:
+        filename (:obj:`str`): path to the file
+        size (:obj:`int`): size of the file (bytes)
+        layout (:obj:`list` of :obj:`tuple`): id, data type, shape and offset of the array of each variable
+    """
+
+    def __init__(self, filename, size, layout):
+        """
+        Args:
+            filename (:obj:`str`): path to the file
+            size (:obj:`int`): size of the file (bytes)
+            layout (:obj:`list` of :obj:`tuple`): id, data type, shape and offset of the array of each variable
+        """
+        self.filename = filename
+        self.size = size
+        self.layout = layout
+
+    def open(self):
+        """ Map the file into memory and get views of the results of the variables, without copying them. The file is
+        mapped copy-on-write, so modifications of the views are private to the process. The memory is held until all of
+        the views have been garbage collected, even if the file is removed.
+
+        Returns:
+            :obj:`VariableResults`: results of the variables
+        """
+        with open(self.filename, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), self.size, access=mmap.ACCESS_COPY)
+
+        variable_results = VariableResults()
+        for variable_id, dtype, shape, offset in self.layout:
+            dtype = numpy.dtype(dtype)
+            count = int(numpy.prod(shape, dtype=numpy.int64))
+            variable_results[variable_id] = numpy.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+        return variable_results
+
+
+class ResultsTransport(object):
+    """ Transfers the results of tasks from worker processes to the parent process through memory-mapped files
+
+    The parent process creates the transport, passes it to its workers, and releases it once the results of the tasks
+    are no longer needed (e.g., once the reports of a SED document have been written). Releasing the transport removes
+    all of its files, including the files of results that were never opened.
+
+    Attributes:
+        dirname (:obj:`str`): directory for the files of the results
+        min_size (:obj:`int`): minimum total size (bytes) of the results of a task for them to be shared through a file;
+            smaller results are pickled
+    """
+
+    def __init__(self, min_size, dir=None):
+        """
+        Args:
+            min_size (:obj:`int`): minimum total size (bytes) of the results of a task for them to be shared through a file
+            dir (:obj:`str`, optional): parent directory for the directory of the files; :obj:`None` means
+                :obj:`get_shared_memory_dir`
+        """
+        self.dirname = tempfile.mkdtemp(prefix='my-simulator-results-', dir=dir or get_shared_memory_dir())
+        self.min_size = min_size
+
+    def share(self, variable_results):
+        """ Write the results of the variables of a task to a file, if they are large enough and are numeric arrays
+
+        Args:
+            variable_results (:obj:`VariableResults`): results of the variables
+
+        Returns:
+            :obj:`SharedVariableResults` or :obj:`VariableResults`: handle to the shared results, or the results if
+                they were not shared (including if the file could not be written, e.g., because the shared memory of the
+                container is full)
+        """
+        # results which are already backed by a file are pickled as the path to their file
+        if isinstance(variable_results, MappedVariableResults):
+            return variable_results
+
+        arrays = [(variable_id, numpy.asarray(result)) for variable_id, result in variable_results.items()]
+        if any(array.dtype.hasobject for _, array in arrays):
+            return variable_results
+
+        layout = []
+        size = 0
+        for variable_id, array in arrays:
+            layout.append((variable_id, array.dtype.str, array.shape, size))
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        if size == 0 or size < self.min_size:
+            return variable_results
+
+        # ``/dev/shm`` is small by default in Docker containers (64 MB), so fall back to pickling the results if they
+        # can't be written
+        try:
+            fid, filename = tempfile.mkstemp(suffix='.bin', dir=self.dirname)
+            try:
+                with os.fdopen(fid, 'wb') as file:
+                    for (variable_id, array), (_, _, _, offset) in zip(arrays, layout):
+                        file.seek(offset)
+                        file.write(numpy.ascontiguousarray(array).reshape(-1).view(numpy.uint8).data)
+                    file.truncate(size)
+            except Exception:
+                os.remove(filename)
+                raise
+        except OSError:
+            return variable_results
+
+        return SharedVariableResults(filename, size, layout)
+
+    def release(self):
+        """ Remove the files of the results. Views of results which are still referenced remain valid; their memory is
+        released once they are garbage collected.
+        """
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.release()
+
+
+def open_variable_results(variable_results):
+    """ Get the results of the variables of a task which may have been shared through a file
+
+    Args:
+        variable_results (:obj:`SharedVariableResults` or :obj:`VariableResults`): shared or unshared results
+
+    Returns:
+        :obj:`VariableResults`: results of the variables
+    """
+    if isinstance(variable_results, SharedVariableResults):
+        return variable_results.open()
+    return variable_results
@@ -0,0 +1,392 @@
+""" Utilities for executing SED tasks with MySimulator
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from ._version import __version__
+from biosimulators_utils._version import __version__ as biosimulators_utils_version
+from biosimulators_utils.report.data_model import VariableResults
+from biosimulators_utils.sedml.data_model import Symbol
+import collections
+import contextlib
+import hashlib
+import my_simulator
+import numpy
+import re
+try:
+    import resource
+except ModuleNotFoundError:  # pragma: no cover: unavailable on Windows
+    resource = None
+import sys
+import time
+
+__all__ = [
+    'get_simulator_version',
+    'get_file_digest',
+    'get_sed_task_digest',
+    'get_sed_task_results_digest',
+    'get_checkpoint_digest',
+    'get_variable_result_ids',
+    'get_model_attribute_change_target',
+    'get_variable_results_from_matrix',
+    'get_variable_results_from_chunks',
+    'PhaseTimer',
+]
+
+TIME_RESULT_ID = 'time'
+# :obj:`str`: id of the time points in the results of simulations
+
+MODEL_ATTRIBUTE_TARGET_PATTERN = re.compile(r'^(.+)/@(?:[^/:@\[\]]+:)?([^/:@\[\]]+)$')
+# :obj:`re.Pattern`: pattern for the targets of changes to the attributes of model elements (e.g.,
+# ``/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']/@value``), which matches the XPath of the element
+# and the local name of the attribute
+
+
+def get_simulator_version():
+    """ Get the version of MySimulator
+
+    Returns:
+        :obj:`str`: version
+    """
+    return my_simulator.__version__
+
+
+def get_file_digest(filename, chunk_size=1024 * 1024):
+    """ Get a digest of the content of a file
+
+    Args:
+        filename (:obj:`str`): path to the file
+        chunk_size (:obj:`int`, optional): number of bytes to read at a time
+
+    Returns:
+        :obj:`str`: SHA-256 digest of the content of the file
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_sed_task_digest(task, variables):
+    """ Get a digest of a SED task, the changes to its model, its simulation and the variables that it records
+
+    The digest does not depend on the location of the model (e.g., the temporary directory to which a COMBINE/OMEX
+    archive was extracted), but does depend on the versions of BioSimulators utils and of this package.
+
+    Args:
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+
+    Returns:
+        :obj:`str`: SHA-256 digest
+    """
+    model = task.model
+    sim = task.simulation
+    value = (
+        __version__,
+        biosimulators_utils_version,
+        task.__class__.__name__,
+        task.to_tuple(),
+        model.__class__.__name__ if model else None,
+        # changes are hashed in the order in which they are applied, because later changes can override earlier ones
+        (model.id, model.language,
+         tuple((change.__class__.__name__, repr(change.to_tuple())) for change in model.changes)) if model else None,
+        sim.__class__.__name__ if sim else None,
+        sim.to_tuple() if sim else None,
+        # variables are hashed in a canonical order, because their results are identified by their ids, and
+        # :obj:`biosimulators_utils.sedml.utils.get_variables_for_task` doesn't return them in a stable order
+        tuple(sorted(repr(variable.to_tuple()) for variable in variables)),
+    )
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+
+def get_sed_task_results_digest(task, variables, model_digest, options=()):
+    """ Get a digest of the inputs which determine the results of a SED task: the task, the changes to its model, its
+    simulation and algorithm, its variables, the content of its model, the version of the simulator and any options
+    which affect the results
+
+    Args:
+        task (:obj:`Task`): task
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        model_digest (:obj:`str`): digest of the content of the model from :obj:`get_file_digest`
+        options (:obj:`tuple`, optional): values of options which affect the results
+
+    Returns:
+        :obj:`str`: SHA-256 digest
+    """
+    value = (get_sed_task_digest(task, variables), model_digest, get_simulator_version(), tuple(options))
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+
+def get_checkpoint_digest(model_digest, changes, algorithm, algorithm_args, initial_time, output_start_time):
+    """ Get a digest of the inputs which determine the state of a simulation at its output start time: the content of its
+    model, the changes to its model, its algorithm and the arguments of the algorithm, its initial time and its output
+    start time
+
+    Args:
+        model_digest (:obj:`str`): digest of the content of the model from :obj:`get_file_digest`
+        changes (:obj:`list` of :obj:`ModelChange`): changes to the model
+        algorithm (:obj:`str`): KiSAO id of the algorithm
+        algorithm_args (:obj:`dict`): arguments of the simulation method for the parameters of the algorithm
+        initial_time (:obj:`float`): initial time
+        output_start_time (:obj:`float`): output start time
+
+    Returns:
+        :obj:`str`: SHA-256 digest
+    """
+    value = (
+        get_simulator_version(),
+        model_digest,
+        tuple(repr(change.to_tuple()) for change in changes),
+        algorithm,
+        tuple(sorted((name, repr(value)) for name, value in algorithm_args.items())),
+        float(initial_time),
+        float(output_start_time),
+    )
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+
+def get_variable_result_ids(variables, target_x_paths_ids):
+    """ Get the id of the result of the simulation which corresponds to each variable
+
+    Args:
+        variables (:obj:`list` of :obj:`Variable`): variables that should be recorded
+        target_x_paths_ids (:obj:`dict`): dictionary that maps the target of each variable to the id of the
+            corresponding model element
+
+    Returns:
+        :obj:`list` of :obj:`str`: id of the result for each variable
+
+    Raises:
+        :obj:`NotImplementedError`: if a variable has a symbol other than time
+    """
+    result_ids = []
+    unsupported_symbols = []
+    for variable in variables:
+        if variable.symbol:
+            if variable.symbol == Symbol.time.value:
+                result_ids.append(TIME_RESULT_ID)
+            else:
+                unsupported_symbols.append(variable)
+        else:
+            result_ids.append(target_x_paths_ids[variable.target])
+
+    if unsupported_symbols:
+        raise NotImplementedError('The following variables have symbols which are not supported:\n  {}'.format(
+            '\n  '.join('{}: {}'.format(variable.id, variable.symbol) for variable in unsupported_symbols)))
+
+    return result_ids
+
+
+def get_model_attribute_change_target(change):
+    """ Get the XPath of the model element whose attribute is changed by a model attribute change and the name of the
+    attribute
+
+    Args:
+        change (:obj:`ModelAttributeChange`): model attribute change
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: XPath of the model element
+            * :obj:`str`: local name of the attribute
+
+    Raises:
+        :obj:`NotImplementedError`: if the target of the change is not an attribute of a model element
+    """
+    match = MODEL_ATTRIBUTE_TARGET_PATTERN.match(change.target or '')
+    if not match:
+        raise NotImplementedError('The target `{}` of the change is not supported. Changes must target attributes of '
+                                  'model elements (e.g., `.../sbml:parameter[@id=\'k1\']/@value`).'.format(change.target))
+    return match.group(1), match.group(2)
+
+
+def get_variable_results_from_matrix(variables, variable_result_ids, result_ids, result_matrix):
+    """ Get the results of variables from the matrix of results of a simulation
+
+    The results of all of the variables are extracted with a single indexing operation. When the results of the
+    variables are stored in consecutive rows of :obj:`result_matrix`, the results of the variables are views of
+    :obj:`result_matrix` rather than copies.
+
+    Args:
+        variables (:obj:`list` of :obj:`Variable`): variables
+        variable_result_ids (:obj:`list` of :obj:`str`): id of the result for each variable
+            (e.g., from :obj:`get_variable_result_ids`)
+        result_ids (:obj:`list` of :obj:`str`): id of each row of :obj:`result_matrix`
+        result_matrix (:obj:`numpy.ndarray`): matrix of results with one row for each id and one column for each time point
+
+    Returns:
+        :obj:`VariableResults`: results of the variables
+
+    Raises:
+        :obj:`ValueError`: if the simulation did not record some of the variables
+    """
+    variable_rows = _get_variable_rows(variables, variable_result_ids, result_ids)
+    if variable_rows.size and numpy.array_equal(variable_rows, numpy.arange(variable_rows[0], variable_rows[0] + variable_rows.size)):
+        variable_values = result_matrix[variable_rows[0]:variable_rows[0] + variable_rows.size]
+    else:
+        variable_values = result_matrix[variable_rows]
+
+    return VariableResults((variable.id, values) for variable, values in zip(variables, variable_values))
+
+
+def get_variable_results_from_chunks(variables, variable_result_ids, chunks, number_of_points, allocate=None):
+    """ Get the results of variables from a sequence of chunks of the results of a simulation
+
+    The results of the variables are copied from each chunk into a single preallocated matrix, so that the memory
+    required is bounded by the size of the results of the variables plus the size of one chunk, rather than by the
+    size of the results of all of the elements of the model.
+
+    Args:
+        variables (:obj:`list` of :obj:`Variable`): variables
+        variable_result_ids (:obj:`list` of :obj:`str`): id of the result for each variable
+            (e.g., from :obj:`get_variable_result_ids`)
+        chunks (:obj:`iterator` of :obj:`tuple`): iterator over chunks of results. Each chunk is a tuple of the id of each
+            row of the chunk and a matrix with one row for each id and one column for each time point of the chunk.
+        number_of_points (:obj:`int`): total number of time points
+        allocate (:obj:`types.FunctionType`, optional): function which allocates the matrix of the results of the
+            variables given its shape and data type (e.g., :obj:`my_simulator.mapped.create_mapped_results`);
+            :obj:`None` means :obj:`numpy.empty`
+
+    Returns:
+        :obj:`VariableResults`: results of the variables
+
+    Raises:
+        :obj:`ValueError`: if the simulation did not record some of the variables or did not record the expected number
+            of time points
+    """
+    variable_values = None
+    variable_rows = None
+    chunk_result_ids = None
+    i_point = 0
+    for result_ids, chunk in chunks:
+        if variable_rows is None or result_ids is not chunk_result_ids:
+            variable_rows = _get_variable_rows(variables, variable_result_ids, result_ids)
+            chunk_result_ids = result_ids
+
+        if variable_values is None:
+            variable_values = (allocate or numpy.empty)((len(variables), number_of_points), chunk.dtype)
+
+        num_chunk_points = chunk.shape[1]
+        if i_point + num_chunk_points > number_of_points:
+            raise ValueError('The simulation recorded more than the expected {} time points.'.format(number_of_points))
+
+        variable_values[:, i_point:i_point + num_chunk_points] = chunk[variable_rows]
+        i_point += num_chunk_points
+
+    if i_point != number_of_points:
+        raise ValueError('The simulation recorded {} time points rather than the expected {} time points.'.format(
+            i_point, number_of_points))
+
+    return VariableResults((variable.id, values) for variable, values in zip(variables, variable_values))
+
+
+def _get_variable_rows(variables, variable_result_ids, result_ids):
+    """ Get the row of a matrix of results which corresponds to each variable
+
+    Args:
+        variables (:obj:`list` of :obj:`Variable`): variables
+        variable_result_ids (:obj:`list` of :obj:`str`): id of the result for each variable
+        result_ids (:obj:`list` of :obj:`str`): id of each row of the matrix
+
+    Returns:
+        :obj:`numpy.ndarray`: index of the row for each variable
+
+    Raises:
+        :obj:`ValueError`: if the matrix does not contain a row for some of the variables
+    """
+    row_indices = {result_id: i_row for i_row, result_id in enumerate(result_ids)}
+
+    missing_variables = [variable.id for variable, result_id in zip(variables, variable_result_ids) if result_id not in row_indices]
+    if missing_variables:
+        raise ValueError('The following variables could not be recorded:\n  {}'.format('\n  '.join(sorted(missing_variables))))
+
+    return numpy.array([row_indices[result_id] for result_id in variable_result_ids], dtype=numpy.intp)
+
+
+class PhaseTimer(object):
+    """ Records the duration, and optionally the increase in the peak memory of the process, of each phase of the
+    execution of a task
+
+    When the timer is disabled, :obj:`phase` returns a shared no-op context manager so that instrumented code has
+    negligible overhead.
+
+    Attributes:
+        enabled (:obj:`bool`): whether to record phases
+        measure_memory (:obj:`bool`): whether to record the increase in the peak resident set size of the process
+            during each phase
+        timings (:obj:`collections.OrderedDict`): dictionary that maps the name of each phase to its duration (seconds)
+        memory (:obj:`collections.OrderedDict`): dictionary that maps the name of each phase to the increase in the peak
+            resident set size of the process (KiB) during the phase
+    """
+
+    _NULL_PHASE = contextlib.nullcontext()
+
+    def __init__(self, enabled=True, measure_memory=False):
+        """
+        Args:
+            enabled (:obj:`bool`, optional): whether to record phases
+            measure_memory (:obj:`bool`, optional): whether to record the increase in the peak resident set size of the
+                process during each phase
+        """
+        self.enabled = enabled
+        self.measure_memory = measure_memory and resource is not None
+        self.timings = collections.OrderedDict()
+        self.memory = collections.OrderedDict()
+
+    def phase(self, name):
+        """ Get a context manager which records a phase
+
+        Args:
+            name (:obj:`str`): name of the phase
+
+        Returns:
+            :obj:`contextlib.AbstractContextManager`: context manager
+        """
+        if not self.enabled:
+            return self._NULL_PHASE
+        return self._record_phase(name)
+
+    @contextlib.contextmanager
+    def _record_phase(self, name):
+        """ Record the duration and memory increase of a phase
+
+        Args:
+            name (:obj:`str`): name of the phase
+        """
+        if self.measure_memory:
+            start_peak_memory = _get_peak_memory()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.) + time.perf_counter() - start_time
+            if self.measure_memory:
+                self.memory[name] = self.memory.get(name, 0) + _get_peak_memory() - start_peak_memory
+
+    def update(self, other):
+        """ Add the phases recorded by another timer
+
+        Args:
+            other (:obj:`PhaseTimer`): timer
+        """
+        for name, duration in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.) + duration
+        for name, memory in other.memory.items():
+            self.memory[name] = self.memory.get(name, 0) + memory
+
+
+def _get_peak_memory():
+    """ Get the peak resident set size of the process
+
+    Returns:
+        :obj:`int`: peak resident set size (KiB)
+    """
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_memory //= 1024
+    return peak_memory
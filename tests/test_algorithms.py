@@ -0,0 +1,81 @@
+""" Tests of the tables of algorithms
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.data_model import ValueType
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from kisao.data_model import AlgorithmSubstitutionPolicy
+from kisao.exceptions import AlgorithmCannotBeSubstitutedException
+from my_simulator.algorithms import AlgorithmTable, get_parameter_value_parser
+from unittest import mock
+import collections
+import unittest
+
+
+class AlgorithmTableTestCase(unittest.TestCase):
+    METHOD_MAP = collections.OrderedDict([
+        ('KISAO_0000019', {
+            'name': 'CVODE',
+            'method': None,
+            'parameters': {
+                'KISAO_0000209': {'name': 'relative tolerance', 'arg': 'rtol', 'type': ValueType.float, 'default': 1e-6},
+                'KISAO_0000415': {'name': 'maximum number of steps', 'arg': 'max_steps', 'type': ValueType.integer,
+                                  'default': 500},
+                'KISAO_0000671': {'name': 'stiff', 'arg': 'stiff', 'type': ValueType.boolean, 'default': False},
+            },
+        }),
+    ])
+
+    def test_get_algorithm(self):
+        table = AlgorithmTable(self.METHOD_MAP)
+
+        with mock.patch('my_simulator.algorithms.get_preferred_substitute_algorithm_by_ids',
+                        side_effect=Exception('ontology should not be traversed')):
+            for policy in AlgorithmSubstitutionPolicy:
+                self.assertEqual(table.get_algorithm('KISAO_0000019', policy), 'KISAO_0000019')
+
+        self.assertEqual(table.get_algorithm('KISAO_0000088', AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES),
+                         'KISAO_0000019')
+        with mock.patch('my_simulator.algorithms.get_preferred_substitute_algorithm_by_ids',
+                        side_effect=Exception('substitution should be reused')):
+            self.assertEqual(table.get_algorithm('KISAO_0000088', AlgorithmSubstitutionPolicy.SIMILAR_VARIABLES),
+                             'KISAO_0000019')
+
+        with self.assertRaises(AlgorithmCannotBeSubstitutedException):
+            table.get_algorithm('KISAO_0000088', AlgorithmSubstitutionPolicy.NONE)
+
+    def test_parse_parameter_changes(self):
+        table = AlgorithmTable(self.METHOD_MAP)
+        changes = [
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000209', new_value='1e-8'),
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000415', new_value='1000'),
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000671', new_value='True'),
+        ]
+        self.assertEqual(table.parse_parameter_changes('KISAO_0000019', changes),
+                         {'rtol': 1e-8, 'max_steps': 1000, 'stiff': True})
+
+        changes = [sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000211', new_value='1e-8')]
+        with self.assertRaisesRegex(NotImplementedError, 'KISAO_0000209: relative tolerance'):
+            table.parse_parameter_changes('KISAO_0000019', changes)
+
+    def test_clear(self):
+        method_map = collections.OrderedDict(self.METHOD_MAP)
+        table = AlgorithmTable(method_map)
+
+        method_map['KISAO_0000088'] = {'name': 'LSODA', 'method': None, 'parameters': {}}
+        table.clear()
+        self.assertEqual(table.get_algorithm('KISAO_0000088', AlgorithmSubstitutionPolicy.NONE), 'KISAO_0000088')
+        self.assertEqual(table.parse_parameter_changes('KISAO_0000088', []), {})
+
+    def test_get_parameter_value_parser(self):
+        self.assertEqual(get_parameter_value_parser(ValueType.float)('2.5'), 2.5)
+        self.assertEqual(get_parameter_value_parser(ValueType.integer)('3'), 3)
+        self.assertEqual(get_parameter_value_parser(ValueType.boolean)('1'), True)
+        self.assertEqual(get_parameter_value_parser(ValueType.boolean)('false'), False)
+        self.assertEqual(get_parameter_value_parser(ValueType.string)('abc'), 'abc')
+        self.assertEqual(get_parameter_value_parser(ValueType.list)('[1, 2]'), [1, 2])
+        self.assertEqual(get_parameter_value_parser(ValueType.kisao_id)('KISAO_0000019').id, 'KISAO_0000019')
@@ -0,0 +1,109 @@
+""" Tests of the selective extraction of COMBINE/OMEX archives
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.combine import exec as combine_exec
+from biosimulators_utils.combine import io as combine_io
+from biosimulators_utils.combine.io import CombineArchiveReader
+from biosimulators_utils.combine.validation import validate
+from my_simulator.archive import (get_archive_entries, extract_archive_entries, get_sed_doc_dependencies,
+                                  SelectiveCombineArchiveReader, SelectiveZipFile, selective_archive_extraction)
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+
+class ArchiveTestCase(unittest.TestCase):
+    EXAMPLE_ARCHIVE_FILENAME = os.path.join(os.path.dirname(__file__), 'fixtures', 'BIOMD0000000297.omex')
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.out_dir = os.path.join(self.dirname, 'out')
+
+        # mark the first SED-ML file as the master file and add a large figure which isn't needed to execute the archive
+        self.archive_filename = os.path.join(self.dirname, 'archive.omex')
+        self.data = os.urandom(256 * 1024)
+        with zipfile.ZipFile(self.EXAMPLE_ARCHIVE_FILENAME, 'r') as in_archive:
+            with zipfile.ZipFile(self.archive_filename, 'w', zipfile.ZIP_DEFLATED) as out_archive:
+                for info in in_archive.infolist():
+                    data = in_archive.read(info)
+                    if info.filename == 'manifest.xml':
+                        data = data.decode().replace(
+                            '<content location="./ex1/BIOMD0000000297.sedml" format="http://identifiers.org/combine.specifications/sed-ml" master="false"/>',
+                            '<content location="./ex1/BIOMD0000000297.sedml" format="http://identifiers.org/combine.specifications/sed-ml" master="true"/>\n'
+                            '  <content location="./figures/figure.png" format="http://purl.org/NET/mediatypes/image/png"/>',
+                        ).encode()
+                    out_archive.writestr(info, data)
+                out_archive.writestr('figures/figure.png', self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def get_extracted_locations(self):
+        return sorted(
+            os.path.relpath(os.path.join(dirname, filename), self.out_dir)
+            for dirname, _, filenames in os.walk(self.out_dir)
+            for filename in filenames
+        )
+
+    def test_extract_archive_entries(self):
+        with zipfile.ZipFile(self.archive_filename, 'r') as zip_archive:
+            entries = get_archive_entries(zip_archive)
+            self.assertIn(os.path.join('figures', 'figure.png'), entries)
+
+            # decompress into memory and stream to disk
+            for in_memory_max_size in [1024 * 1024, 0]:
+                shutil.rmtree(self.out_dir, ignore_errors=True)
+                extract_archive_entries(zip_archive, entries,
+                                        [os.path.join('figures', 'figure.png'), 'manifest.xml', 'missing.xml'],
+                                        self.out_dir, in_memory_max_size=in_memory_max_size)
+                self.assertEqual(self.get_extracted_locations(), [os.path.join('figures', 'figure.png'), 'manifest.xml'])
+                with open(os.path.join(self.out_dir, 'figures', 'figure.png'), 'rb') as file:
+                    self.assertEqual(file.read(), self.data)
+
+    def test_get_sed_doc_dependencies(self):
+        with zipfile.ZipFile(self.archive_filename, 'r') as zip_archive:
+            zip_archive.extractall(self.out_dir)
+
+        self.assertEqual(
+            get_sed_doc_dependencies(os.path.join(self.out_dir, 'ex1', 'BIOMD0000000297.sedml'), 'ex1/BIOMD0000000297.sedml'),
+            [os.path.join('ex1', 'BIOMD0000000297.xml')])
+
+    def test_read_selectively(self):
+        with selective_archive_extraction():
+            self.assertIs(combine_exec.CombineArchiveReader, SelectiveCombineArchiveReader)
+            self.assertIs(combine_io.Zip, SelectiveZipFile)
+            archive = SelectiveCombineArchiveReader().run(self.archive_filename, self.out_dir)
+        self.assertIs(combine_exec.CombineArchiveReader, CombineArchiveReader)
+        self.assertIs(combine_io.Zip, zipfile.ZipFile)
+
+        self.assertEqual(self.get_extracted_locations(), sorted([
+            os.path.join('ex1', 'BIOMD0000000297.sedml'),
+            os.path.join('ex1', 'BIOMD0000000297.xml'),
+            os.path.join('ex2', 'BIOMD0000000297.xml'),
+            'manifest.xml',
+            'metadata.rdf',
+            'metadata_1.rdf',
+            'metadata_2.rdf',
+            'metadata_3.rdf',
+            'metadata_4.rdf',
+        ]))
+        self.assertEqual(sorted(os.path.relpath(content.location, '.') for content in archive.contents
+                                if not content.location.startswith('metadata')),
+                         [os.path.join('ex1', 'BIOMD0000000297.sedml'), os.path.join('ex1', 'BIOMD0000000297.xml'),
+                          os.path.join('ex2', 'BIOMD0000000297.xml')])
+
+        errors, _ = validate(archive, self.out_dir)
+        self.assertEqual(errors, [])
+
+    def test_read_outside_of_context(self):
+        archive = SelectiveCombineArchiveReader().run(self.archive_filename, self.out_dir)
+        self.assertIn(os.path.join('figures', 'figure.png'), self.get_extracted_locations())
+        self.assertIn(os.path.join('ex2', 'BIOMD0000000297.xml'), self.get_extracted_locations())
+        self.assertEqual(len(archive.contents), 10)
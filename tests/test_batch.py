@@ -0,0 +1,59 @@
+""" Tests of the execution of batches of COMBINE/OMEX archives
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.log.data_model import CombineArchiveLog
+from my_simulator.batch import get_combine_archive_filenames, get_batch_out_dirs, exec_combine_archives
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+
+def exec_archive(archive_filename, out_dir, config=None, simulator_config=None):
+    if 'invalid' in archive_filename:
+        raise ValueError('Archive is invalid')
+    os.makedirs(out_dir)
+    return None, CombineArchiveLog()
+
+
+class BatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.in_dir = os.path.join(self.dirname, 'in')
+        os.makedirs(os.path.join(self.in_dir, 'sub'))
+        for rel_path in ['a.omex', 'invalid.omex', os.path.join('sub', 'a.omex'), 'README.md']:
+            with open(os.path.join(self.in_dir, rel_path), 'w'):
+                pass
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_get_combine_archive_filenames(self):
+        archives = get_combine_archive_filenames([self.in_dir, os.path.join(self.in_dir, 'a.omex')])
+        self.assertEqual([rel_path for _, rel_path in archives],
+                         ['a.omex', 'invalid.omex', os.path.join('sub', 'a.omex'), 'a.omex'])
+
+        self.assertEqual(get_batch_out_dirs(archives), ['a', 'invalid', os.path.join('sub', 'a'), 'a_2'])
+
+        with self.assertRaises(FileNotFoundError):
+            get_combine_archive_filenames([os.path.join(self.dirname, 'missing.omex')])
+
+    def test_exec_combine_archives(self):
+        out_dir = os.path.join(self.dirname, 'out')
+        for num_workers in [1, 2]:
+            summary = exec_combine_archives(exec_archive, [self.in_dir], out_dir, num_workers=num_workers)
+            self.assertEqual(summary['status'], 'FAILED')
+            self.assertEqual([archive['status'] for archive in summary['archives']], ['SUCCEEDED', 'FAILED', 'SUCCEEDED'])
+            self.assertEqual(summary['archives'][1]['exception'], {'type': 'ValueError', 'message': 'Archive is invalid'})
+            self.assertTrue(os.path.isdir(os.path.join(out_dir, 'sub', 'a')))
+
+            with open(os.path.join(out_dir, 'batch.json'), 'r') as file:
+                self.assertEqual(json.load(file), summary)
+
+            shutil.rmtree(out_dir)
@@ -0,0 +1,247 @@
+""" Tests of the caches
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from my_simulator.cache import LruCache, ModelCache, XPathCache, ValidationCache, ResultStore, CheckpointCache, get_cache_stats
+from unittest import mock
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class LruCacheTestCase(unittest.TestCase):
+    def test_get_set(self):
+        cache = LruCache(max_size=3)
+        self.assertEqual(cache.get('a'), None)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get_stats(), {'entries': 2, 'size': 2, 'hits': 1, 'misses': 1})
+
+    def test_eviction(self):
+        cache = LruCache(max_size=3)
+        cache.set('a', 1, size=1)
+        cache.set('b', 2, size=1)
+        cache.get('a')
+        cache.set('c', 3, size=2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.size, 3)
+
+        cache.set('d', 4, size=4)
+        self.assertNotIn('d', cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+
+class ModelCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def _write(self, basename, content):
+        filename = os.path.join(self.dirname, basename)
+        with open(filename, 'w') as file:
+            file.write(content)
+        return filename
+
+    def test_read_model(self):
+        filename_1 = self._write('model-1.xml', '<sbml/>')
+        filename_2 = self._write('model-2.xml', '<sbml/>')
+        filename_3 = self._write('model-3.xml', '<sbml><model/></sbml>')
+
+        cache = ModelCache()
+        with mock.patch('my_simulator.cache.read_model', side_effect=lambda filename, language: {'source': filename}) as read_model:
+            model_1 = cache.read_model(filename_1, 'urn:sedml:language:sbml')
+            model_2 = cache.read_model(filename_2, 'urn:sedml:language:sbml')
+            self.assertEqual(read_model.call_count, 1)
+            self.assertEqual(model_1, model_2)
+            self.assertIsNot(model_1, model_2)
+
+            cache.read_model(filename_2, 'urn:sedml:language:cellml')
+            cache.read_model(filename_3, 'urn:sedml:language:sbml')
+            self.assertEqual(read_model.call_count, 3)
+
+    def test_read_model_shared_instances(self):
+        filename = self._write('model.xml', '<sbml/>')
+
+        cache = ModelCache(copy_models=False)
+        with mock.patch('my_simulator.cache.read_model', side_effect=lambda filename, language: {'source': filename}):
+            self.assertIs(cache.read_model(filename, 'urn:sedml:language:sbml'),
+                          cache.read_model(filename, 'urn:sedml:language:sbml'))
+
+    def test_read_model_disabled(self):
+        filename = self._write('model.xml', '<sbml/>')
+
+        cache = ModelCache(max_size=0)
+        with mock.patch('my_simulator.cache.read_model', side_effect=lambda filename, language: {'source': filename}) as read_model:
+            cache.read_model(filename, 'urn:sedml:language:sbml')
+            cache.read_model(filename, 'urn:sedml:language:sbml')
+            self.assertEqual(read_model.call_count, 2)
+
+
+class XPathCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_validate_target_xpaths(self):
+        filename_1 = os.path.join(self.dirname, 'model-1.xml')
+        filename_2 = os.path.join(self.dirname, 'model-2.xml')
+        for filename in [filename_1, filename_2]:
+            with open(filename, 'w') as file:
+                file.write('<sbml/>')
+
+        namespaces = {'sbml': 'http://www.sbml.org/sbml/level3/version1/core'}
+        variables = [
+            sedml_data_model.Variable(id='time', symbol=sedml_data_model.Symbol.time.value),
+            sedml_data_model.Variable(id='A', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']",
+                                      target_namespaces=namespaces),
+        ]
+
+        cache = XPathCache()
+        with mock.patch('biosimulators_utils.sedml.validation.validate_target_xpaths',
+                        side_effect=lambda variables, model_source, attr: {variables[1].target: 'A'}) as validate_target_xpaths:
+            self.assertEqual(cache.validate_target_xpaths(variables, filename_1), {variables[1].target: 'A'})
+            self.assertEqual(cache.validate_target_xpaths(list(reversed(variables)), filename_2), {variables[1].target: 'A'})
+            self.assertEqual(validate_target_xpaths.call_count, 1)
+            self.assertEqual(cache.get_stats(), {'entries': 1, 'size': 1, 'hits': 1, 'misses': 1})
+
+            variables[1].target_namespaces = {'sbml': 'http://www.sbml.org/sbml/level2/version4'}
+            cache.validate_target_xpaths(variables, filename_1)
+            self.assertEqual(validate_target_xpaths.call_count, 2)
+
+    def test_get_cache_stats(self):
+        stats = get_cache_stats()
+        self.assertEqual(set(stats.keys()), set(['model', 'xpath', 'validation', 'result', 'checkpoint']))
+        self.assertEqual(set(stats['xpath'].keys()), set(['entries', 'size', 'hits', 'misses']))
+
+
+class ValidationCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_in_memory(self):
+        cache = ValidationCache()
+        self.assertFalse(cache.is_valid('digest'))
+        cache.add_valid('digest')
+        self.assertTrue(cache.is_valid('digest'))
+
+    def test_persisted(self):
+        dirname = os.path.join(self.dirname, 'validation')
+
+        cache = ValidationCache(dirname=dirname)
+        self.assertFalse(cache.is_valid('digest'))
+        cache.add_valid('digest')
+        self.assertTrue(os.path.isfile(os.path.join(dirname, 'digest')))
+
+        cache = ValidationCache(dirname=dirname)
+        self.assertTrue(cache.is_valid('digest'))
+        self.assertFalse(cache.is_valid('other-digest'))
+
+
+class ResultStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_disabled(self):
+        store = ResultStore()
+        store.add('digest', {'x': numpy.zeros(3)})
+        self.assertEqual(store.get('digest'), None)
+
+    def test_get_add(self):
+        dirname = os.path.join(self.dirname, 'results')
+        store = ResultStore(dirname=dirname)
+        self.assertEqual(store.get('digest'), None)
+
+        store.add('digest', {'time': numpy.linspace(0., 1., 3), 'x/y': numpy.array([[1, 2], [3, 4]])},
+                  algorithm='KISAO_0000019', simulator_details={'arguments': {'rtol': 1e-6}})
+        self.assertEqual(os.listdir(dirname), ['digest.npz'])
+
+        variable_results, algorithm, simulator_details = ResultStore(dirname=dirname).get('digest')
+        self.assertEqual(list(variable_results.keys()), ['time', 'x/y'])
+        numpy.testing.assert_equal(variable_results['time'], [0., 0.5, 1.])
+        numpy.testing.assert_equal(variable_results['x/y'], [[1, 2], [3, 4]])
+        self.assertEqual(algorithm, 'KISAO_0000019')
+        self.assertEqual(simulator_details, {'arguments': {'rtol': 1e-6}})
+
+        store.add('other-digest', {'x': numpy.array(['a', None], dtype=object)})
+        self.assertEqual(store.get('other-digest'), None)
+        self.assertEqual(store.get_stats(), {'entries': 1, 'size': os.path.getsize(os.path.join(dirname, 'digest.npz')),
+                                             'hits': 0, 'misses': 2})
+
+        store.clear()
+        self.assertEqual(store.get('digest'), None)
+
+    def test_eviction(self):
+        store = ResultStore(dirname=self.dirname)
+        store.add('a', {'x': numpy.zeros(1000)})
+        size = os.path.getsize(os.path.join(self.dirname, 'a.npz'))
+        store.max_size = 2 * size
+
+        store.add('b', {'x': numpy.zeros(1000)})
+        os.utime(os.path.join(self.dirname, 'a.npz'), (0, 0))
+        os.utime(os.path.join(self.dirname, 'b.npz'), (1, 1))
+        store.add('c', {'x': numpy.zeros(1000)})
+        self.assertEqual(sorted(os.listdir(self.dirname)), ['b.npz', 'c.npz'])
+
+        store.get('b')
+        store.add('d', {'x': numpy.zeros(1000)})
+        self.assertEqual(sorted(os.listdir(self.dirname)), ['b.npz', 'd.npz'])
+
+
+class CheckpointCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_in_memory(self):
+        cache = CheckpointCache(max_size=100)
+        self.assertTrue(cache.enabled)
+        self.assertEqual(cache.get_checkpoint('digest'), None)
+
+        cache.add_checkpoint('digest', numpy.zeros(10))
+        cache.add_checkpoint('other-digest', {'x': 1.})
+        numpy.testing.assert_equal(cache.get_checkpoint('digest'), numpy.zeros(10))
+        self.assertEqual(cache.get_checkpoint('other-digest'), {'x': 1.})
+        self.assertEqual(cache.get_stats(), {'entries': 2, 'size': 81, 'hits': 2, 'misses': 1})
+
+        self.assertFalse(CheckpointCache(max_size=0).enabled)
+
+    def test_persisted(self):
+        dirname = os.path.join(self.dirname, 'checkpoints')
+        cache = CheckpointCache(max_size=0, dirname=dirname)
+        self.assertTrue(cache.enabled)
+
+        cache.add_checkpoint('digest', numpy.array([1., 2.]))
+        cache.add_checkpoint('other-digest', numpy.array(['a', None], dtype=object))
+        cache.add_checkpoint('another-digest', {'x': 1.})
+        self.assertEqual(os.listdir(dirname), ['digest.npy'])
+
+        cache = CheckpointCache(dirname=dirname)
+        numpy.testing.assert_equal(cache.get_checkpoint('digest'), [1., 2.])
+        numpy.testing.assert_equal(cache.get_checkpoint('digest'), [1., 2.])
+        self.assertEqual(cache.get_checkpoint('other-digest'), None)
+        self.assertEqual(cache.get_stats(), {'entries': 1, 'size': 16, 'hits': 2, 'misses': 1})
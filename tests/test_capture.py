@@ -0,0 +1,96 @@
+""" Tests of the capture of standard output and error to spool files
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.combine import exec as combine_exec
+from biosimulators_utils.log.data_model import StandardOutputErrorCapturerLevel, TaskLog
+from biosimulators_utils.log.utils import StandardOutputErrorCapturer
+from biosimulators_utils.sedml import exec as sedml_exec
+from my_simulator.capture import (OutputSpool, SpooledOutputErrorCapturer, spooled_output_capture,
+                                  exec_sed_task_with_spooled_output, is_spooling_output)
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+class CaptureTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dirname, 'output.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_output_spool(self):
+        spool = OutputSpool(self.filename, max_output_size=4)
+        spool.write('abc')
+        spool.write('defgh')
+        self.assertEqual(spool.tell(), 8)
+        self.assertEqual(spool.read(1, 2), 'bc')
+        self.assertEqual(spool.read(3, 5), 'defg\n[1 more bytes of output in `output.log` at offset 7]')
+        spool.close()
+
+    def test_output_spool_stream(self):
+        with spooled_output_capture(self.filename):
+            with SpooledOutputErrorCapturer(level=StandardOutputErrorCapturerLevel.python) as captured:
+                self.assertIsInstance(sys.stdout, io.TextIOBase)
+                self.assertIs(sys.stderr, sys.stdout)
+                self.assertFalse(sys.stdout.isatty())
+                self.assertEqual(sys.stdout.encoding, 'utf-8')
+                self.assertTrue(sys.stdout.writable())
+                self.assertEqual(sys.stdout.write('Python output\n'), 14)
+                os.write(sys.stdout.fileno(), b'descriptor output\n')
+
+            self.assertEqual(captured.get_text(), 'Python output\ndescriptor output\n')
+
+    def test_capture(self):
+        with spooled_output_capture(self.filename, max_output_size=1024) as spool:
+            self.assertTrue(is_spooling_output())
+            self.assertIs(sedml_exec.StandardOutputErrorCapturer, SpooledOutputErrorCapturer)
+            self.assertIs(combine_exec.StandardOutputErrorCapturer, SpooledOutputErrorCapturer)
+
+            with SpooledOutputErrorCapturer(level=StandardOutputErrorCapturerLevel.c) as outer_captured:
+                os.write(1, b'C output\n')
+                with SpooledOutputErrorCapturer(level=StandardOutputErrorCapturerLevel.python) as inner_captured:
+                    print('Python output')
+
+            self.assertEqual(inner_captured.get_text(), 'Python output\n')
+            self.assertEqual(outer_captured.get_text(), 'C output\nPython output\n')
+            self.assertEqual(inner_captured.get_location(), {'file': 'output.log', 'offset': 9, 'length': 14})
+            self.assertEqual(spool.tell(), 23)
+
+            with SpooledOutputErrorCapturer(disabled=True) as captured:
+                pass
+            self.assertEqual(captured.get_text(), None)
+
+        self.assertFalse(is_spooling_output())
+        self.assertIs(sedml_exec.StandardOutputErrorCapturer, StandardOutputErrorCapturer)
+        self.assertIs(combine_exec.StandardOutputErrorCapturer, StandardOutputErrorCapturer)
+
+        with SpooledOutputErrorCapturer(level=StandardOutputErrorCapturerLevel.python) as captured:
+            print('Python output')
+        self.assertEqual(captured.get_text(), 'Python output\n')
+
+    def test_exec_sed_task_with_spooled_output(self):
+        def task_executer(task, variables, preprocessed_task=None, log=None, config=None):
+            print('output of {}'.format(task))
+            log.simulator_details = {'method': 'simulate'}
+            return {}, log
+
+        with spooled_output_capture(self.filename):
+            with SpooledOutputErrorCapturer(level=StandardOutputErrorCapturerLevel.python) as captured:
+                print('preamble')
+                _, log = exec_sed_task_with_spooled_output(task_executer, 'task', [], log=TaskLog())
+
+        self.assertEqual(captured.get_text(), 'preamble\noutput of task\n')
+        self.assertEqual(log.simulator_details, {
+            'method': 'simulate',
+            'output': {'file': 'output.log', 'offset': 0, 'length': 24},
+        })
@@ -8,13 +8,17 @@
 
 from biosimulators_utils.combine import data_model as combine_data_model
 from biosimulators_utils.combine.io import CombineArchiveWriter
+from biosimulators_utils.config import get_config
 from biosimulators_utils.report import data_model as report_data_model
 from biosimulators_utils.report.io import ReportReader
 from biosimulators_utils.sedml import data_model as sedml_data_model
 from biosimulators_utils.simulator.exec import exec_sedml_docs_in_archive_with_containerized_simulator
 from biosimulators_utils.simulator.specs import gen_algorithms_from_specs
 from my_simulator import __main__
-from my_simulator.core import exec_sed_task, exec_sedml_docs_in_combine_archive
+from my_simulator.cache import ResultStore, ValidationCache
+from my_simulator.core import exec_sed_doc, exec_sed_task, preprocess_sed_task, exec_sedml_docs_in_combine_archive
+from my_simulator.config import SimulatorConfig
+from my_simulator.data_model import KISAO_METHOD_MAP, PreprocessedTask
 from unittest import mock
 import numpy
 import os
@@ -77,10 +81,191 @@ class CoreTestCase(unittest.TestCase):
         for results in variable_results.values():
             self.assertFalse(numpy.any(numpy.isnan(results)))
 
+    def test_preprocess_sed_task(self):
+        task, variables = self._build_task()
+
+        preprocessed_task = preprocess_sed_task(task, variables)
+        self.assertIsInstance(preprocessed_task, PreprocessedTask)
+        self.assertEqual(preprocessed_task.algorithm_kisao_id, 'KISAO_0000560')
+        self.assertEqual(set(preprocessed_task.target_x_paths_ids.keys()),
+                         set(variable.target for variable in variables if variable.target))
+
+        with mock.patch('my_simulator.core.get_model_cache', side_effect=Exception('model should not be read again')):
+            with mock.patch('my_simulator.core.get_algorithm_table',
+                            side_effect=Exception('algorithm should not be resolved again')):
+                variable_results, _ = exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+                variable_results_2, _ = exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+
+        for variable in variables:
+            numpy.testing.assert_allclose(variable_results[variable.id], variable_results_2[variable.id])
+
+    def test_exec_sed_task_timings(self):
+        task, variables = self._build_task()
+
+        _, log = exec_sed_task(task, variables, simulator_config=SimulatorConfig(LOG_MEMORY=True))
+        self.assertEqual(list(log.simulator_details['timings'].keys()),
+                         ['validation', 'targets', 'model', 'algorithm', 'simulation', 'results'])
+        self.assertEqual(list(log.simulator_details['memory'].keys()), list(log.simulator_details['timings'].keys()))
+
+        # the durations of the preprocessing are reported with the first execution of the preprocessed task
+        preprocessed_task = preprocess_sed_task(task, variables)
+        _, log = exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+        self.assertEqual(list(log.simulator_details['timings'].keys()),
+                         ['validation', 'targets', 'model', 'algorithm', 'simulation', 'results'])
+        self.assertNotIn('memory', log.simulator_details)
+
+        _, log = exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+        self.assertEqual(list(log.simulator_details['timings'].keys()), ['simulation', 'results'])
+
+    def test_exec_sed_doc_timings(self):
+        doc = self._build_task_sed_doc()
+
+        _, log = exec_sed_doc(doc, self.dirname, os.path.join(self.dirname, 'out'))
+        self.assertEqual(list(log.tasks['task'].simulator_details['timings'].keys()),
+                         ['validation', 'targets', 'model', 'algorithm', 'simulation', 'results'])
+
+    def test_exec_sed_doc_with_result_store(self):
+        result_store = ResultStore(dirname=os.path.join(self.dirname, 'results'))
+
+        with mock.patch('my_simulator.core.get_result_store', return_value=result_store):
+            exec_sed_doc(self._build_task_sed_doc(), self.dirname, os.path.join(self.dirname, 'out'))
+
+            # stored tasks aren't preprocessed
+            with mock.patch('my_simulator.core.preprocess_sed_task', side_effect=Exception('task should not be preprocessed')):
+                _, log = exec_sed_doc(self._build_task_sed_doc(), self.dirname, os.path.join(self.dirname, 'out'))
+        self.assertTrue(log.tasks['task'].simulator_details['stored'])
+
+    def test_exec_sed_task_streaming(self):
+        task, variables = self._build_task()
+
+        variable_results, _ = exec_sed_task(task, variables)
+        streamed_variable_results, log = exec_sed_task(task, variables, simulator_config=SimulatorConfig(STREAM_CHUNK_SIZE=3))
+
+        self.assertEqual(log.simulator_details['arguments']['chunk_size'], 3)
+        for variable in variables:
+            numpy.testing.assert_allclose(streamed_variable_results[variable.id], variable_results[variable.id])
+
+    def test_exec_sed_task_only_record_variables(self):
+        task, variables = self._build_task()
+        variables.append(sedml_data_model.Variable(id='A_2', target=variables[1].target, task=task))
+
+        with mock.patch.dict(KISAO_METHOD_MAP[task.simulation.algorithm.kisao_id], {'observables_arg': 'observables'}):
+            preprocessed_task = preprocess_sed_task(task, variables)
+            self.assertEqual(preprocessed_task.simulation_args['observables'], ['time', 'A', 'C', 'DA'])
+
+            variable_results, _ = exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+
+        numpy.testing.assert_allclose(variable_results['A_2'], variable_results['A'])
+
+    def test_exec_sed_task_with_model_attribute_changes(self):
+        task, variables = self._build_task()
+        preprocessed_task = preprocess_sed_task(task, variables)
+
+        task.model.changes.append(sedml_data_model.ModelAttributeChange(
+            target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']/@initialConcentration",
+            new_value='2.5',
+        ))
+
+        with mock.patch('my_simulator.core.set_model_attribute') as set_model_attribute:
+            with mock.patch('my_simulator.core.get_model_cache', side_effect=Exception('model should not be read again')):
+                variable_results, log = exec_sed_task(task, variables, preprocessed_task=preprocessed_task)
+
+        set_model_attribute.assert_called_once_with(mock.ANY, 'A', 'initialConcentration', '2.5')
+        self.assertIsNot(set_model_attribute.call_args[0][0], preprocessed_task.model)
+        self.assertEqual(set(variable_results.keys()), set(variable.id for variable in variables))
+
+        task.model.changes[0].target = "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']"
+        with self.assertRaisesRegex(NotImplementedError, 'must target attributes'):
+            exec_sed_task(task, variables)
+
+    def test_exec_sed_task_with_result_store(self):
+        task, variables = self._build_task()
+        result_store = ResultStore(dirname=os.path.join(self.dirname, 'results'))
+
+        with mock.patch('my_simulator.core.get_result_store', return_value=result_store):
+            variable_results, _ = exec_sed_task(task, variables)
+
+            with mock.patch('my_simulator.core.preprocess_sed_task', side_effect=Exception('task should not be executed')):
+                stored_variable_results, log = exec_sed_task(task, variables)
+            for variable in variables:
+                numpy.testing.assert_allclose(stored_variable_results[variable.id], variable_results[variable.id])
+            self.assertTrue(log.simulator_details['stored'])
+
+            task.simulation.algorithm.changes[0].new_value = '1e-6'
+            exec_sed_task(task, variables)
+
+            # results are not shared between algorithm substitution policies
+            config = get_config()
+            config.ALGORITHM_SUBSTITUTION_POLICY = 'NONE'
+            exec_sed_task(task, variables, config=config)
+
+            # stored results are only returned for valid tasks
+            with mock.patch('my_simulator.core.get_validation_cache', return_value=ValidationCache()):
+                with mock.patch('my_simulator.core._validate_sed_task', side_effect=ValueError('task is invalid')):
+                    with self.assertRaisesRegex(ValueError, 'task is invalid'):
+                        exec_sed_task(task, variables)
+
+        self.assertEqual(result_store.get_stats()['entries'], 3)
+
+    def _build_task(self):
+        task = sedml_data_model.Task(
+            model=sedml_data_model.Model(
+                source=self.EXAMPLE_MODEL_FILENAME,
+                language=sedml_data_model.ModelLanguage.SBML.value,
+                changes=[],
+            ),
+            simulation=sedml_data_model.UniformTimeCourseSimulation(
+                algorithm=sedml_data_model.Algorithm(
+                    kisao_id='KISAO_0000560',
+                    changes=[
+                        sedml_data_model.AlgorithmParameterChange(
+                            kisao_id='KISAO_0000209',
+                            new_value='2e-6',
+                        ),
+                    ],
+                ),
+                initial_time=0.,
+                output_start_time=10.,
+                output_end_time=20.,
+                number_of_points=20,
+            ),
+        )
+
+        variables = [
+            sedml_data_model.Variable(id='time', symbol=sedml_data_model.Symbol.time, task=task),
+            sedml_data_model.Variable(id='A', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']", task=task),
+            sedml_data_model.Variable(id='C', target='/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id="C"]', task=task),
+            sedml_data_model.Variable(id='DA', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='DA']", task=task),
+        ]
+
+        return task, variables
+
+    def _build_task_sed_doc(self):
+        task, variables = self._build_task()
+        task.id = 'task'
+        task.model.id = 'model'
+        task.simulation.id = 'simulation'
+
+        data_generators = [
+            sedml_data_model.DataGenerator(id='data_gen_' + variable.id, variables=[variable], math=variable.id)
+            for variable in variables
+        ]
+        report = sedml_data_model.Report(id='report', data_sets=[
+            sedml_data_model.DataSet(id='data_set_' + variable.id, label=variable.id, data_generator=data_generator)
+            for variable, data_generator in zip(variables, data_generators)
+        ])
+        return sedml_data_model.SedDocument(models=[task.model], simulations=[task.simulation], tasks=[task],
+                                            data_generators=data_generators, outputs=[report])
+
     def test_exec_sedml_docs_in_combine_archive(self):
         exec_sedml_docs_in_combine_archive(self.EXAMPLE_ARCHIVE_FILENAME, self.dirname)
         self.assert_outputs_created()
 
+    def test_exec_sedml_docs_in_combine_archive_in_parallel(self):
+        exec_sedml_docs_in_combine_archive(self.EXAMPLE_ARCHIVE_FILENAME, self.dirname,
+                                           simulator_config=SimulatorConfig(NUM_WORKERS=2))
+        self.assert_outputs_created(self.dirname)
+
     def test_exec_sedml_docs_in_combine_archive_with_continuous_model_all_algorithms(self):
         for alg in gen_algorithms_from_specs(os.path.join(os.path.dirname(__file__), '..', 'biosimulators.json')).values():
             doc, archive_filename = self._build_combine_archive(algorithm=alg,
@@ -132,6 +317,21 @@ class CoreTestCase(unittest.TestCase):
             app.run()
         self.assert_outputs_created()
 
+    def test_exec_sedml_docs_in_combine_archive_with_cli_for_selected_outputs(self):
+        with mock.patch('my_simulator.core.exec_sedml_docs_in_combine_archive', return_value=(None, None)) as exec_archive:
+            with __main__.App(argv=['-i', self.EXAMPLE_ARCHIVE_FILENAME, '-o', self.dirname,
+                                    '-r', 'simulation_1.sedml/simulation_1']) as app:
+                app.run()
+        self.assertEqual(exec_archive.call_args[1]['output_ids'], ['simulation_1.sedml/simulation_1'])
+
+    def test_exec_sedml_docs_in_combine_archives_with_cli(self):
+        with mock.patch('sys.argv', ['', 'batch', '-i', self.EXAMPLE_ARCHIVE_FILENAME, self.EXAMPLE_ARCHIVE_FILENAME,
+                                     '-o', self.dirname]):
+            __main__.main()
+        self.assert_outputs_created(os.path.join(self.dirname, 'BIOMD0000000297'))
+        self.assert_outputs_created(os.path.join(self.dirname, 'BIOMD0000000297_2'))
+        self.assertTrue(os.path.isfile(os.path.join(self.dirname, 'batch.json')))
+
     def test_exec_sedml_docs_in_combine_archive_with_docker_image(self):
         exec_sedml_docs_in_archive_with_containerized_simulator(
             self.EXAMPLE_ARCHIVE_FILENAME, self.out_dir, self.DOCKER_IMAGE, pull_docker_image=False)
@@ -0,0 +1,102 @@
+""" Tests of the execution of ensembles of replicates of stochastic simulations
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from my_simulator.ensemble import (get_ensemble_settings, get_replicate_seeds, RunningMoments, RunningQuantile,
+                                   EnsembleAggregator, exec_ensemble)
+import numpy
+import unittest
+
+
+def simulate(simulation_args):
+    rng = numpy.random.default_rng(simulation_args['seed'])
+    return {
+        'time': numpy.linspace(0., 1., 6),
+        'x': simulation_args['offset'] + rng.normal(size=6),
+    }
+
+
+class EnsembleTestCase(unittest.TestCase):
+    def test_get_ensemble_settings(self):
+        changes = [
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000498', new_value='10'),
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000488', new_value='3'),
+            sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000209', new_value='1e-8'),
+        ]
+        number_of_runs, seed, other_changes = get_ensemble_settings(changes)
+        self.assertEqual(number_of_runs, 10)
+        self.assertEqual(seed, 3)
+        self.assertEqual(other_changes, changes[2:])
+
+        self.assertEqual(get_ensemble_settings([]), (1, None, []))
+
+        with self.assertRaisesRegex(ValueError, 'at least 1'):
+            get_ensemble_settings([sedml_data_model.AlgorithmParameterChange(kisao_id='KISAO_0000498', new_value='0')])
+
+    def test_get_replicate_seeds(self):
+        seeds, seed = get_replicate_seeds(3, 5)
+        self.assertEqual(seed, 3)
+        self.assertEqual(len(set(seeds)), 5)
+        self.assertEqual(get_replicate_seeds(3, 5)[0], seeds)
+        self.assertEqual(get_replicate_seeds(3, 6)[0][:5], seeds)
+
+        seeds, seed = get_replicate_seeds(None, 5)
+        self.assertEqual(get_replicate_seeds(seed, 5)[0], seeds)
+
+    def test_running_moments(self):
+        values = numpy.random.default_rng(0).normal(size=(50, 4))
+        moments = RunningMoments()
+        for value in values:
+            moments.add(value)
+        numpy.testing.assert_allclose(moments.mean, values.mean(axis=0))
+        numpy.testing.assert_allclose(moments.variance, values.var(axis=0, ddof=1))
+
+    def test_running_quantile(self):
+        values = numpy.random.default_rng(0).normal(size=(3, 4))
+        quantile = RunningQuantile(0.5)
+        for value in values:
+            quantile.add(value)
+        numpy.testing.assert_allclose(quantile.value, numpy.median(values, axis=0))
+
+        values = numpy.random.default_rng(0).normal(size=(5000, 3))
+        for q in [0.1, 0.5, 0.95]:
+            quantile = RunningQuantile(q)
+            for value in values:
+                quantile.add(value)
+            numpy.testing.assert_allclose(quantile.value, numpy.quantile(values, q, axis=0), atol=0.1)
+
+        with self.assertRaisesRegex(ValueError, 'between 0 and 1'):
+            RunningQuantile(1.)
+
+    def test_ensemble_aggregator(self):
+        aggregator = EnsembleAggregator(2)
+        aggregator.add(1, {'x': numpy.array([3., 4.])})
+        aggregator.add(0, {'x': numpy.array([1., 2.])})
+        numpy.testing.assert_equal(aggregator.get_variable_results()['x'], [[1., 2.], [3., 4.]])
+
+        aggregator = EnsembleAggregator(2, aggregate='mean')
+        aggregator.add(1, {'x': numpy.array([3., 4.])})
+        aggregator.add(0, {'x': numpy.array([1., 2.])})
+        numpy.testing.assert_equal(aggregator.get_variable_results()['x'], [2., 3.])
+
+        with self.assertRaisesRegex(ValueError, 'not a supported aggregate'):
+            EnsembleAggregator(2, aggregate='max')
+        with self.assertRaisesRegex(ValueError, 'not a valid quantile'):
+            EnsembleAggregator(2, aggregate='quantile:2')
+
+    def test_exec_ensemble(self):
+        results, seed = exec_ensemble(simulate, {'offset': 10.}, 'seed', 8, seed=5)
+        self.assertEqual(seed, 5)
+        self.assertEqual(results['x'].shape, (8, 6))
+        numpy.testing.assert_equal(results['time'][3], numpy.linspace(0., 1., 6))
+
+        parallel_results, _ = exec_ensemble(simulate, {'offset': 10.}, 'seed', 8, seed=5, num_workers=2)
+        numpy.testing.assert_equal(parallel_results['x'], results['x'])
+
+        mean_results, _ = exec_ensemble(simulate, {'offset': 10.}, 'seed', 8, seed=5, aggregate='mean', num_workers=2)
+        numpy.testing.assert_allclose(mean_results['x'], results['x'].mean(axis=0))
@@ -0,0 +1,61 @@
+""" Tests of the start-up time of the package and its command-line interface
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+import subprocess
+import sys
+import time
+import unittest
+
+
+class ImportTestCase(unittest.TestCase):
+    HEAVY_MODULES = [
+        'my_simulator.core',
+        'biosimulators_utils.combine.exec',
+        'biosimulators_utils.sedml.exec',
+        'biosimulators_utils.sedml.validation',
+        'biosimulators_utils.report.io',
+        'biosimulators_utils.viz.io',
+        'kisao.utils',
+    ]
+
+    START_UP_TIME_BUDGET = 0.5
+    # :obj:`float`: maximum time (s) which the command-line application may take to print its version, beyond the time
+    # needed to import the BioSimulators utilities for building command-line applications
+
+    def test_heavy_modules_are_imported_lazily(self):
+        code = '\n'.join([
+            'import sys',
+            'import my_simulator',
+            'import my_simulator.__main__',
+            'print("\\n".join(sorted(sys.modules.keys())))',
+        ])
+        modules = subprocess.check_output([sys.executable, '-c', code]).decode().split('\n')
+        for module in self.HEAVY_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_heavy_modules_are_imported_on_first_use(self):
+        import my_simulator
+        import my_simulator.core
+
+        self.assertIs(my_simulator.exec_sed_task, my_simulator.core.exec_sed_task)
+        self.assertIn('exec_sedml_docs_in_combine_archives', dir(my_simulator))
+        with self.assertRaises(AttributeError):
+            my_simulator.undefined_method
+
+    def test_version_start_up_time(self):
+        baseline = self._get_min_duration(['-c', 'import biosimulators_utils.simulator.cli'])
+        duration = self._get_min_duration(['-c', 'from my_simulator.__main__ import main; main()', '--version'])
+        self.assertLess(duration, baseline + self.START_UP_TIME_BUDGET)
+
+    def _get_min_duration(self, args, repeats=3):
+        durations = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + args, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            durations.append(time.perf_counter() - start)
+        return min(durations)
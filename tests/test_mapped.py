@@ -0,0 +1,67 @@
+""" Tests of the results which are backed by HDF5 files
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from my_simulator.mapped import (RESULTS_DATASET, MappedVariableResults, create_mapped_results, write_mapped_results,
+                                 open_mapped_results)
+from my_simulator.utils import get_variable_results_from_chunks
+import functools
+import h5py
+import numpy
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+
+class MappedResultsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dirname, 'results.h5')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_write_and_open(self):
+        write_mapped_results(self.filename, {
+            'time': numpy.linspace(0., 1., 5),
+            'x': numpy.arange(5),
+        })
+
+        with h5py.File(self.filename, 'r') as file:
+            numpy.testing.assert_equal(file[RESULTS_DATASET][1], numpy.arange(5.))
+
+        variable_results = open_mapped_results(self.filename)
+        self.assertIsInstance(variable_results, MappedVariableResults)
+        self.assertEqual(list(variable_results.keys()), ['time', 'x'])
+        self.assertIsInstance(variable_results['x'], numpy.memmap)
+        numpy.testing.assert_equal(variable_results['time'], numpy.linspace(0., 1., 5))
+
+        variable_results['x'][0] = -1.
+        self.assertEqual(open_mapped_results(self.filename)['x'][0], 0.)
+
+        pickled_variable_results = pickle.dumps(variable_results)
+        self.assertLess(len(pickled_variable_results), 200)
+        numpy.testing.assert_equal(pickle.loads(pickled_variable_results)['x'], numpy.arange(5.))
+
+    def test_empty(self):
+        write_mapped_results(self.filename, {'x': numpy.zeros((0,))})
+        self.assertEqual(open_mapped_results(self.filename)['x'].shape, (0,))
+
+    def test_get_variable_results_from_chunks(self):
+        variables = [sedml_data_model.Variable(id='A'), sedml_data_model.Variable(id='B')]
+        matrix = numpy.arange(30.).reshape((3, 10))
+        chunks = ((['time', 'A', 'B'], matrix[:, i:i + 4]) for i in range(0, 10, 4))
+
+        allocate = functools.partial(create_mapped_results, self.filename, ['A', 'B'])
+        get_variable_results_from_chunks(variables, ['A', 'B'], chunks, 10, allocate=allocate)
+
+        variable_results = open_mapped_results(self.filename)
+        numpy.testing.assert_equal(variable_results['A'], matrix[1])
+        numpy.testing.assert_equal(variable_results['B'], matrix[2])
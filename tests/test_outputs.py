@@ -0,0 +1,98 @@
+""" Tests of the writing of the reports and plots of SED documents in the background
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.log.data_model import Status, SedDocumentLog, ReportLog
+from biosimulators_utils.report.data_model import ReportFormat
+from biosimulators_utils.report.io import ReportWriter, ReportReader
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from biosimulators_utils.sedml import exec as sedml_exec
+from biosimulators_utils.viz import io as viz_io
+from my_simulator.outputs import OutputWriter, AsynchronousReportWriter, asynchronous_output_writing, fail_unwritten_outputs
+import numpy
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+
+class OutputsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+        self.report = sedml_data_model.Report(id='report', data_sets=[
+            sedml_data_model.DataSet(id='time', label='time'),
+            sedml_data_model.DataSet(id='x', label='x'),
+        ])
+        self.results = {'time': numpy.linspace(0., 1., 3), 'x': numpy.array([1., 2., 3.])}
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_output_writer(self):
+        writes = []
+        release = threading.Event()
+
+        def write(value):
+            release.wait()
+            writes.append(value)
+
+        def fail(value):
+            raise ValueError(value)
+
+        writer = OutputWriter(max_queue_size=10)
+        writer.submit('a', 'output-a', write, 1)
+        writer.submit('b', 'output-b', write, 2)
+        writer.submit('b', 'output-b', write, 3)
+        writer.submit('c', 'output-c', fail, 'c')
+        writer.submit('d', 'output-d', fail, 'd')
+        writer.submit('d', 'output-d', write, 4)
+        release.set()
+        writer.flush()
+
+        # the first write of `b` is superseded, unless it started before the second write was submitted
+        self.assertIn(writes, [[1, 3, 4], [1, 2, 3, 4]])
+        errors = writer.get_errors()
+        self.assertEqual([output_id for output_id, _ in errors], ['output-c'])
+        self.assertIsInstance(errors[0][1], ValueError)
+
+        writer.close()
+
+    def test_asynchronous_output_writing(self):
+        with asynchronous_output_writing() as writer:
+            self.assertIs(sedml_exec.ReportWriter, AsynchronousReportWriter)
+            self.assertIs(sedml_exec.write_plot_2d, viz_io.write_plot_2d)
+
+            AsynchronousReportWriter().run(self.report, self.results, self.dirname, 'sim.sedml/report',
+                                           format=ReportFormat.csv)
+        self.assertIs(sedml_exec.ReportWriter, ReportWriter)
+        self.assertIs(sedml_exec.write_plot_2d, viz_io.write_plot_2d)
+        self.assertEqual(writer.get_errors(), [])
+
+        results = ReportReader().run(self.report, self.dirname, 'sim.sedml/report', format=ReportFormat.csv)
+        numpy.testing.assert_equal(results['x'], self.results['x'])
+
+    def test_write_outside_of_context(self):
+        AsynchronousReportWriter().run(self.report, self.results, self.dirname, 'report', format=ReportFormat.csv)
+        self.assertTrue(os.path.isfile(os.path.join(self.dirname, 'report.csv')))
+
+    def test_fail_unwritten_outputs(self):
+        # the output directory is a file
+        filename = os.path.join(self.dirname, 'file')
+        with open(filename, 'w'):
+            pass
+
+        with asynchronous_output_writing() as writer:
+            AsynchronousReportWriter().run(self.report, self.results, filename, 'sim.sedml/report', format=ReportFormat.csv)
+        errors = writer.get_errors()
+        self.assertEqual([output_id for output_id, _ in errors], ['report'])
+
+        log = SedDocumentLog(outputs={'report': ReportLog(id='report', status=Status.SUCCEEDED)})
+        fail_unwritten_outputs(log, errors)
+        self.assertEqual(log.outputs['report'].status, Status.FAILED)
+        self.assertIs(log.outputs['report'].exception, errors[0][1])
@@ -0,0 +1,138 @@
+""" Tests of the parallel execution of tasks
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.config import get_config
+from biosimulators_utils.log.data_model import StandardOutputErrorCapturerLevel, TaskLog
+from biosimulators_utils.log.utils import StandardOutputErrorCapturer
+from biosimulators_utils.report.data_model import VariableResults
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from my_simulator.parallel import (TaskResult, get_worker_context, is_task_worker, tasks_share_state,
+                                   exec_tasks_in_parallel, exec_precomputed_sed_task)
+from unittest import mock
+import concurrent.futures
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+def exec_task(task, variables, preprocessed_task=None, log=None, config=None):
+    print('output of {}'.format(task.id))
+    os.write(1, 'C output of {}\n'.format(task.id).encode())
+    if task.id == 'task_2':
+        raise ValueError('Task is invalid')
+    if task.id == 'task_3':
+        os._exit(1)
+    log.algorithm = 'KISAO_0000560'
+    log.simulator_details = {'taskWorker': is_task_worker()}
+    return VariableResults({'x': numpy.array([float(os.getpid())])}), log
+
+
+class ParallelTestCase(unittest.TestCase):
+    def test_tasks_share_state(self):
+        model = sedml_data_model.Model(id='model', changes=[])
+        task_1 = sedml_data_model.Task(id='task_1', model=model)
+        task_2 = sedml_data_model.Task(id='task_2', model=model)
+        self.assertFalse(tasks_share_state([task_1, task_2]))
+
+        repeated_task = sedml_data_model.RepeatedTask(id='task_3')
+        self.assertTrue(tasks_share_state([task_1, repeated_task]))
+
+        other_model = sedml_data_model.Model(id='other_model', changes=[])
+        model.changes.append(sedml_data_model.ComputeModelChange(
+            target='/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id="k"]',
+            variables=[sedml_data_model.Variable(id='x', model=other_model)],
+            math='x',
+        ))
+        self.assertTrue(tasks_share_state([task_1, task_2]))
+
+    def test_exec_precomputed_sed_task(self):
+        task_1 = sedml_data_model.Task(id='task_1')
+        task_2 = sedml_data_model.Task(id='task_2')
+        task_3 = sedml_data_model.Task(id='task_3')
+        task_results = {
+            task_1.id: TaskResult(variable_results=VariableResults({'x': numpy.array([1., 2.])}),
+                                  algorithm='KISAO_0000560', simulator_details={'method': 'simulation_method'}),
+            task_2.id: TaskResult(exception=ValueError('Task is invalid')),
+        }
+        task_executer = mock.Mock(return_value=(VariableResults(), None))
+
+        log = TaskLog()
+        variable_results, log = exec_precomputed_sed_task(task_results, task_executer, task_1, [], log=log)
+        numpy.testing.assert_allclose(variable_results['x'], numpy.array([1., 2.]))
+        self.assertEqual(log.algorithm, 'KISAO_0000560')
+        self.assertEqual(log.simulator_details, {'method': 'simulation_method'})
+
+        with self.assertRaisesRegex(ValueError, 'invalid'):
+            exec_precomputed_sed_task(task_results, task_executer, task_2, [])
+
+        task_executer.assert_not_called()
+        exec_precomputed_sed_task(task_results, task_executer, task_3, [])
+        task_executer.assert_called_once()
+
+    def test_exec_precomputed_sed_task_with_output(self):
+        task = sedml_data_model.Task(id='task')
+        task_results = {task.id: TaskResult(variable_results=VariableResults(), output='output of worker\n')}
+
+        with StandardOutputErrorCapturer(level=StandardOutputErrorCapturerLevel.python) as captured:
+            exec_precomputed_sed_task(task_results, None, task, [], log=TaskLog())
+        self.assertEqual(captured.get_text(), 'output of worker\n')
+
+    def test_exec_tasks_in_parallel(self):
+        self.assertIn(get_worker_context().get_start_method(), ['forkserver', 'spawn'])
+
+        dirname = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dirname)
+        with open(os.path.join(dirname, 'model.xml'), 'w') as file:
+            file.write('<sbml/>')
+
+        model = sedml_data_model.Model(id='model', source='model.xml', language=sedml_data_model.ModelLanguage.SBML.value)
+        tasks = [sedml_data_model.Task(id='task_1', model=model), sedml_data_model.Task(id='task_2', model=model)]
+        data_generators = [
+            sedml_data_model.DataGenerator(id='data_gen_' + task.id, variables=[
+                sedml_data_model.Variable(id='x', target='x', task=task),
+            ])
+            for task in tasks
+        ]
+        doc = sedml_data_model.SedDocument(models=[model], tasks=tasks, data_generators=data_generators, outputs=[
+            sedml_data_model.Report(id='report', data_sets=[
+                sedml_data_model.DataSet(id='data_set_' + data_generator.id, data_generator=data_generator)
+                for data_generator in data_generators
+            ]),
+        ])
+
+        config = get_config()
+        config.LOG = True
+        task_results = exec_tasks_in_parallel(exec_task, doc, dirname, 2, config=config)
+        self.assertEqual(list(task_results.keys()), ['task_1', 'task_2'])
+        self.assertNotEqual(task_results['task_1'].variable_results['x'][0], os.getpid())
+        self.assertEqual(task_results['task_1'].algorithm, 'KISAO_0000560')
+        self.assertEqual(task_results['task_1'].simulator_details, {'taskWorker': True})
+        self.assertFalse(is_task_worker())
+        self.assertEqual(task_results['task_1'].output, 'output of task_1\nC output of task_1\n')
+        self.assertIsInstance(task_results['task_2'].exception, ValueError)
+        self.assertEqual(task_results['task_2'].output, 'output of task_2\nC output of task_2\n')
+
+        task_results = exec_tasks_in_parallel(exec_task, doc, dirname, 2, config=config,
+                                              log_level=StandardOutputErrorCapturerLevel.python)
+        self.assertEqual(task_results['task_1'].output, 'output of task_1\n')
+
+        # only the task which kills its worker fails
+        tasks.append(sedml_data_model.Task(id='task_3', model=model))
+        data_generators.append(sedml_data_model.DataGenerator(id='data_gen_task_3', variables=[
+            sedml_data_model.Variable(id='x', target='x', task=tasks[-1]),
+        ]))
+        doc.outputs[0].data_sets.append(sedml_data_model.DataSet(id='data_set_data_gen_task_3',
+                                                                 data_generator=data_generators[-1]))
+        task_results = exec_tasks_in_parallel(exec_task, doc, dirname, 3, config=config)
+        self.assertEqual(list(task_results.keys()), ['task_1', 'task_2', 'task_3'])
+        self.assertEqual(task_results['task_1'].exception, None)
+        self.assertEqual(task_results['task_1'].algorithm, 'KISAO_0000560')
+        self.assertIsInstance(task_results['task_2'].exception, ValueError)
+        self.assertIsInstance(task_results['task_3'].exception, concurrent.futures.process.BrokenProcessPool)
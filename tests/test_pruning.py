@@ -0,0 +1,105 @@
+""" Tests of the pruning of the tasks of SED documents which are not needed to generate the requested outputs
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.log.data_model import SedDocumentLog, TaskLog, ReportLog, Plot2DLog, Status
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from my_simulator.pruning import (is_output_selected, get_selected_output_ids, validate_output_ids, get_data_generators_for_output,
+                                  prune_sed_doc, skip_pruned_tasks_and_outputs)
+import unittest
+
+
+class PruningTestCase(unittest.TestCase):
+    def setUp(self):
+        self.task_1 = sedml_data_model.Task(id='task_1')
+        self.task_2 = sedml_data_model.Task(id='task_2')
+        self.task_3 = sedml_data_model.Task(id='task_3')
+
+        self.data_gen_1 = sedml_data_model.DataGenerator(id='data_gen_1', variables=[
+            sedml_data_model.Variable(id='var_1', task=self.task_1),
+        ])
+        self.data_gen_2 = sedml_data_model.DataGenerator(id='data_gen_2', variables=[
+            sedml_data_model.Variable(id='var_2', task=self.task_2),
+        ])
+        self.data_gen_3 = sedml_data_model.DataGenerator(id='data_gen_3', variables=[
+            sedml_data_model.Variable(id='var_3', task=self.task_2),
+        ])
+
+        self.report = sedml_data_model.Report(id='report', data_sets=[
+            sedml_data_model.DataSet(id='data_set_1', data_generator=self.data_gen_1),
+        ])
+        self.plot = sedml_data_model.Plot2D(id='plot', curves=[
+            sedml_data_model.Curve(id='curve', x_data_generator=self.data_gen_2, y_data_generator=self.data_gen_3),
+        ])
+
+        self.doc = sedml_data_model.SedDocument(
+            tasks=[self.task_1, self.task_2, self.task_3],
+            data_generators=[self.data_gen_1, self.data_gen_2, self.data_gen_3],
+            outputs=[self.report, self.plot],
+        )
+
+    def test_is_output_selected(self):
+        self.assertTrue(is_output_selected(self.report, None))
+        self.assertTrue(is_output_selected(self.report, ['report']))
+        self.assertFalse(is_output_selected(self.report, ['plot']))
+        self.assertTrue(is_output_selected(self.report, ['sim.sedml/report'], rel_out_path='sim.sedml'))
+        self.assertFalse(is_output_selected(self.report, ['other.sedml/report'], rel_out_path='sim.sedml'))
+
+    def test_get_selected_output_ids(self):
+        self.assertEqual(get_selected_output_ids(self.doc, None), [])
+        self.assertEqual(get_selected_output_ids(self.doc, ['plot', 'other', 'sim.sedml/report', 'other.sedml/report'],
+                                                 rel_out_path='sim.sedml'),
+                         ['plot', 'sim.sedml/report'])
+
+    def test_validate_output_ids(self):
+        validate_output_ids(None, set())
+        validate_output_ids(['report', 'sim.sedml/plot'], {'report', 'sim.sedml/plot'})
+
+        # the ids of outputs of the other documents of an archive are collected before they are validated
+        selected_output_ids = set()
+        output_ids = ['report', 'other.sedml/plot', 'missing', 'sim.sedml/missing']
+        selected_output_ids.update(get_selected_output_ids(self.doc, output_ids, rel_out_path='sim.sedml'))
+        other_doc = sedml_data_model.SedDocument(outputs=[sedml_data_model.Plot2D(id='plot')])
+        selected_output_ids.update(get_selected_output_ids(other_doc, output_ids, rel_out_path='other.sedml'))
+
+        with self.assertRaisesRegex(ValueError, r'`missing`\n  - `sim.sedml/missing`$'):
+            validate_output_ids(output_ids, selected_output_ids)
+
+    def test_get_data_generators_for_output(self):
+        self.assertEqual(get_data_generators_for_output(self.report), [self.data_gen_1])
+        self.assertEqual(get_data_generators_for_output(self.plot), [self.data_gen_2, self.data_gen_3])
+
+    def test_prune_sed_doc(self):
+        pruned_doc = prune_sed_doc(self.doc)
+        self.assertEqual(pruned_doc.tasks, [self.task_1, self.task_2])
+        self.assertEqual(pruned_doc.outputs, [self.report, self.plot])
+        self.assertEqual(len(self.doc.tasks), 3)
+
+        pruned_doc = prune_sed_doc(self.doc, output_ids=['plot'])
+        self.assertEqual(pruned_doc.tasks, [self.task_2])
+        self.assertEqual(pruned_doc.data_generators, [self.data_gen_2, self.data_gen_3])
+        self.assertEqual(pruned_doc.outputs, [self.plot])
+
+        pruned_doc = prune_sed_doc(self.doc, output_ids=['sim.sedml/report'], rel_out_path='sim.sedml')
+        self.assertEqual(pruned_doc.tasks, [self.task_1])
+        self.assertEqual(pruned_doc.outputs, [self.report])
+
+    def test_skip_pruned_tasks_and_outputs(self):
+        log = SedDocumentLog(
+            tasks={task.id: TaskLog(id=task.id, status=Status.QUEUED) for task in self.doc.tasks},
+            outputs={
+                'report': ReportLog(id='report', status=Status.QUEUED),
+                'plot': Plot2DLog(id='plot', status=Status.QUEUED),
+            },
+        )
+
+        skip_pruned_tasks_and_outputs(log, self.doc, prune_sed_doc(self.doc, output_ids=['report']))
+        self.assertEqual(log.tasks['task_1'].status, Status.QUEUED)
+        self.assertEqual(log.tasks['task_2'].status, Status.SKIPPED)
+        self.assertEqual(log.tasks['task_3'].status, Status.SKIPPED)
+        self.assertEqual(log.outputs['report'].status, Status.QUEUED)
+        self.assertEqual(log.outputs['plot'].status, Status.SKIPPED)
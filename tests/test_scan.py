@@ -0,0 +1,147 @@
+""" Tests of the batched execution of repeated tasks
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from biosimulators_utils.sedml import exec as sedml_exec
+from my_simulator.scan import (can_apply_model_changes_in_memory, is_batchable_repeated_task, get_repeated_task_iterations,
+                               exec_repeated_task_in_batches, batched_repeated_task_execution)
+from unittest import mock
+import numpy
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+TARGET = "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']/@value"
+
+
+def preprocess_task(task, variables, config=None):
+    return os.getpid()
+
+
+def exec_task(task, variables, preprocessed_task=None, log=None, config=None):
+    if task.model.changes[-1].new_value == '3':
+        raise ValueError('Iteration failed.')
+    if log:
+        log.algorithm = 'KISAO_0000019'
+    return {variable.id: numpy.array([float(change.new_value) for change in task.model.changes]) for variable in variables}, log
+
+
+class ScanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        with open(os.path.join(self.dirname, 'model.xml'), 'w') as file:
+            file.write('<sbml/>')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def _build_doc(self, reset_model_for_each_iteration=True):
+        model = sedml_data_model.Model(id='model', source='model.xml', language=sedml_data_model.ModelLanguage.SBML.value,
+                                       changes=[sedml_data_model.ModelAttributeChange(target=TARGET, new_value='0')])
+        task = sedml_data_model.Task(id='task', model=model)
+        range = sedml_data_model.VectorRange(id='range', values=[1., 2.5, 3.])
+        repeated_task = sedml_data_model.RepeatedTask(
+            id='repeated_task',
+            range=range,
+            reset_model_for_each_iteration=reset_model_for_each_iteration,
+            changes=[sedml_data_model.SetValueComputeModelChange(model=model, target=TARGET, range=range, math='range')],
+            sub_tasks=[sedml_data_model.SubTask(task=task, order=1)],
+        )
+        variable = sedml_data_model.Variable(id='var', target="/sbml:sbml/sbml:model", task=repeated_task)
+        data_generator = sedml_data_model.DataGenerator(id='data_gen', variables=[variable], math='var')
+        report = sedml_data_model.Report(id='report', data_sets=[
+            sedml_data_model.DataSet(id='data_set', label='data_set', data_generator=data_generator),
+        ])
+        return sedml_data_model.SedDocument(models=[model], tasks=[task, repeated_task],
+                                            data_generators=[data_generator], outputs=[report])
+
+    def test_can_apply_model_changes_in_memory(self):
+        doc = self._build_doc()
+        self.assertTrue(can_apply_model_changes_in_memory(doc))
+
+        doc.tasks[1].changes[0].variables.append(sedml_data_model.Variable(id='k1', target=TARGET))
+        self.assertFalse(can_apply_model_changes_in_memory(doc))
+
+        doc = self._build_doc()
+        doc.models[0].changes.append(sedml_data_model.RemoveElementModelChange(target=TARGET))
+        self.assertFalse(can_apply_model_changes_in_memory(doc))
+
+    def test_is_batchable_repeated_task(self):
+        doc = self._build_doc()
+        self.assertFalse(is_batchable_repeated_task(doc.tasks[0]))
+        self.assertTrue(is_batchable_repeated_task(doc.tasks[1]))
+
+        doc.tasks[1].sub_tasks.append(sedml_data_model.SubTask(task=self._build_doc().tasks[1], order=2))
+        self.assertFalse(is_batchable_repeated_task(doc.tasks[1]))
+
+    def test_get_repeated_task_iterations(self):
+        def get_changes(task):
+            return [(change.target, change.new_value) for change in task.model.changes]
+
+        doc = self._build_doc()
+        iterations = get_repeated_task_iterations(doc.tasks[1], {'model': doc.models[0]})
+        self.assertEqual([[get_changes(task) for task in iteration] for iteration in iterations], [
+            [[(TARGET, '0'), (TARGET, '1')]],
+            [[(TARGET, '0'), (TARGET, '2.5')]],
+            [[(TARGET, '0'), (TARGET, '3')]],
+        ])
+        self.assertEqual(len(doc.models[0].changes), 1)
+
+        # only the last of the accumulated changes of each target is kept
+        doc = self._build_doc(reset_model_for_each_iteration=False)
+        iterations = get_repeated_task_iterations(doc.tasks[1], {'model': doc.models[0]})
+        self.assertEqual([get_changes(iteration[0]) for iteration in iterations], [
+            [(TARGET, '0'), (TARGET, '1')],
+            [(TARGET, '0'), (TARGET, '2.5')],
+            [(TARGET, '0'), (TARGET, '3')],
+        ])
+
+    def test_exec_repeated_task_in_batches(self):
+        for num_workers in [1, 2]:
+            doc = self._build_doc()
+            variables = doc.data_generators[0].variables
+            with self.assertRaisesRegex(ValueError, 'Iteration failed.'):
+                exec_repeated_task_in_batches(doc.tasks[1], exec_task, preprocess_task, variables, num_workers=num_workers)
+
+            doc.tasks[1].range.values = [1., 2.5]
+            variable_results = exec_repeated_task_in_batches(doc.tasks[1], exec_task, preprocess_task, variables,
+                                                             num_workers=num_workers)
+            numpy.testing.assert_equal(variable_results['var'], [[[0., 1.]], [[0., 2.5]]])
+
+    def test_exec_repeated_task_in_batches_preprocesses_sub_tasks_once(self):
+        doc = self._build_doc()
+        doc.tasks[1].range.values = [1., 2.5]
+        task_preprocessor = mock.Mock(side_effect=preprocess_task)
+
+        exec_repeated_task_in_batches(doc.tasks[1], exec_task, task_preprocessor, doc.data_generators[0].variables)
+        task_preprocessor.assert_called_once()
+
+    def test_batched_repeated_task_execution(self):
+        doc = self._build_doc()
+        doc.tasks[1].range.values = [1., 2.5]
+        variables = doc.data_generators[0].variables
+        unbatched_task_executer = mock.Mock(side_effect=exec_task)
+
+        base_exec_repeated_task = sedml_exec.exec_repeated_task
+        with batched_repeated_task_execution(exec_task, preprocess_task):
+            self.assertIsNot(sedml_exec.exec_repeated_task, base_exec_repeated_task)
+            variable_results = sedml_exec.exec_repeated_task(doc.tasks[1], unbatched_task_executer, variables, doc)
+            unbatched_task_executer.assert_not_called()
+
+            # repeated tasks are executed as usual in other threads
+            thread_variable_results = []
+            thread = threading.Thread(target=lambda: thread_variable_results.append(sedml_exec.exec_repeated_task(
+                doc.tasks[1], unbatched_task_executer, variables, doc)))
+            thread.start()
+            thread.join()
+            self.assertEqual(unbatched_task_executer.call_count, 2)
+
+        self.assertIs(sedml_exec.exec_repeated_task, base_exec_repeated_task)
+        numpy.testing.assert_equal(variable_results['var'], thread_variable_results[0]['var'])
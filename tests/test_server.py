@@ -0,0 +1,160 @@
+""" Tests of the server for executing COMBINE/OMEX archives on request
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.log.data_model import Status
+from my_simulator.server import Server
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+
+def exec_archive(archive_filename, out_dir, config=None, simulator_config=None):
+    if archive_filename.endswith('invalid.omex'):
+        raise ValueError('Archive is invalid.')
+    if archive_filename.endswith('crash.omex'):
+        os._exit(1)
+    time.sleep(0.1)
+    os.makedirs(out_dir)
+    with open(os.path.join(out_dir, 'pid'), 'w') as file:
+        file.write(str(os.getpid()))
+    return None, None
+
+
+class ServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_serve_stream(self):
+        requests = [
+            {'id': 1, 'archive': 'archive-1.omex', 'outDir': os.path.join(self.dirname, 'out-1')},
+            {'id': 2, 'archive': 'invalid.omex', 'outDir': os.path.join(self.dirname, 'out-2')},
+            {'id': 3, 'archive': 'archive-3.omex'},
+            {'id': 4, 'command': 'restart'},
+            {'id': 5, 'archive': 'archive-5.omex', 'outDir': os.path.join(self.dirname, 'out-5')},
+        ]
+        in_stream = io.StringIO('\n'.join([json.dumps(request) for request in requests] + ['', '{"id": ']))
+        out_stream = io.StringIO()
+
+        Server(exec_archive, max_concurrency=2).serve_stream(in_stream, out_stream)
+
+        responses = {response['id']: response for response in map(json.loads, out_stream.getvalue().strip().split('\n'))}
+        self.assertEqual(set(responses.keys()), set([1, 2, 3, 4, 5, None]))
+
+        self.assertEqual(responses[1]['status'], Status.SUCCEEDED.value)
+        self.assertEqual(responses[1]['archive'], 'archive-1.omex')
+        self.assertEqual(responses[1]['outDir'], os.path.join(self.dirname, 'out-1'))
+        self.assertEqual(responses[1]['exception'], None)
+        self.assertTrue(os.path.isfile(os.path.join(self.dirname, 'out-1', 'pid')))
+
+        self.assertEqual(responses[2]['status'], Status.FAILED.value)
+        self.assertEqual(responses[2]['exception'], {'type': 'ValueError', 'message': 'Archive is invalid.'})
+
+        self.assertEqual(responses[3]['status'], Status.FAILED.value)
+        self.assertIn('must have an `archive` and an `outDir`', responses[3]['exception']['message'])
+
+        self.assertEqual(responses[4]['status'], Status.FAILED.value)
+        self.assertIn('not a command', responses[4]['exception']['message'])
+
+        self.assertEqual(responses[None]['status'], Status.FAILED.value)
+        self.assertEqual(responses[None]['exception']['type'], 'JSONDecodeError')
+
+    def test_workers_are_reused(self):
+        requests = [
+            {'id': i_request, 'archive': 'archive.omex', 'outDir': os.path.join(self.dirname, str(i_request))}
+            for i_request in range(3)
+        ]
+        in_stream = io.StringIO('\n'.join(json.dumps(request) for request in requests))
+
+        Server(exec_archive, max_concurrency=1).serve_stream(in_stream, io.StringIO())
+
+        pids = set()
+        for request in requests:
+            with open(os.path.join(request['outDir'], 'pid'), 'r') as file:
+                pids.add(file.read())
+        self.assertEqual(len(pids), 1)
+        self.assertNotEqual(pids, set([str(os.getpid())]))
+
+    def test_worker_crash(self):
+        requests = [
+            {'id': 1, 'archive': 'crash.omex', 'outDir': os.path.join(self.dirname, 'out-1')},
+            {'id': 2, 'archive': 'archive-2.omex', 'outDir': os.path.join(self.dirname, 'out-2')},
+            {'id': 3, 'archive': 'crash.omex', 'outDir': os.path.join(self.dirname, 'out-3')},
+            {'id': 4, 'archive': 'archive-4.omex', 'outDir': os.path.join(self.dirname, 'out-4')},
+        ]
+        in_stream = io.StringIO('\n'.join(json.dumps(request) for request in requests))
+        out_stream = io.StringIO()
+
+        Server(exec_archive, max_concurrency=1).serve_stream(in_stream, out_stream)
+
+        responses = {response['id']: response for response in map(json.loads, out_stream.getvalue().strip().split('\n'))}
+        self.assertEqual(responses[1]['status'], Status.FAILED.value)
+        self.assertEqual(responses[1]['exception']['type'], 'BrokenProcessPool')
+        self.assertEqual(responses[2]['status'], Status.SUCCEEDED.value)
+        self.assertEqual(responses[3]['status'], Status.FAILED.value)
+        self.assertEqual(responses[4]['status'], Status.SUCCEEDED.value)
+
+    def test_shutdown_drains_accepted_requests(self):
+        requests = [
+            {'id': 1, 'archive': 'archive-1.omex', 'outDir': os.path.join(self.dirname, 'out-1')},
+            {'id': 2, 'command': 'shutdown'},
+            {'id': 3, 'archive': 'archive-3.omex', 'outDir': os.path.join(self.dirname, 'out-3')},
+        ]
+        in_stream = io.StringIO('\n'.join(json.dumps(request) for request in requests))
+        out_stream = io.StringIO()
+
+        server = Server(exec_archive)
+        server.serve_stream(in_stream, out_stream)
+
+        responses = [json.loads(line) for line in out_stream.getvalue().strip().split('\n')]
+        self.assertEqual([response['id'] for response in responses], [1, 2])
+        self.assertEqual(responses[1]['status'], Status.SUCCEEDED.value)
+        self.assertFalse(os.path.isdir(os.path.join(self.dirname, 'out-3')))
+
+        responses = []
+        self.assertEqual(server.submit(requests[2], responses.append), None)
+        self.assertEqual(responses[0]['exception']['type'], 'RuntimeError')
+
+    def test_serve_unix_socket(self):
+        socket_path = os.path.join(self.dirname, 'server.sock')
+        server = Server(exec_archive, max_concurrency=2)
+        thread = threading.Thread(target=server.serve_unix_socket, args=(socket_path,))
+        thread.start()
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            stream = client.makefile('rw')
+            for i_request in range(2):
+                stream.write(json.dumps({
+                    'id': i_request, 'archive': 'archive.omex', 'outDir': os.path.join(self.dirname, str(i_request)),
+                }) + '\n')
+            stream.write(json.dumps({'id': 'shutdown', 'command': 'shutdown'}) + '\n')
+            stream.flush()
+
+            responses = [json.loads(stream.readline()) for _ in range(3)]
+
+        thread.join()
+
+        self.assertEqual(set(response['id'] for response in responses), set([0, 1, 'shutdown']))
+        for response in responses:
+            self.assertEqual(response['status'], Status.SUCCEEDED.value)
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_invalid_concurrency(self):
+        with self.assertRaisesRegex(ValueError, 'at least 1'):
+            Server(exec_archive, max_concurrency=0)
@@ -0,0 +1,144 @@
+""" Tests of the execution of the time courses of tasks which only differ in their output time points with a single
+simulation
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.log.data_model import TaskLog
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from biosimulators_utils.warnings import BioSimulatorsWarning
+from my_simulator.parallel import TaskResult
+from my_simulator.timecourse import (get_time_points, get_shared_time_points, get_shared_time_course_signature,
+                                     plan_shared_time_courses, exec_shared_time_courses, exec_unshared_sed_task)
+from unittest import mock
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TimeCourseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        with open(os.path.join(self.dirname, 'model.xml'), 'w') as file:
+            file.write('<sbml/>')
+
+        self.model = sedml_data_model.Model(id='model', source='model.xml', language=sedml_data_model.ModelLanguage.SBML.value)
+        self.other_model = sedml_data_model.Model(id='other_model', source='model.xml',
+                                                  language=sedml_data_model.ModelLanguage.SBML.value)
+        algorithm = sedml_data_model.Algorithm(kisao_id='KISAO_0000019')
+
+        self.task_1 = sedml_data_model.Task(id='task_1', model=self.model, simulation=sedml_data_model.UniformTimeCourseSimulation(
+            initial_time=0., output_start_time=0., output_end_time=10., number_of_points=10, algorithm=algorithm))
+        self.task_2 = sedml_data_model.Task(id='task_2', model=self.model, simulation=sedml_data_model.UniformTimeCourseSimulation(
+            initial_time=0., output_start_time=5., output_end_time=20., number_of_points=3, algorithm=algorithm))
+        self.task_3 = sedml_data_model.Task(id='task_3', model=self.other_model, simulation=sedml_data_model.UniformTimeCourseSimulation(
+            initial_time=0., output_start_time=0., output_end_time=10., number_of_points=10, algorithm=algorithm))
+        self.task_4 = sedml_data_model.Task(id='task_4', model=self.model, simulation=sedml_data_model.UniformTimeCourseSimulation(
+            initial_time=0., output_start_time=0., output_end_time=10., number_of_points=10, algorithm=algorithm))
+        self.repeated_task = sedml_data_model.RepeatedTask(id='repeated_task', sub_tasks=[
+            sedml_data_model.SubTask(task=self.task_4, order=1),
+        ])
+        tasks = [self.task_1, self.task_2, self.task_3, self.task_4, self.repeated_task]
+
+        data_generators = [
+            sedml_data_model.DataGenerator(id='data_gen_' + task.id, variables=[
+                sedml_data_model.Variable(id='time_' + task.id, symbol=sedml_data_model.Symbol.time.value, task=task),
+            ])
+            for task in tasks
+        ]
+        self.doc = sedml_data_model.SedDocument(
+            models=[self.model, self.other_model],
+            tasks=tasks,
+            data_generators=data_generators,
+            outputs=[
+                sedml_data_model.Report(id='report', data_sets=[
+                    sedml_data_model.DataSet(id='data_set_' + data_generator.id, data_generator=data_generator)
+                    for data_generator in data_generators
+                ]),
+            ],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_get_shared_time_points(self):
+        numpy.testing.assert_equal(get_time_points(self.task_2.simulation), numpy.array([5., 10., 15., 20.]))
+
+        time_points = get_shared_time_points([self.task_1.simulation, self.task_2.simulation])
+        numpy.testing.assert_equal(time_points, numpy.concatenate([numpy.linspace(0., 10., 11), [15., 20.]]))
+
+    def test_get_shared_time_course_signature(self):
+        self.assertEqual(get_shared_time_course_signature(self.task_1), get_shared_time_course_signature(self.task_2))
+        self.assertNotEqual(get_shared_time_course_signature(self.task_1), get_shared_time_course_signature(self.task_3))
+        self.assertEqual(get_shared_time_course_signature(self.repeated_task), None)
+
+        self.task_2.simulation.initial_time = -1.
+        self.assertNotEqual(get_shared_time_course_signature(self.task_1), get_shared_time_course_signature(self.task_2))
+
+    def test_plan_shared_time_courses(self):
+        self.assertEqual(plan_shared_time_courses(self.doc), [[self.task_1, self.task_2]])
+
+        self.doc.outputs[0].data_sets = self.doc.outputs[0].data_sets[1:]
+        self.assertEqual(plan_shared_time_courses(self.doc), [])
+
+    def test_exec_shared_time_courses(self):
+        def group_executer(tasks, variables, config=None):
+            self.assertEqual([task.id for task in tasks], ['task_1', 'task_2'])
+            self.assertEqual([task.model.source for task in tasks], [os.path.join(self.dirname, 'model.xml')] * 2)
+            self.assertEqual([[variable.id for variable in task_variables] for task_variables in variables],
+                             [['time_task_1'], ['time_task_2']])
+            return {task.id: TaskResult(algorithm='KISAO_0000019') for task in tasks}
+
+        task_results, unshared_tasks = exec_shared_time_courses(group_executer, self.doc, self.dirname)
+        self.assertEqual(sorted(task_results.keys()), ['task_1', 'task_2'])
+        self.assertEqual(unshared_tasks, {})
+        self.assertEqual(self.model.source, 'model.xml')
+
+        # groups which can't be executed together are executed individually
+        self.assertEqual(exec_shared_time_courses(lambda tasks, variables, config=None: None, self.doc, self.dirname),
+                         ({}, {}))
+
+        # groups whose tasks are invalid are executed individually, and the errors are recorded in the logs of the tasks
+        def invalid_group_executer(tasks, variables, config=None):
+            raise ValueError('task is invalid')
+        with self.assertWarnsRegex(BioSimulatorsWarning, 'task is invalid'):
+            task_results, unshared_tasks = exec_shared_time_courses(invalid_group_executer, self.doc, self.dirname)
+        self.assertEqual(task_results, {})
+        self.assertEqual(unshared_tasks['task_2'], {'tasks': ['task_1', 'task_2'], 'exception': 'ValueError: task is invalid'})
+
+        def exec_task(task, variables, preprocessed_task=None, log=None, config=None):
+            log.simulator_details = {'method': 'simulate'}
+            return {}, log
+        _, log = exec_unshared_sed_task(unshared_tasks, exec_task, self.task_1, [], log=TaskLog())
+        self.assertEqual(log.simulator_details, {'method': 'simulate', 'sharedTimeCourse': unshared_tasks['task_1']})
+        _, log = exec_unshared_sed_task(unshared_tasks, exec_task, self.task_3, [], log=TaskLog())
+        self.assertEqual(log.simulator_details, {'method': 'simulate'})
+
+        # other errors are raised
+        def failing_group_executer(tasks, variables, config=None):
+            raise RuntimeError('simulation failed')
+        with self.assertRaisesRegex(RuntimeError, 'simulation failed'):
+            exec_shared_time_courses(failing_group_executer, self.doc, self.dirname)
+
+    def test_exec_shared_time_courses_removes_temporary_models(self):
+        temp_model_sources = []
+
+        def resolve_model_and_apply_xml_changes(model, doc, working_dir, apply_xml_model_changes=False):
+            fid, temp_model_source = tempfile.mkstemp(suffix='.xml', dir=self.dirname)
+            os.close(fid)
+            temp_model_sources.append(temp_model_source)
+            return model, temp_model_source, None, None
+
+        def group_executer(tasks, variables, config=None):
+            return {task.id: TaskResult(variable_results={}) for task in tasks}
+
+        with mock.patch('my_simulator.timecourse.resolve_model_and_apply_xml_changes', resolve_model_and_apply_xml_changes):
+            exec_shared_time_courses(group_executer, self.doc, self.dirname)
+
+        self.assertEqual(len(temp_model_sources), 1)
+        self.assertFalse(os.path.isfile(temp_model_sources[0]))
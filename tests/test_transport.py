@@ -0,0 +1,79 @@
+""" Tests of the transfer of results from worker processes through memory-mapped files
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from my_simulator.transport import ResultsTransport, SharedVariableResults, open_variable_results
+from unittest import mock
+import concurrent.futures
+import errno
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+def exec_task(transport):
+    return transport.share({
+        'time': numpy.linspace(0., 10., 11),
+        'x': numpy.arange(6, dtype=numpy.int32).reshape((2, 3)),
+        'flag': numpy.array([True, False]),
+    })
+
+
+class TransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_share_and_open(self):
+        with ResultsTransport(1, dir=self.dirname) as transport:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+                shared_results = executor.submit(exec_task, transport).result()
+            self.assertIsInstance(shared_results, SharedVariableResults)
+            self.assertTrue(os.path.isfile(shared_results.filename))
+
+            results = open_variable_results(shared_results)
+            numpy.testing.assert_equal(results['time'], numpy.linspace(0., 10., 11))
+            numpy.testing.assert_equal(results['x'], [[0, 1, 2], [3, 4, 5]])
+            self.assertEqual(results['x'].dtype, numpy.int32)
+            numpy.testing.assert_equal(results['flag'], [True, False])
+
+            results['time'][0] = -1.
+            self.assertEqual(open_variable_results(shared_results)['time'][0], 0.)
+
+        self.assertFalse(os.path.isdir(transport.dirname))
+        self.assertEqual(results['time'][-1], 10.)
+
+    def test_small_and_non_numeric_results_are_not_shared(self):
+        with ResultsTransport(1024, dir=self.dirname) as transport:
+            results = {'x': numpy.zeros(10)}
+            self.assertIs(transport.share(results), results)
+            self.assertIs(open_variable_results(results), results)
+
+            transport.min_size = 1
+            results = {'x': numpy.array(['a', None], dtype=object)}
+            self.assertIs(transport.share(results), results)
+
+            self.assertIsInstance(transport.share({'x': numpy.zeros(10)}), SharedVariableResults)
+            self.assertEqual(len(os.listdir(transport.dirname)), 1)
+
+    def test_results_are_not_shared_if_they_cannot_be_written(self):
+        def fdopen(fid, mode):
+            os.close(fid)
+            raise OSError(errno.ENOSPC, 'No space left on device')
+
+        with ResultsTransport(1, dir=self.dirname) as transport:
+            results = {'x': numpy.zeros(10)}
+            with mock.patch('my_simulator.transport.os.fdopen', side_effect=fdopen):
+                self.assertIs(transport.share(results), results)
+            self.assertEqual(os.listdir(transport.dirname), [])
+
+            with mock.patch('my_simulator.transport.tempfile.mkstemp', side_effect=OSError(errno.ENOSPC, 'No space')):
+                self.assertIs(transport.share(results), results)
@@ -0,0 +1,174 @@
+""" Tests of the utilities
+
+:Author: Author name <email@organization>
+:Date: YYYY-MM-DD
+:Copyright: YYYY, Owner
+:License: <License, e.g., MIT>
+"""
+
+from biosimulators_utils.sedml import data_model as sedml_data_model
+from my_simulator.utils import (get_file_digest, get_sed_task_digest, get_checkpoint_digest, get_variable_result_ids,
+                                get_model_attribute_change_target, get_variable_results_from_matrix, get_variable_results_from_chunks, PhaseTimer)
+import numpy
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class UtilsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_get_file_digest(self):
+        filename_1 = os.path.join(self.dirname, 'file-1.txt')
+        filename_2 = os.path.join(self.dirname, 'file-2.txt')
+        with open(filename_1, 'w') as file:
+            file.write('content')
+        with open(filename_2, 'w') as file:
+            file.write('content')
+
+        self.assertEqual(get_file_digest(filename_1), get_file_digest(filename_2))
+        self.assertEqual(get_file_digest(filename_1, chunk_size=2), get_file_digest(filename_1))
+
+        with open(filename_2, 'w') as file:
+            file.write('other content')
+        self.assertNotEqual(get_file_digest(filename_1), get_file_digest(filename_2))
+
+    def test_get_sed_task_digest(self):
+        def build_task(source, number_of_points=10):
+            task = sedml_data_model.Task(
+                id='task',
+                model=sedml_data_model.Model(id='model', source=source, language=sedml_data_model.ModelLanguage.SBML.value),
+                simulation=sedml_data_model.UniformTimeCourseSimulation(
+                    id='sim',
+                    algorithm=sedml_data_model.Algorithm(kisao_id='KISAO_0000560'),
+                    initial_time=0., output_start_time=0., output_end_time=10., number_of_points=number_of_points,
+                ),
+            )
+            variables = [sedml_data_model.Variable(id='time', symbol=sedml_data_model.Symbol.time.value, task=task)]
+            return task, variables
+
+        digest = get_sed_task_digest(*build_task('/tmp/archive-1/model.xml'))
+        self.assertEqual(get_sed_task_digest(*build_task('/tmp/archive-2/model.xml')), digest)
+        self.assertNotEqual(get_sed_task_digest(*build_task('/tmp/archive-1/model.xml', number_of_points=20)), digest)
+
+        task, variables = build_task('/tmp/archive-1/model.xml')
+        task.model.changes.append(sedml_data_model.ModelAttributeChange(
+            target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k']/@value", new_value='2'))
+        self.assertNotEqual(get_sed_task_digest(task, variables), digest)
+
+        # the order of the changes matters
+        task.model.changes.append(sedml_data_model.ModelAttributeChange(
+            target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k']/@value", new_value='1'))
+        digest = get_sed_task_digest(task, variables)
+        task.model.changes.reverse()
+        self.assertNotEqual(get_sed_task_digest(task, variables), digest)
+
+        # the order of the variables doesn't matter
+        variables.append(sedml_data_model.Variable(
+            id='k', target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k']", task=task))
+        digest = get_sed_task_digest(task, variables)
+        self.assertEqual(get_sed_task_digest(task, list(reversed(variables))), digest)
+
+    def test_get_checkpoint_digest(self):
+        change = sedml_data_model.ModelAttributeChange(
+            target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k']/@value", new_value='2')
+
+        digest = get_checkpoint_digest('model', [change], 'KISAO_0000019', {'rtol': 1e-6}, 0., 10.)
+        self.assertEqual(get_checkpoint_digest('model', [change], 'KISAO_0000019', {'rtol': 1e-6}, 0, 10), digest)
+        self.assertNotEqual(get_checkpoint_digest('other-model', [change], 'KISAO_0000019', {'rtol': 1e-6}, 0., 10.), digest)
+        self.assertNotEqual(get_checkpoint_digest('model', [], 'KISAO_0000019', {'rtol': 1e-6}, 0., 10.), digest)
+        self.assertNotEqual(get_checkpoint_digest('model', [change], 'KISAO_0000560', {'rtol': 1e-6}, 0., 10.), digest)
+        self.assertNotEqual(get_checkpoint_digest('model', [change], 'KISAO_0000019', {'rtol': 1e-8}, 0., 10.), digest)
+        self.assertNotEqual(get_checkpoint_digest('model', [change], 'KISAO_0000019', {'rtol': 1e-6}, 5., 10.), digest)
+        self.assertNotEqual(get_checkpoint_digest('model', [change], 'KISAO_0000019', {'rtol': 1e-6}, 0., 20.), digest)
+
+    def test_get_variable_result_ids(self):
+        variables = [
+            sedml_data_model.Variable(id='time', symbol=sedml_data_model.Symbol.time.value),
+            sedml_data_model.Variable(id='A', target="/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']"),
+        ]
+        target_x_paths_ids = {variables[1].target: 'A'}
+        self.assertEqual(get_variable_result_ids(variables, target_x_paths_ids), ['time', 'A'])
+
+        variables.append(sedml_data_model.Variable(id='x', symbol='urn:sedml:symbol:other'))
+        with self.assertRaisesRegex(NotImplementedError, 'not supported'):
+            get_variable_result_ids(variables, target_x_paths_ids)
+
+    def test_get_model_attribute_change_target(self):
+        change = sedml_data_model.ModelAttributeChange(
+            target="/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']/@value")
+        self.assertEqual(get_model_attribute_change_target(change),
+                         ("/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']", 'value'))
+
+        change.target = "/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']/@sbml:initialConcentration"
+        self.assertEqual(get_model_attribute_change_target(change),
+                         ("/sbml:sbml/sbml:model/sbml:listOfSpecies/sbml:species[@id='A']", 'initialConcentration'))
+
+        change.target = "/sbml:sbml/sbml:model/sbml:listOfParameters/sbml:parameter[@id='k1']"
+        with self.assertRaisesRegex(NotImplementedError, 'must target attributes'):
+            get_model_attribute_change_target(change)
+
+    def test_get_variable_results_from_matrix(self):
+        result_ids = ['time', 'A', 'B', 'C']
+        result_matrix = numpy.arange(12.).reshape((4, 3))
+        variables = [sedml_data_model.Variable(id=id) for id in ['var_A', 'var_B']]
+
+        variable_results = get_variable_results_from_matrix(variables, ['A', 'B'], result_ids, result_matrix)
+        numpy.testing.assert_equal(variable_results['var_A'], numpy.array([3., 4., 5.]))
+        numpy.testing.assert_equal(variable_results['var_B'], numpy.array([6., 7., 8.]))
+        self.assertTrue(numpy.shares_memory(variable_results['var_A'], result_matrix))
+
+        variable_results = get_variable_results_from_matrix(variables, ['C', 'time'], result_ids, result_matrix)
+        numpy.testing.assert_equal(variable_results['var_A'], numpy.array([9., 10., 11.]))
+        numpy.testing.assert_equal(variable_results['var_B'], numpy.array([0., 1., 2.]))
+
+        with self.assertRaisesRegex(ValueError, 'could not be recorded:\n  var_B'):
+            get_variable_results_from_matrix(variables, ['A', 'D'], result_ids, result_matrix)
+
+    def test_get_variable_results_from_chunks(self):
+        result_ids = ['time', 'A', 'B', 'C']
+        result_matrix = numpy.arange(20.).reshape((4, 5))
+        chunks = [(result_ids, result_matrix[:, i_point:i_point + 2]) for i_point in range(0, 5, 2)]
+        variables = [sedml_data_model.Variable(id=id) for id in ['var_C', 'var_time']]
+
+        variable_results = get_variable_results_from_chunks(variables, ['C', 'time'], iter(chunks), 5)
+        numpy.testing.assert_equal(variable_results['var_C'], result_matrix[3, :])
+        numpy.testing.assert_equal(variable_results['var_time'], result_matrix[0, :])
+
+        with self.assertRaisesRegex(ValueError, 'rather than the expected 6 time points'):
+            get_variable_results_from_chunks(variables, ['C', 'time'], iter(chunks), 6)
+
+        with self.assertRaisesRegex(ValueError, 'more than the expected 4 time points'):
+            get_variable_results_from_chunks(variables, ['C', 'time'], iter(chunks), 4)
+
+        with self.assertRaisesRegex(ValueError, 'could not be recorded'):
+            get_variable_results_from_chunks(variables, ['D', 'time'], iter(chunks), 5)
+
+    def test_phase_timer(self):
+        timer = PhaseTimer(measure_memory=True)
+        with timer.phase('simulation'):
+            pass
+        with timer.phase('simulation'):
+            pass
+        with timer.phase('results'):
+            pass
+        self.assertEqual(list(timer.timings.keys()), ['simulation', 'results'])
+        self.assertGreaterEqual(timer.timings['simulation'], 0.)
+        self.assertEqual(list(timer.memory.keys()), ['simulation', 'results'])
+
+        other_timer = PhaseTimer()
+        with other_timer.phase('model'):
+            pass
+        timer.update(other_timer)
+        self.assertEqual(list(timer.timings.keys()), ['simulation', 'results', 'model'])
+
+    def test_phase_timer_disabled(self):
+        timer = PhaseTimer(enabled=False)
+        with timer.phase('simulation'):
+            pass
+        self.assertEqual(timer.timings, {})